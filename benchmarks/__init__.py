@@ -0,0 +1 @@
+"""Benchmarks y generador de exportaciones sintéticas de Jira."""
@@ -0,0 +1,110 @@
+"""
+Compara los motores de parsing (ElementTree y lxml) sobre los mismos
+archivos y verifica que producen exactamente el mismo resultado:
+
+    python -m benchmarks.compare_engines examples/sample_xml/*.xml
+    python -m benchmarks.compare_engines --issues 100000
+
+Sin archivos se genera un export sintético con benchmarks.synthetic.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_export
+from src.utils.xml_parser import XMLParser, resolve_engine
+
+ENGINES = ('etree', 'lxml')
+
+def time_engine(file_path, engine, repeat=1):
+    """
+    Mide el parsing completo de un archivo con un motor.
+
+    Args:
+        file_path (str): Archivo XML
+        engine (str): Motor de parsing
+        repeat (int): Repeticiones; se toma el mejor tiempo
+
+    Returns:
+        tuple: (Mejor tiempo en segundos, (items, links) del parsing)
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        parser = XMLParser(engine=engine)
+        start = time.perf_counter()
+        result = parser.parse_file(file_path)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, result
+
+def compare_file(file_path, repeat=1):
+    """
+    Compara los motores sobre un archivo.
+
+    Args:
+        file_path (str): Archivo XML
+        repeat (int): Repeticiones por motor
+
+    Returns:
+        dict: Segundos por motor, número de items y si los resultados
+            coinciden
+    """
+    times = {}
+    results = {}
+    for engine in ENGINES:
+        times[engine], results[engine] = time_engine(file_path, engine, repeat)
+    return {
+        'file': file_path,
+        'items': len(results['etree'][0]),
+        'seconds': times,
+        'identical': results['etree'] == results['lxml'],
+    }
+
+def main(argv=None):
+    """
+    Punto de entrada de la comparación.
+
+    Returns:
+        int: 1 si algún archivo produce resultados distintos, 0 en otro caso
+    """
+    parser = argparse.ArgumentParser(
+        description='Compara los motores de parsing ElementTree y lxml.'
+    )
+    parser.add_argument('files', nargs='*', help='Exports XML a comparar')
+    parser.add_argument('--issues', type=int, default=20000,
+                        help='Issues del export sintético si no hay archivos')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if resolve_engine('auto') != 'lxml':
+        print("lxml no está instalado: pip install lxml", file=sys.stderr)
+        return 2
+
+    with tempfile.TemporaryDirectory() as workdir:
+        files = args.files
+        if not files:
+            path = os.path.join(workdir, f'export-{args.issues}.xml')
+            write_export(path, args.issues)
+            files = [path]
+
+        mismatches = 0
+        for file_path in files:
+            result = compare_file(file_path, args.repeat)
+            etree_seconds = result['seconds']['etree']
+            lxml_seconds = result['seconds']['lxml']
+            speedup = etree_seconds / lxml_seconds if lxml_seconds else 0
+            status = 'idéntico' if result['identical'] else 'DIFERENTE'
+            print(
+                f"{os.path.basename(file_path)}: {result['items']} items  "
+                f"etree {etree_seconds:.3f} s  lxml {lxml_seconds:.3f} s  "
+                f"({speedup:.2f}x)  {status}"
+            )
+            mismatches += not result['identical']
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
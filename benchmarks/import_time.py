@@ -0,0 +1,115 @@
+"""
+Mide el tiempo de arranque (importación) de los puntos de entrada y falla
+si supera el presupuesto o si carga dependencias pesadas antes de usarlas:
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time src.cli --budget 100
+
+Cada módulo se importa en un intérprete nuevo con `-X importtime`; se toma
+el mejor de varios intentos para no depender del ruido del sistema.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Puntos de entrada medidos por defecto
+ENTRY_POINTS = ('src', 'src.converter', 'src.cli', 'src.server')
+
+# Dependencias que solo deben cargarse al convertir, al descargar una
+# búsqueda de Jira o al abrir la ventana
+HEAVY_MODULES = ('pandas', 'numpy', 'openpyxl', 'tkinter', 'lxml', 'pyarrow',
+                 'http.client')
+
+# Presupuesto por defecto de cada importación (ms)
+DEFAULT_BUDGET_MS = 150
+
+# Raíz del proyecto, para que el intérprete hijo encuentre el paquete src
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure_import(module, repeat=3):
+    """
+    Mide la importación de un módulo en intérpretes nuevos.
+
+    Args:
+        module (str): Módulo a importar
+        repeat (int): Intentos; se toma el menor tiempo
+
+    Returns:
+        dict: Milisegundos acumulados de la importación y dependencias
+            pesadas que quedaron cargadas
+    """
+    code = (
+        f"import sys, json; import {module}; "
+        f"print(json.dumps(sorted(set({HEAVY_MODULES!r}) & set(sys.modules))))"
+    )
+    best = None
+    heavy = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        )
+        heavy = json.loads(completed.stdout)
+        microseconds = _cumulative_time(completed.stderr, module)
+        best = microseconds if best is None else min(best, microseconds)
+    return {'module': module, 'ms': best / 1000, 'heavy': heavy}
+
+def _cumulative_time(report, module):
+    """
+    Obtiene el tiempo acumulado de un módulo de la salida de -X importtime.
+
+    Args:
+        report (str): Salida de error del intérprete
+        module (str): Módulo medido
+
+    Returns:
+        int: Microsegundos
+
+    Raises:
+        ValueError: Si el módulo no aparece en la salida
+    """
+    for line in reversed(report.splitlines()):
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        if name.strip() == module:
+            return int(cumulative)
+    raise ValueError(f"{module} no aparece en la salida de -X importtime")
+
+def main(argv=None):
+    """
+    Punto de entrada del benchmark.
+
+    Returns:
+        int: 1 si algún módulo supera el presupuesto o carga dependencias
+            pesadas, 0 en otro caso
+    """
+    parser = argparse.ArgumentParser(
+        description='Mide el tiempo de importación de los puntos de entrada.'
+    )
+    parser.add_argument('modules', nargs='*', default=list(ENTRY_POINTS))
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_MS,
+                        help='Milisegundos máximos por importación')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for module in args.modules:
+        result = measure_import(module, args.repeat)
+        problems = []
+        if result['ms'] > args.budget:
+            problems.append(f"supera {args.budget:.0f} ms")
+        if result['heavy']:
+            problems.append(f"carga {', '.join(result['heavy'])}")
+        failures += bool(problems)
+        print(
+            f"{module}: {result['ms']:.1f} ms  "
+            f"{'; '.join(problems) if problems else 'ok'}"
+        )
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+Benchmarks del pipeline de conversión sobre exportaciones sintéticas.
+
+Para cada tamaño genera un export con benchmarks.synthetic y mide, etapa
+por etapa, el tiempo y el pico de memoria (RSS) del proceso. Cada tamaño se
+ejecuta en un proceso nuevo para que los picos no se mezclen. Los
+resultados se guardan en JSON y pueden compararse con una ejecución
+anterior:
+
+    python -m benchmarks.run_benchmarks --sizes 10000 100000 1000000
+    python -m benchmarks.run_benchmarks --sizes 10000 --compare base.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from benchmarks.synthetic import write_export
+from src.utils.instrumentation import RunReport
+
+# Tamaños por defecto (número de issues)
+DEFAULT_SIZES = (10000, 100000, 1000000)
+
+# Etapas medidas, en orden de ejecución
+STAGES = (
+    'read_clean',
+    'parse',
+    'process_items',
+    'dataframe',
+    'format_excel',
+)
+
+def run_pipeline(xml_path, output_dir):
+    """
+    Ejecuta el pipeline completo midiendo cada etapa.
+
+    Args:
+        xml_path (str): Export a convertir
+        output_dir (str): Directorio para el Excel generado
+
+    Returns:
+        dict: Resultados por etapa
+    """
+    from src.utils import XMLParser, ExcelFormatter
+    from src.utils.xml_parser import CHUNK_SIZE
+
+    parser = XMLParser()
+    report = RunReport(source=xml_path)
+
+    # Lectura y limpieza por lotes de items, sin parsear
+    with report.stage('read_clean', '', 0, 0) as stage:
+        bytes_read = 0
+        for chunk in parser._iter_item_chunks(xml_path, CHUNK_SIZE):
+            parser._clean_bytes(chunk).decode('utf-8', errors='ignore')
+            bytes_read += len(chunk)
+        stage.advance(bytes_read=bytes_read)
+    # Parsing XML (_fromstring) y proceso de los items (_process_items) por
+    # lotes, como en iter_file, acumulando el tiempo de cada parte
+    parse_seconds = process_seconds = 0.0
+    bytes_read = 0
+    items = parser.new_column_store()
+    links = []
+    for chunk in parser._iter_item_chunks(xml_path, CHUNK_SIZE):
+        content = parser._clean_bytes(chunk).decode('utf-8', errors='ignore')
+        bytes_read += len(chunk)
+        started = time.perf_counter()
+        root = parser._fromstring(f"<items>{content}</items>")
+        parsed = time.perf_counter()
+        chunk_items, chunk_links = parser._process_items(root)
+        process_seconds += time.perf_counter() - parsed
+        parse_seconds += parsed - started
+        del root
+        for item in chunk_items:
+            items.append(item)
+        links.extend(chunk_links)
+    report.record('parse', parse_seconds, len(items), bytes_read)
+    report.record('process_items', process_seconds, len(items))
+    with report.stage('dataframe', '', 0, 0) as stage:
+        df = parser.to_dataframe(items)
+        stage.advance(len(df))
+    del items
+    with report.stage('format_excel', '', 0, 0) as stage:
+        output_path = os.path.join(output_dir, 'benchmark.xlsx')
+        if not ExcelFormatter(df, output_path, links).format_excel():
+            raise RuntimeError("Error al formatear el archivo Excel")
+        stage.advance(len(df))
+
+    return {
+        'items': len(df),
+        'stages': report.stages,
+        'total_seconds': report.total_seconds,
+    }
+
+def run_size(issues, custom_fields, comments, description_size, workdir):
+    """
+    Genera un export de `issues` issues y mide el pipeline sobre él.
+
+    Se ejecuta en un proceso hijo nuevo para aislar el pico de memoria.
+
+    Args:
+        issues (int): Número de issues
+        custom_fields (int): Campos personalizados por issue
+        comments (int): Comentarios por issue
+        description_size (int): Tamaño de la descripción
+        workdir (str): Directorio de trabajo temporal
+
+    Returns:
+        dict: Resultados del tamaño
+    """
+    xml_path = os.path.join(workdir, f'export-{issues}.xml')
+    file_bytes = write_export(
+        xml_path, issues, custom_fields, comments, description_size
+    )
+    try:
+        result = run_pipeline(xml_path, workdir)
+    finally:
+        os.remove(xml_path)
+    result.update({
+        'issues': issues,
+        'file_bytes': file_bytes,
+        'custom_fields': custom_fields,
+        'comments': comments,
+        'description_size': description_size,
+    })
+    return result
+
+def run_benchmarks(sizes, custom_fields=10, comments=1, description_size=200):
+    """
+    Ejecuta los benchmarks para todos los tamaños.
+
+    Args:
+        sizes (iterable): Números de issues a medir
+        custom_fields (int): Campos personalizados por issue
+        comments (int): Comentarios por issue
+        description_size (int): Tamaño de la descripción
+
+    Returns:
+        dict: Metadatos de la ejecución y resultados por tamaño
+    """
+    context = multiprocessing.get_context('spawn')
+    runs = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for issues in sizes:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                runs.append(executor.submit(
+                    run_size, issues, custom_fields, comments,
+                    description_size, workdir
+                ).result())
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'runs': runs,
+    }
+
+def compare_results(current, baseline, threshold=0.2):
+    """
+    Compara dos ejecuciones etapa por etapa.
+
+    Args:
+        current (dict): Resultados actuales
+        baseline (dict): Resultados de referencia
+        threshold (float): Aumento relativo de tiempo considerado regresión
+
+    Returns:
+        list: Tuplas (issues, etapa, segundos base, segundos actuales,
+            ratio, es_regresión) de los tamaños presentes en ambas
+    """
+    baseline_runs = {run['issues']: run for run in baseline['runs']}
+    rows = []
+    for run in current['runs']:
+        base = baseline_runs.get(run['issues'])
+        if base is None:
+            continue
+        for name in STAGES:
+            if name not in run['stages'] or name not in base['stages']:
+                continue
+            before = base['stages'][name]['seconds']
+            after = run['stages'][name]['seconds']
+            ratio = after / before if before else None
+            regression = ratio is not None and ratio > 1 + threshold
+            rows.append((run['issues'], name, before, after, ratio, regression))
+    return rows
+
+def print_results(results):
+    """Muestra los resultados en forma de tabla."""
+    for run in results['runs']:
+        print(f"\n{run['issues']} issues ({run['file_bytes'] / 1e6:.1f} MB)")
+        for name in STAGES:
+            stage = run['stages'][name]
+            print(
+                f"  {name:<15} {stage['seconds']:>10.3f} s"
+                f"  {stage['peak_rss_mb'] or 0:>10.1f} MB"
+            )
+        print(f"  {'total':<15} {run['total_seconds']:>10.3f} s")
+
+def main(argv=None):
+    """
+    Punto de entrada de los benchmarks.
+
+    Returns:
+        int: 1 si la comparación detecta regresiones, 0 en otro caso
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--custom-fields', type=int, default=10)
+    parser.add_argument('--comments', type=int, default=1)
+    parser.add_argument('--description-size', type=int, default=200)
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help='Archivo JSON de resultados')
+    parser.add_argument('--compare', help='JSON de una ejecución anterior')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Aumento de tiempo tolerado (por defecto 0.2)')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        args.sizes, args.custom_fields, args.comments, args.description_size
+    )
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2)
+    print_results(results)
+    print(f"\nResultados guardados en {args.output}")
+
+    if not args.compare:
+        return 0
+    with open(args.compare, encoding='utf-8') as file:
+        baseline = json.load(file)
+    rows = compare_results(results, baseline, args.threshold)
+    print("\nComparación con", args.compare)
+    for issues, name, before, after, ratio, regression in rows:
+        flag = '  REGRESIÓN' if regression else ''
+        ratio_text = f"{ratio:.2f}x" if ratio is not None else '-'
+        print(f"  {issues:>9} {name:<15} {before:>9.3f} -> {after:>9.3f} s "
+              f"({ratio_text}){flag}")
+    return 1 if any(row[-1] for row in rows) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
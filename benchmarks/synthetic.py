@@ -0,0 +1,209 @@
+"""
+Generador de exportaciones XML sintéticas de Jira.
+
+Produce archivos con la misma estructura que el RSS de Jira (ver
+examples/sample_xml) y tamaño configurable, escribiendo item a item para
+poder generar millones de issues sin cargarlos en memoria:
+
+    python -m benchmarks.synthetic salida.xml --issues 100000
+"""
+
+import argparse
+import os
+import random
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape
+
+# Fecha base de las issues generadas
+BASE_DATE = datetime(2025, 1, 1, 9, 0, 0)
+
+TYPES = ['Tarea', 'Bug', 'Historia', 'Subtarea', 'Épica']
+PRIORITIES = ['Highest', 'High', 'Medium', 'Low', 'Lowest']
+STATUSES = ['Tareas por hacer', 'En proceso', 'En revisión', 'Finalizada']
+COMPANIES = ['Quipu', 'Expotextil', 'Summit', 'Digifact', 'ACME']
+TASK_TYPES = ['Análisis', 'Desarrollo', 'Pruebas', 'Soporte']
+PEOPLE = ['Bryan Ramirez', 'Oswaldo Ríos Mozombite', 'Ana Torres', 'Luis Pérez']
+WORDS = (
+    'revisión documentación sistema cliente módulo reporte integración '
+    'factura kardex ajuste pruebas despliegue reunión análisis usuario'
+).split()
+
+HEADER = '''<!--
+RSS generated by JIRA (synthetic benchmark export)
+-->
+<rss version="0.92">
+\t<channel>
+\t\t<title>Jira</title>
+\t\t<link>https://jira.example.com/issues/?jql=project+%3D+%22BENCH%22</link>
+\t\t<description>An XML representation of a search request</description>
+\t\t<language>es-es</language>
+\t\t<issue start="0" end="{end}" total="{total}"/>
+'''
+
+FOOTER = '''\t</channel>
+</rss>
+'''
+
+def jira_date(dt):
+    """
+    Formatea una fecha como en los exports de Jira.
+
+    Args:
+        dt (datetime): Fecha a formatear
+
+    Returns:
+        str: Fecha RFC-2822 ("Tue, 11 Feb 2025 17:02:43 -0500")
+    """
+    return dt.strftime('%a, %d %b %Y %H:%M:%S -0500')
+
+def _sentence(rng, words):
+    """Genera una frase de `words` palabras."""
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+def _custom_field(field_id, name, value, field_type='textfield'):
+    """
+    Genera el XML de un campo personalizado.
+
+    Args:
+        field_id (int): Id numérico del campo
+        name (str): Nombre del campo
+        value (str): Valor (None para un campo sin valores)
+        field_type (str): Tipo de campo de Jira
+
+    Returns:
+        str: Fragmento XML del campo
+    """
+    values = '' if value is None else (
+        f'\n\t\t\t\t\t\t<customfieldvalue><![CDATA[{value}]]></customfieldvalue>'
+        '\n\t\t\t\t\t'
+    )
+    return (
+        f'\t\t\t\t<customfield id="customfield_{field_id}" '
+        f'key="com.atlassian.jira.plugin.system.customfieldtypes:{field_type}">\n'
+        f'\t\t\t\t\t<customfieldname>{name}</customfieldname>\n'
+        f'\t\t\t\t\t<customfieldvalues>{values}</customfieldvalues>\n'
+        '\t\t\t\t</customfield>\n'
+    )
+
+def generate_item(rng, number, custom_fields=10, comments=1,
+                  description_size=200, project='BENCH'):
+    """
+    Genera el XML de un único <item>.
+
+    Args:
+        rng (random.Random): Generador de números aleatorios
+        number (int): Número de la issue
+        custom_fields (int): Campos personalizados por issue (incluye los
+            cuatro que extrae el conversor)
+        comments (int): Comentarios por issue
+        description_size (int): Caracteres aproximados de la descripción
+        project (str): Clave del proyecto
+
+    Returns:
+        str: Fragmento XML del item
+    """
+    key = f'{project}-{number}'
+    summary = escape(_sentence(rng, 8).capitalize())
+    created = BASE_DATE + timedelta(minutes=rng.randrange(500000))
+    updated = created + timedelta(minutes=rng.randrange(20000))
+    assignee = rng.choice(PEOPLE)
+    description = escape(
+        f'<p>{_sentence(rng, max(1, description_size // 9))}'[:description_size]
+        + '</p>'
+    ) if description_size > 0 else ''
+
+    fields = [
+        _custom_field(10040, 'Empresa', rng.choice(COMPANIES), 'select'),
+        _custom_field(10041, 'Tipo tarea', rng.choice(TASK_TYPES), 'select'),
+        _custom_field(10039, 'Horas utilizadas',
+                      f'{rng.randrange(1, 80) / 2:.1f}', 'float'),
+        _custom_field(10015, 'Start date',
+                      jira_date(created.replace(hour=0, minute=0, second=0))
+                      .replace('-0500', '+0000') if rng.random() < 0.5 else None,
+                      'datepicker'),
+    ]
+    for index in range(max(custom_fields - len(fields), 0)):
+        value = _sentence(rng, 2) if index % 3 else None
+        fields.append(_custom_field(11000 + index, f'Campo {index}', value))
+
+    comment_xml = ''
+    if comments:
+        comment_xml = '\t\t\t<comments>\n' + ''.join(
+            f'\t\t\t\t<comment id="{number * 100 + index}" author="{assignee}" '
+            f'created="{jira_date(updated)}">'
+            f'{escape("<p>" + _sentence(rng, 12) + "</p>")}</comment>\n'
+            for index in range(comments)
+        ) + '\t\t\t</comments>\n'
+
+    return (
+        '\t\t<item>\n'
+        f'\t\t\t<title>[{key}] {summary}</title>\n'
+        f'\t\t\t<link>https://jira.example.com/browse/{key}</link>\n'
+        f'\t\t\t<project id="10001" key="{project}">Benchmark</project>\n'
+        f'\t\t\t<description>{description}</description>\n'
+        '\t\t\t<environment></environment>\n'
+        f'\t\t\t<key id="{10000 + number}">{key}</key>\n'
+        f'\t\t\t<summary>{summary}</summary>\n'
+        f'\t\t\t<type id="10003">{rng.choice(TYPES)}</type>\n'
+        f'\t\t\t<priority id="3">{rng.choice(PRIORITIES)}</priority>\n'
+        f'\t\t\t<status id="10013">{rng.choice(STATUSES)}</status>\n'
+        f'\t\t\t<assignee accountid="acc-{PEOPLE.index(assignee)}">{assignee}</assignee>\n'
+        f'\t\t\t<reporter accountid="acc-0">{PEOPLE[0]}</reporter>\n'
+        f'\t\t\t<created>{jira_date(created)}</created>\n'
+        f'\t\t\t<updated>{jira_date(updated)}</updated>\n'
+        '\t\t\t<due></due>\n'
+        f'{comment_xml}'
+        '\t\t\t<attachments></attachments>\n'
+        '\t\t\t<subtasks></subtasks>\n'
+        '\t\t\t<customfields>\n'
+        f'{"".join(fields)}'
+        '\t\t\t</customfields>\n'
+        '\t\t</item>\n'
+    )
+
+def write_export(output_path, issues, custom_fields=10, comments=1,
+                 description_size=200, seed=0):
+    """
+    Escribe una exportación sintética completa.
+
+    Args:
+        output_path (str): Ruta del XML a generar
+        issues (int): Número de issues
+        custom_fields (int): Campos personalizados por issue
+        comments (int): Comentarios por issue
+        description_size (int): Caracteres aproximados de cada descripción
+        seed (int): Semilla para obtener siempre el mismo archivo
+
+    Returns:
+        int: Tamaño del archivo generado en bytes
+    """
+    rng = random.Random(seed)
+    with open(output_path, 'w', encoding='utf-8', newline='\n') as file:
+        file.write(HEADER.format(end=max(issues - 1, 0), total=issues))
+        for number in range(issues, 0, -1):
+            file.write(generate_item(
+                rng, number, custom_fields, comments, description_size
+            ))
+        file.write(FOOTER)
+    return os.path.getsize(output_path)
+
+def main(argv=None):
+    """Punto de entrada para generar un export desde la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description='Genera una exportación XML sintética de Jira.'
+    )
+    parser.add_argument('output', help='Ruta del XML a generar')
+    parser.add_argument('--issues', type=int, default=10000)
+    parser.add_argument('--custom-fields', type=int, default=10)
+    parser.add_argument('--comments', type=int, default=1)
+    parser.add_argument('--description-size', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    size = write_export(
+        args.output, args.issues, args.custom_fields, args.comments,
+        args.description_size, args.seed
+    )
+    print(f"{args.output}: {args.issues} issues, {size / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    main()
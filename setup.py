@@ -8,6 +8,10 @@ setup(
         "pandas>=1.5.0",
         "openpyxl>=3.0.0",
     ],
+    extras_require={
+        "arrow": ["pyarrow>=7.0.0"],
+        "lxml": ["lxml>=4.6.0"],
+    },
     author="Bryan Ramírez",
     author_email="bryan@ramirezchavez.net",
     description="A GUI tool that converts Jira XML exports to Excel with formatting",
@@ -19,5 +23,11 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.7",
+    entry_points={
+        "console_scripts": [
+            "jira-xml2xlsx=src.cli:main",
+            "jira-xml2xlsx-server=src.server:main",
+        ],
+    },
 )
\ No newline at end of file
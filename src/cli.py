@@ -0,0 +1,641 @@
+"""
+Interfaz de línea de comandos del conversor XML de Jira a Excel.
+
+Permite convertir uno o varios archivos, o directorios completos, sin
+interfaz gráfica (no importa tkinter), por ejemplo desde cron:
+
+    jira-xml2xlsx exports/ -o salida/ --jobs 4
+
+Una entrada también puede ser la URL de la vista XML de una búsqueda de
+Jira; se descargan todas sus páginas (credenciales en JIRA_USER y
+JIRA_TOKEN):
+
+    jira-xml2xlsx "https://jira/sr/jira.issueviews:searchrequest-xml/temp/SearchRequest.xml?jqlQuery=project+%3D+TD"
+"""
+
+import argparse
+import glob
+import os
+import posixpath
+import sys
+from datetime import datetime
+from urllib.parse import urlsplit
+from .converter import JiraXMLConverter
+from .utils import WRITERS, ItemSelection
+from .utils.children import CHILD_TABLES
+from .utils.fetcher import DEFAULT_CONNECTIONS, DEFAULT_PAGE_SIZE, is_url
+from .utils.schema import default_schema, load_schema
+from .utils.xml_parser import PARSER_ENGINES
+
+# Formatos de salida soportados (extensión del archivo generado)
+OUTPUT_FORMATS = tuple(WRITERS)
+
+def build_parser():
+    """
+    Construye el parser de argumentos.
+
+    Returns:
+        argparse.ArgumentParser: Parser configurado
+    """
+    parser = argparse.ArgumentParser(
+        prog='jira-xml2xlsx',
+        description='Convierte exportaciones XML de Jira a Excel, CSV, Parquet o '
+                    'Arrow sin interfaz gráfica.'
+    )
+    parser.add_argument(
+        'inputs',
+        nargs='+',
+        help='Archivos XML, directorios con archivos .xml o URLs de la '
+             'vista XML de una búsqueda de Jira'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help='Archivo de salida (una sola entrada) o directorio de salida. '
+             'Por defecto, junto a cada archivo XML.'
+    )
+    parser.add_argument(
+        '-f', '--format',
+        choices=OUTPUT_FORMATS,
+        default='xlsx',
+        help='Formato de salida (por defecto: xlsx)'
+    )
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=1,
+        help='Procesos para el parsing de cada archivo; 0 usa uno por CPU '
+             '(por defecto: 1)'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=PARSER_ENGINES,
+        default='auto',
+        help='Motor de parsing XML; auto usa lxml si está instalado '
+             '(por defecto: auto)'
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        help='Archivos convertidos en paralelo (por defecto: 1; con --merge, '
+             'uno por CPU)'
+    )
+    parser.add_argument(
+        '--merge',
+        action='store_true',
+        help='Combinar todas las entradas (por ejemplo, las páginas de una '
+             'exportación) en una sola salida sin tareas duplicadas; de cada '
+             'tarea se conserva la versión con el updated más reciente'
+    )
+    parser.add_argument(
+        '--max-rows',
+        type=int,
+        help='Filas por hoja o archivo xlsx antes de dividir la salida '
+             '(por defecto: límite de Excel)'
+    )
+    parser.add_argument(
+        '--shard',
+        choices=('sheets', 'files'),
+        default='sheets',
+        help='Dividir la salida xlsx en varias hojas o varios archivos con '
+             'un libro índice (por defecto: sheets)'
+    )
+    parser.add_argument(
+        '--state-dir',
+        help='Modo incremental: directorio donde se guarda, por archivo, el '
+             'estado código -> fecha de actualización y la última salida. '
+             'Solo se procesan los items nuevos o modificados.'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help='Directorio de caché de resultados de parsing: si el mismo '
+             'contenido ya se convirtió, se omite el parsing'
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=1024,
+        help='Tamaño máximo de la caché en MB; se eliminan las entradas '
+             'menos usadas (por defecto: 1024)'
+    )
+    parser.add_argument(
+        '--keys',
+        nargs='+',
+        metavar='KEY',
+        help='Exportar solo estas tareas (por ejemplo TD-41 TD-42). Usa un '
+             'índice de offsets guardado junto al XML (<archivo>.idx.json) '
+             'para leer solo esos items.'
+    )
+    parser.add_argument(
+        '--status',
+        nargs='+',
+        help='Exportar solo las tareas con alguno de estos estados'
+    )
+    parser.add_argument(
+        '--type',
+        nargs='+',
+        help='Exportar solo las tareas de alguno de estos tipos'
+    )
+    parser.add_argument(
+        '--assignee',
+        nargs='+',
+        help='Exportar solo las tareas asignadas a alguna de estas personas'
+    )
+    parser.add_argument(
+        '--project',
+        nargs='+',
+        help='Exportar solo las tareas de alguno de estos proyectos (clave)'
+    )
+    parser.add_argument(
+        '--updated-from',
+        metavar='AAAA-MM-DD',
+        help='Exportar solo las tareas actualizadas desde esta fecha'
+    )
+    parser.add_argument(
+        '--updated-to',
+        metavar='AAAA-MM-DD',
+        help='Exportar solo las tareas actualizadas antes de esta fecha'
+    )
+    parser.add_argument(
+        '--columns',
+        nargs='+',
+        metavar='COLUMNA',
+        help='Columnas a exportar, en ese orden (por defecto todas). Las '
+             'demás no se calculan.'
+    )
+    parser.add_argument(
+        '--schema',
+        metavar='JSON',
+        help='Archivo JSON con las columnas a generar (etiqueta, atributo o '
+             'campo personalizado de origen y tipo de cada una) en lugar de '
+             'las estándar'
+    )
+    parser.add_argument(
+        '--children',
+        nargs='+',
+        choices=tuple(CHILD_TABLES),
+        metavar='TABLA',
+        help='Tablas hijas a exportar junto a las tareas: '
+             f"{', '.join(CHILD_TABLES)}. En xlsx se escriben como hojas "
+             'adicionales y en el resto de formatos como archivos '
+             '<salida>_<tabla>.<formato>.'
+    )
+    parser.add_argument(
+        '--page-size',
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help='Items por página al descargar una búsqueda de Jira '
+             f'(por defecto: {DEFAULT_PAGE_SIZE})'
+    )
+    parser.add_argument(
+        '--connections',
+        type=int,
+        default=DEFAULT_CONNECTIONS,
+        help='Páginas descargadas en paralelo, cada una por una conexión '
+             f'keep-alive (por defecto: {DEFAULT_CONNECTIONS})'
+    )
+    parser.add_argument(
+        '--rate',
+        type=float,
+        help='Peticiones por segundo como máximo al descargar (por defecto: '
+             'sin límite)'
+    )
+    parser.add_argument(
+        '--report',
+        action='store_true',
+        help='Guardar junto a cada salida un informe JSON con el tiempo, '
+             'los items, los bytes leídos y la memoria de cada etapa '
+             '(<salida>.report.json)'
+    )
+    parser.add_argument(
+        '-r', '--recursive',
+        action='store_true',
+        help='Buscar archivos .xml en subdirectorios'
+    )
+    parser.add_argument(
+        '-q', '--quiet',
+        action='store_true',
+        help='No mostrar el progreso por archivo'
+    )
+    return parser
+
+def build_selection(args):
+    """
+    Construye el filtro de items a partir de los argumentos.
+
+    Args:
+        args (argparse.Namespace): Argumentos de la línea de comandos
+
+    Returns:
+        ItemSelection: Filtro, o None si no se indicó ningún criterio
+
+    Raises:
+        ValueError: Si una fecha no tiene el formato AAAA-MM-DD
+    """
+    dates = {}
+    for name in ('updated_from', 'updated_to'):
+        value = getattr(args, name)
+        if value is None:
+            continue
+        try:
+            dates[name] = datetime.strptime(value, '%Y-%m-%d')
+        except ValueError:
+            raise ValueError(
+                f"Fecha inválida para --{name.replace('_', '-')}: {value} "
+                "(formato AAAA-MM-DD)"
+            )
+    criteria = {
+        'statuses': args.status,
+        'types': args.type,
+        'assignees': args.assignee,
+        'projects': args.project,
+    }
+    if not dates and all(value is None for value in criteria.values()):
+        return None
+    return ItemSelection(**criteria, **dates)
+
+def collect_inputs(inputs, recursive=False):
+    """
+    Expande las entradas a una lista ordenada de archivos XML.
+
+    Args:
+        inputs (list): Rutas a archivos o directorios, o URLs
+        recursive (bool): Si se recorren los subdirectorios
+
+    Returns:
+        list: Rutas de archivos XML y URLs, sin duplicados
+
+    Raises:
+        FileNotFoundError: Si alguna entrada no existe
+    """
+    files = []
+    for path in inputs:
+        if is_url(path):
+            files.append(path)
+        elif os.path.isdir(path):
+            pattern = os.path.join(path, '**', '*.xml') if recursive \
+                else os.path.join(path, '*.xml')
+            files.extend(sorted(glob.glob(pattern, recursive=recursive)))
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            raise FileNotFoundError(f"No existe el archivo o directorio: {path}")
+    return list(dict.fromkeys(files))
+
+def input_name(file_path, inputs):
+    """
+    Calcula el nombre de salida de un archivo dentro de --output.
+
+    Los archivos encontrados en un directorio de entrada conservan su
+    subruta bajo ese directorio, de modo que dos export.xml de
+    subdirectorios distintos no se sobrescriben.
+
+    Args:
+        file_path (str): Archivo XML o URL de entrada
+        inputs (list): Entradas indicadas en la línea de comandos
+
+    Returns:
+        str: Ruta relativa sin extensión
+    """
+    if is_url(file_path):
+        return os.path.splitext(posixpath.basename(urlsplit(file_path).path))[0]
+    for path in inputs:
+        if not is_url(path) and os.path.isdir(path):
+            relative = os.path.relpath(file_path, path)
+            if relative.split(os.sep)[0] != os.pardir:
+                return os.path.splitext(relative)[0]
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+def resolve_output(file_path, output, output_format, output_is_file=False,
+                   name=None):
+    """
+    Calcula la ruta de salida de un archivo.
+
+    Args:
+        file_path (str): Archivo XML o URL de entrada; las URLs se
+            guardan por defecto en el directorio actual
+        output (str): Valor de --output (o None)
+        output_format (str): Extensión de salida
+        output_is_file (bool): Si --output es el archivo final y no un
+            directorio (solo con una entrada)
+        name (str, optional): Nombre dentro de --output, con su subruta
+            (ver input_name); por defecto el del archivo de entrada
+
+    Returns:
+        str: Ruta del archivo a generar
+    """
+    if output_is_file:
+        return output
+    if is_url(file_path):
+        name = name or \
+            os.path.splitext(posixpath.basename(urlsplit(file_path).path))[0]
+        directory = output or ''
+    elif output:
+        name = name or os.path.splitext(os.path.basename(file_path))[0]
+        directory = output
+    else:
+        # Sin --output la salida va junto a su XML
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        directory = os.path.dirname(file_path)
+    return os.path.join(directory, f'{name}.{output_format}')
+
+def find_duplicate_outputs(jobs):
+    """
+    Busca entradas distintas que generarían el mismo archivo de salida.
+
+    Args:
+        jobs (list): Pares (entrada, salida)
+
+    Returns:
+        list: Tuplas (salida, entrada, entrada anterior) repetidas
+    """
+    seen = {}
+    duplicates = []
+    for file_path, output_path in jobs:
+        target = os.path.normcase(os.path.abspath(output_path))
+        if target in seen:
+            duplicates.append((output_path, file_path, seen[target]))
+        else:
+            seen[target] = file_path
+    return duplicates
+
+def convert_one(file_path, output_path, workers, output_format='xlsx',
+                writer_options=None, state_dir=None, report=False,
+                cache_dir=None, cache_size=None, keys=None, selection=None,
+                columns=None, engine='auto', children=None, schema=None,
+                fetch_options=None):
+    """
+    Convierte un archivo; se ejecuta en el proceso actual o en uno hijo.
+
+    Args:
+        file_path (str): Archivo XML de entrada, o URL de una búsqueda de
+            Jira a descargar
+        output_path (str): Archivo de salida
+        workers (int): Procesos para el parsing
+        output_format (str): Formato de salida
+        writer_options (dict, optional): Opciones del writer
+        state_dir (str, optional): Directorio de estado del modo incremental
+        report (bool, optional): Si se guarda el informe de la ejecución
+        cache_dir (str, optional): Directorio de la caché de parsing
+        cache_size (int, optional): Tamaño máximo de la caché en MB
+        keys (list, optional): Códigos de las tareas a exportar
+        selection (ItemSelection, optional): Filtro de items
+        columns (list, optional): Columnas a exportar
+        engine (str, optional): Motor de parsing
+        children (list, optional): Tablas hijas a exportar
+        schema (list, optional): Esquema de columnas
+        fetch_options (dict, optional): Argumentos de JiraFetcher para las
+            URLs (page_size, connections, rate)
+
+    Returns:
+        str: Ruta del archivo generado
+    """
+    from .utils import DeltaState, ParseCache
+
+    if is_url(file_path):
+        from .utils.fetcher import JiraFetcher, auth_headers
+
+        converter = JiraXMLConverter(gui=False, engine=engine, schema=schema)
+        fetcher = JiraFetcher(
+            file_path, headers=auth_headers(), **(fetch_options or {})
+        )
+        output_path = converter.fetch(
+            fetcher, output_path,
+            output_format=output_format,
+            writer_options=writer_options,
+            selection=selection,
+            columns=columns,
+            children=children
+        )
+        if report:
+            converter.last_report.save(f'{output_path}.report.json')
+        return output_path
+
+    delta_state = None
+    if state_dir:
+        delta_state = DeltaState.for_file(state_dir, file_path)
+    cache = None
+    if cache_dir:
+        cache = ParseCache(cache_dir, (cache_size or 1024) * 1024 * 1024)
+    converter = JiraXMLConverter(
+        workers=workers, gui=False, engine=engine, schema=schema
+    )
+    output_path = converter.convert(
+        file_path, output_path,
+        output_format=output_format,
+        writer_options=writer_options,
+        delta_state=delta_state,
+        keys=keys,
+        cache=cache,
+        selection=selection,
+        columns=columns,
+        children=children
+    )
+    missing_keys = converter.last_report.missing_keys
+    if missing_keys:
+        print(f"Aviso: {file_path}: tareas no encontradas: "
+              f"{', '.join(missing_keys)}", file=sys.stderr)
+    if report:
+        converter.last_report.save(f'{output_path}.report.json')
+    return output_path
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+
+    Args:
+        argv (list, optional): Argumentos (por defecto sys.argv[1:])
+
+    Returns:
+        int: Código de salida (0 si todos los archivos se convirtieron)
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        files = collect_inputs(args.inputs, args.recursive)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    if not files:
+        print("Error: no se encontraron archivos XML", file=sys.stderr)
+        return 2
+
+    output_is_file = bool(
+        args.output and (len(files) == 1 or args.merge)
+        and not os.path.isdir(args.output)
+        and args.output.lower().endswith(f'.{args.format}')
+    )
+    if args.output and not output_is_file:
+        os.makedirs(args.output, exist_ok=True)
+
+    if args.merge and (args.state_dir or args.keys):
+        print("Error: --merge no admite --state-dir ni --keys", file=sys.stderr)
+        return 2
+    if args.children and args.state_dir:
+        print("Error: --children no admite --state-dir", file=sys.stderr)
+        return 2
+    if any(is_url(file_path) for file_path in files) and (
+            args.merge or args.state_dir or args.keys or args.cache_dir):
+        print("Error: las URLs no admiten --merge, --state-dir, --keys ni "
+              "--cache-dir", file=sys.stderr)
+        return 2
+
+    workers = args.workers or None
+    jobs = [
+        (file_path,
+         resolve_output(file_path, args.output, args.format, output_is_file,
+                        input_name(file_path, args.inputs)))
+        for file_path in files
+    ]
+    duplicates = [] if args.merge else find_duplicate_outputs(jobs)
+    if duplicates:
+        for output_path, file_path, previous in duplicates:
+            print(f"Error: {previous} y {file_path} generarían la misma "
+                  f"salida {output_path}", file=sys.stderr)
+        return 2
+    if args.output and not output_is_file and not args.merge:
+        for _, output_path in jobs:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    writer_options = None
+    if args.format == 'xlsx':
+        writer_options = {
+            'max_rows': args.max_rows,
+            'shard_mode': args.shard,
+            'workers': workers,
+        }
+
+    try:
+        selection = build_selection(args)
+        schema = load_schema(args.schema) if args.schema else None
+        if args.state_dir:
+            from .utils.delta import DeltaState
+
+            DeltaState.check_columns(
+                args.columns or
+                [column.name for column in schema or default_schema()]
+            )
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    options = {
+        'output_format': args.format,
+        'writer_options': writer_options,
+        'state_dir': args.state_dir,
+        'report': args.report,
+        'cache_dir': args.cache_dir,
+        'cache_size': args.cache_size,
+        'keys': args.keys,
+        'selection': selection,
+        'columns': args.columns,
+        'engine': args.engine,
+        'children': args.children,
+        'schema': schema,
+        'fetch_options': {
+            'page_size': args.page_size,
+            'connections': args.connections,
+            'rate': args.rate,
+        },
+    }
+
+    if args.merge:
+        output_path = resolve_output(
+            'merged', args.output or os.path.dirname(files[0]), args.format,
+            output_is_file
+        )
+        failures = _report(
+            [((', '.join(files), output_path),
+              _merge(files, output_path, args.jobs, options))],
+            args.quiet
+        )
+    elif (args.jobs or 1) > 1 and len(jobs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            futures = [
+                executor.submit(
+                    convert_one, file_path, output_path, workers, **options
+                )
+                for file_path, output_path in jobs
+            ]
+            failures = _report(
+                ((job, future.exception()) for job, future in zip(jobs, futures)),
+                args.quiet
+            )
+    else:
+        failures = _report(_convert_serial(jobs, workers, options), args.quiet)
+
+    return 1 if failures else 0
+
+def _merge(files, output_path, jobs, options):
+    """
+    Combina todas las entradas en una sola salida.
+
+    Args:
+        files (list): Archivos XML, en el orden indicado
+        output_path (str): Archivo de salida
+        jobs (int): Archivos procesados en paralelo; con None uno por CPU
+        options (dict): Opciones de conversión
+
+    Returns:
+        Exception: Error de la combinación, o None si terminó bien
+    """
+    try:
+        converter = JiraXMLConverter(
+            gui=False, engine=options['engine'], schema=options['schema']
+        )
+        converter.merge(
+            files, output_path,
+            output_format=options['output_format'],
+            writer_options=options['writer_options'],
+            selection=options['selection'],
+            columns=options['columns'],
+            workers=jobs,
+            children=options['children']
+        )
+        if options['report']:
+            converter.last_report.save(f'{output_path}.report.json')
+    except Exception as e:
+        return e
+    return None
+
+def _convert_serial(jobs, workers, options):
+    """
+    Convierte los archivos uno a uno en el proceso actual.
+
+    Args:
+        jobs (list): Pares (entrada, salida)
+        workers (int): Procesos para el parsing
+        options (dict): Argumentos adicionales de convert_one
+
+    Yields:
+        tuple: ((entrada, salida), excepción o None)
+    """
+    for file_path, output_path in jobs:
+        try:
+            convert_one(file_path, output_path, workers, **options)
+            yield (file_path, output_path), None
+        except Exception as e:
+            yield (file_path, output_path), e
+
+def _report(results, quiet):
+    """
+    Muestra el resultado de cada conversión.
+
+    Args:
+        results (iterable): Pares ((entrada, salida), excepción o None),
+            que se muestran a medida que se producen
+        quiet (bool): Si se omiten las conversiones correctas
+
+    Returns:
+        int: Número de conversiones fallidas
+    """
+    failures = 0
+    for (file_path, output_path), error in results:
+        if error is not None:
+            failures += 1
+            print(f"Error: {file_path}: {error}", file=sys.stderr)
+        elif not quiet:
+            print(f"{file_path} -> {output_path}")
+    return failures
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,64 +4,480 @@ Módulo principal del conversor XML de Jira a Excel.
 
 import os
 from datetime import datetime
-import pandas as pd
-from .utils import XMLParser, ExcelFormatter
-from .gui.windows import MainWindow
+from .utils import XMLParser, RunReport, get_writer
+from .utils.instrumentation import ConversionCancelled
+from .utils.merge import index_files, iter_selected, newest_spans
+from .utils.selection import UniqueKeys, combine_filters
 
 class JiraXMLConverter:
     """Clase principal para la conversión de XML de Jira a Excel."""
 
-    def __init__(self):
-        """Inicializa el conversor y la interfaz gráfica."""
-        self.xml_parser = XMLParser()
-        self.window = MainWindow(self.process_file)
+    def __init__(self, workers=1, gui=True, engine='auto', schema=None):
+        """
+        Inicializa el conversor y la interfaz gráfica.
+
+        Args:
+            workers (int, optional): Número de procesos para el parsing.
+                Con 1 se procesa en serie; con None se usa uno por CPU.
+            gui (bool, optional): Si es False no se crea la ventana ni se
+                importa tkinter (uso desde la línea de comandos).
+            engine (str, optional): Motor de parsing ('auto', 'etree' o
+                'lxml'); 'auto' usa lxml si está instalado.
+            schema (list, optional): Esquema de columnas (schema.Column);
+                por defecto las columnas estándar.
+        """
+        self.xml_parser = XMLParser(engine=engine, schema=schema)
+        self.workers = workers
+        self.window = None
+        if gui:
+            from .gui.windows import MainWindow
+            self.window = MainWindow(self.process_file)
         self.current_file = None
+        self.last_report = None
 
     def process_file(self, file_path):
         """
         Procesa el archivo XML y genera el Excel.
+
+        Se ejecuta en un hilo aparte; la ventana puede cancelar el proceso
+        activando su cancel_event.
         
+        Args:
+            file_path (str/list): Ruta al archivo XML de Jira, URL de una
+                búsqueda XML de Jira a descargar, o lista de rutas a
+                combinar en un solo Excel
+        """
+        from .utils.fetcher import JiraFetcher, auth_headers, is_url
+
+        report = RunReport(
+            self.window.update_progress, source=file_path,
+            cancel_event=self.window.cancel_event
+        )
+        try:
+            if isinstance(file_path, str) and is_url(file_path):
+                fetcher = JiraFetcher(file_path, headers=auth_headers())
+                self.fetch(fetcher, report=report)
+            elif isinstance(file_path, str):
+                self.convert(file_path, report=report)
+            else:
+                self.merge(list(file_path), report=report)
+        except ConversionCancelled:
+            self.window.update_progress(0, "Conversión cancelada")
+        except Exception as e:
+            self.window.update_progress(
+                0,
+                "Error en el proceso",
+                str(e)
+            )
+
+    def convert(self, file_path, output_path=None, progress=None,
+                output_format='xlsx', writer_options=None, delta_state=None,
+                report=None, keys=None, cache=None, selection=None,
+                columns=None, children=None):
+        """
+        Convierte un archivo XML de Jira a Excel u otro formato de salida.
+
         Args:
             file_path (str): Ruta al archivo XML de Jira
+            output_path (str, optional): Ruta del archivo generado. Por
+                defecto jira_export_<timestamp>.<formato> junto al XML.
+            progress (callable, optional): Función (valor, texto) que recibe
+                el avance del proceso
+            output_format (str, optional): Formato de salida registrado en
+                WRITERS ('xlsx', 'csv', 'parquet' o 'arrow')
+            writer_options (dict, optional): Opciones adicionales del writer
+                (por ejemplo max_rows y shard_mode para xlsx)
+            delta_state (DeltaState, optional): Estado de la conversión
+                incremental. Los items sin cambios desde la última ejecución
+                se descartan al parsear y las filas nuevas o modificadas se
+                combinan con la salida anterior.
+            report (RunReport, optional): Informe donde se registran el
+                tiempo, los items, los bytes leídos y la memoria de cada
+                etapa. Si no se indica se crea uno a partir de `progress`;
+                en ambos casos queda disponible en `last_report`.
+            keys (iterable, optional): Códigos de las tareas a exportar. Se
+                leen directamente de sus offsets mediante el índice del
+                archivo (<archivo>.idx.json), sin parsear el resto. Los
+                códigos que no están en el archivo quedan en
+                report.missing_keys.
+            cache (ParseCache, optional): Caché de resultados de parsing. Si
+                el mismo contenido ya se convirtió con la misma
+                configuración, se omite el parsing. No se usa con
+                delta_state, keys, selection, columns ni children.
+            selection (ItemSelection, optional): Filtro de items, aplicado
+                antes del parsing de cada item
+            columns (list, optional): Columnas a exportar; las demás no se
+                calculan
+            children (list, optional): Tablas hijas de CHILD_TABLES
+                ('worklogs', 'comments', 'links', 'subtasks') a extraer en
+                la misma pasada y escribir junto a la salida. No se admite
+                con delta_state.
+
+        Returns:
+            str: Ruta del archivo generado
+
+        Raises:
+            XMLParseError: Si hay error en el parsing
+            ValueError: Si el archivo no contiene items, el formato no existe
+                o se piden tablas hijas o se omiten las columnas del estado
+                en modo incremental
         """
+        writer_class = get_writer(output_format)
+        if children and delta_state is not None:
+            raise ValueError(
+                "Las tablas hijas no están disponibles en modo incremental"
+            )
+        if delta_state is not None:
+            delta_state.check_columns(
+                columns if columns is not None
+                else [column.name for column in self.xml_parser.schema]
+            )
+        if report is None:
+            report = RunReport(progress, source=file_path)
+        self.last_report = report
         self.current_file = file_path
-        try:
-            # Lectura y procesamiento del XML
-            self.window.update_progress(20, "Procesando archivo XML...")
-            items, links = self.xml_parser.parse_file(file_path)
-            
-            if not items:
+        file_size = os.path.getsize(file_path) if os.path.isfile(file_path) else 0
+
+        # Lectura y procesamiento del XML, o resultado en caché
+        cache_key = None
+        cached = None
+        child_frames = None
+        if cache is not None and delta_state is None and keys is None \
+                and selection is None and columns is None and not children \
+                and os.path.isfile(file_path):
+            with report.stage('cache', "Buscando en caché...", 0, 0) as stage:
+                cache_key = cache.key(file_path, self.xml_parser)
+                cached = cache.get(cache_key)
+                stage.advance(
+                    len(cached[0]) if cached else None, file_size
+                )
+        if cached is not None:
+            df, links = cached
+        else:
+            df, links, child_frames = self._parse(
+                file_path, file_size, report, keys, delta_state, selection,
+                columns, children
+            )
+            if cache_key is not None:
+                cache.put(cache_key, df, links)
+
+        if delta_state is not None:
+            with report.stage(
+                'merge', "Combinando con la ejecución anterior...", 70, 75
+            ) as stage:
+                df, links = delta_state.merge(df, links)
+                stage.advance(items=len(df))
+            if df.empty:
                 raise ValueError("No se encontraron datos para procesar")
 
-            # Creación del DataFrame
-            self.window.update_progress(50, "Creando DataFrame...")
-            df = pd.DataFrame(items)
+        output_path = self._write(
+            df, links, file_path, output_path, writer_class, writer_options,
+            report, child_frames
+        )
+        if delta_state is not None:
+            with report.stage('save_state', "Guardando estado...", 100, 100):
+                delta_state.save(df, links)
+
+        status_text = (
+            f"¡Proceso completado!\nArchivo guardado como:\n{output_path}"
+        )
+        if report.missing_keys:
+            status_text += (
+                f"\nTareas no encontradas: {', '.join(report.missing_keys)}"
+            )
+        report.notify(100, status_text)
+        return output_path
+
+    def merge(self, file_paths, output_path=None, progress=None,
+              output_format='xlsx', writer_options=None, report=None,
+              selection=None, columns=None, workers=None, children=None):
+        """
+        Combina varias exportaciones XML de Jira en una sola salida.
+
+        Cada tarea aparece una sola vez: si está en varios archivos se
+        conserva la versión con el `updated` más reciente. Los archivos se
+        indexan y parsean en paralelo y solo se parsean los items elegidos,
+        por lo que la memoria depende del número de tareas distintas y no
+        del tamaño total de los archivos.
+
+        Args:
+            file_paths (list): Rutas a los archivos XML de Jira, de las
+                páginas o exportaciones más antiguas a las más recientes
+            output_path (str, optional): Ruta del archivo generado. Por
+                defecto jira_export_<timestamp>.<formato> junto al primer XML.
+            progress (callable, optional): Función (valor, texto) que recibe
+                el avance del proceso
+            output_format (str, optional): Formato de salida registrado en
+                WRITERS
+            writer_options (dict, optional): Opciones adicionales del writer
+            report (RunReport, optional): Informe de la ejecución
+            selection (ItemSelection, optional): Filtro de items
+            columns (list, optional): Columnas a exportar
+            workers (int, optional): Archivos procesados en paralelo; con
+                None uno por CPU
+            children (list, optional): Tablas hijas a extraer de los items
+                elegidos
+
+        Returns:
+            str: Ruta del archivo generado
+
+        Raises:
+            XMLParseError: Si hay error en el parsing
+            ValueError: Si no hay archivos o ninguno contiene items
+        """
+        if not file_paths:
+            raise ValueError("No se indicaron archivos para combinar")
+        writer_class = get_writer(output_format)
+        if report is None:
+            report = RunReport(progress, source=list(file_paths))
+        self.last_report = report
+        self.current_file = file_paths[0]
+
+        xml_parser = self.xml_parser
+        if selection is not None or columns is not None or children:
+            xml_parser = XMLParser(
+                self.xml_parser.custom_fields,
+                item_filter=selection,
+                columns=columns,
+                engine=self.xml_parser.engine,
+                children=children,
+                schema=self.xml_parser.schema
+            )
+        total = len(file_paths)
+        with report.stage('index', "Indexando archivos...", 0, 10) as stage:
+            indexes = index_files(
+                file_paths, workers,
+                progress=lambda done: stage.advance(fraction=done / total)
+            )
+            spans = newest_spans(indexes)
+            stage.advance(
+                items=sum(len(file_spans) for file_spans in spans), fraction=1
+            )
+
+        store = xml_parser.new_column_store()
+        links = []
+        with report.stage('parse', "Procesando archivos XML...", 10, 60) \
+                as stage:
+            for item, link in iter_selected(
+                file_paths, spans, xml_parser, workers,
+                progress=lambda done, items: stage.advance(
+                    items, fraction=done / total
+                )
+            ):
+                store.append(item)
+                links.append(link)
+
+        if not len(store):
+            raise ValueError("No se encontraron datos para procesar")
+        with report.stage('dataframe', "Creando DataFrame...", 60, 75) as stage:
+            df = xml_parser.to_dataframe(store)
+            child_frames = xml_parser.to_child_frames() if children else None
+            stage.advance(items=len(df))
+
+        output_path = self._write(
+            df, links, file_paths[0], output_path, writer_class,
+            writer_options, report, child_frames
+        )
+        report.notify(
+            100,
+            f"¡Proceso completado!\nArchivo guardado como:\n{output_path}"
+        )
+        return output_path
+
+    def fetch(self, fetcher, output_path=None, progress=None,
+              output_format='xlsx', writer_options=None, report=None,
+              selection=None, columns=None, children=None):
+        """
+        Descarga una búsqueda de Jira y la convierte.
+
+        Cada página se parsea en cuanto llega y se descarta, mientras el
+        fetcher descarga las siguientes; en memoria solo quedan las filas
+        procesadas. Si una tarea aparece en dos páginas (porque la búsqueda
+        cambió durante la descarga) se conserva la primera, sin procesar
+        la repetida.
+
+        Args:
+            fetcher (JiraFetcher): Búsqueda a descargar
+            output_path (str, optional): Ruta del archivo generado. Por
+                defecto jira_export_<timestamp>.<formato> en el directorio
+                actual.
+            progress (callable, optional): Función (valor, texto) que recibe
+                el avance del proceso
+            output_format (str, optional): Formato de salida registrado en
+                WRITERS
+            writer_options (dict, optional): Opciones adicionales del writer
+            report (RunReport, optional): Informe de la ejecución
+            selection (ItemSelection, optional): Filtro de items
+            columns (list, optional): Columnas a exportar
+            children (list, optional): Tablas hijas a extraer
+
+        Returns:
+            str: Ruta del archivo generado
+
+        Raises:
+            FetchError: Si la búsqueda no se puede descargar
+            XMLParseError: Si hay error en el parsing
+            ValueError: Si la búsqueda no devuelve items
+        """
+        writer_class = get_writer(output_format)
+        if report is None:
+            report = RunReport(progress, source=fetcher.url)
+        self.last_report = report
+        self.current_file = fetcher.url
+
+        # Las páginas pueden solaparse si la búsqueda cambia durante la
+        # descarga: de cada tarea se conserva su primera aparición
+        xml_parser = XMLParser(
+            self.xml_parser.custom_fields,
+            item_filter=combine_filters(selection, UniqueKeys()),
+            columns=columns,
+            engine=self.xml_parser.engine,
+            children=children,
+            schema=self.xml_parser.schema
+        )
+        store = xml_parser.new_column_store()
+        links = []
+        child_rows = xml_parser.take_child_rows()
+        with report.stage('fetch', "Descargando búsqueda de Jira...", 0, 60) \
+                as stage:
+            for page in fetcher.iter_pages():
+                for item, link in xml_parser.iter_bytes(page):
+                    store.append(item)
+                    links.append(link)
+                for name, rows in xml_parser.take_child_rows().items():
+                    child_rows[name].extend(rows)
+                stage.advance(
+                    len(store), fetcher.bytes_read,
+                    fetcher.pages_read / fetcher.page_count
+                )
+
+        if not len(store):
+            raise ValueError("No se encontraron datos para procesar")
+        with report.stage('dataframe', "Creando DataFrame...", 60, 75) as stage:
+            df = xml_parser.to_dataframe(store)
+            child_frames = xml_parser.to_child_frames(child_rows) \
+                if children else None
+            stage.advance(items=len(df))
+
+        output_path = self._write(
+            df, links, '', output_path, writer_class, writer_options, report,
+            child_frames
+        )
+        report.notify(
+            100,
+            f"¡Proceso completado!\nArchivo guardado como:\n{output_path}"
+        )
+        return output_path
+
+    def _write(self, df, links, file_path, output_path, writer_class,
+               writer_options, report, children=None):
+        """
+        Escribe el archivo de salida.
+
+        Args:
+            df (pandas.DataFrame): Datos a escribir
+            links (list): Links de las tareas
+            file_path (str): Archivo XML de entrada, para la ruta por defecto
+            output_path (str): Ruta del archivo generado, o None
+            writer_class (type): Writer del formato de salida
+            writer_options (dict): Opciones adicionales del writer
+            report (RunReport): Informe de la ejecución
+            children (dict, optional): Tablas hijas (nombre -> DataFrame)
 
-            # Configuración del archivo Excel
-            self.window.update_progress(70, "Generando archivo Excel...")
+        Returns:
+            str: Ruta del archivo generado
+        """
+        # Configuración del archivo de salida
+        if output_path is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_path = os.path.join(
                 os.path.dirname(file_path),
-                f'jira_export_{timestamp}.xlsx'
+                f'jira_export_{timestamp}.{writer_class.extension}'
             )
+        report.output = output_path
 
-            # Formateo y guardado del Excel
-            self.window.update_progress(80, "Aplicando formato...")
-            formatter = ExcelFormatter(df, output_path, links)
-            if formatter.format_excel():
-                self.window.update_progress(
-                    100,
-                    f"¡Proceso completado!\nArchivo guardado como:\n{output_path}"
-                )
-            else:
-                raise Exception("Error al formatear el archivo Excel")
+        # Formateo y guardado; una cancelación a mitad de escritura no deja
+        # un archivo incompleto
+        total = len(df)
+        with report.stage('write', "Generando archivo de salida...", 75, 100) \
+                as stage:
+            writer = writer_class(
+                df, output_path, links,
+                progress=lambda rows: stage.advance(
+                    rows, fraction=rows / total if total else 1.0
+                ),
+                children=children,
+                **(writer_options or {})
+            )
+            try:
+                writer.write()
+            except ConversionCancelled:
+                for path in writer.output_paths():
+                    if os.path.isfile(path):
+                        os.remove(path)
+                raise
+            stage.advance(items=total)
+        return output_path
 
-        except Exception as e:
-            self.window.update_progress(
-                0,
-                "Error en el proceso",
-                str(e)
+    def _parse(self, file_path, file_size, report, keys=None, delta_state=None,
+               selection=None, columns=None, children=None):
+        """
+        Parsea el archivo y construye el DataFrame.
+
+        Args:
+            file_path (str): Ruta al archivo XML de Jira
+            file_size (int): Tamaño del archivo, para el progreso
+            report (RunReport): Informe de la ejecución
+            keys (iterable, optional): Códigos de las tareas a exportar
+            delta_state (DeltaState, optional): Estado incremental
+            selection (ItemSelection, optional): Filtro de items
+            columns (list, optional): Columnas a generar
+            children (list, optional): Tablas hijas a extraer
+
+        Returns:
+            tuple: (DataFrame, Lista de links, tablas hijas como las de
+                XMLParser.to_child_frames o None)
+
+        Raises:
+            XMLParseError: Si hay error en el parsing
+            ValueError: Si el archivo no contiene items
+        """
+        xml_parser = self.xml_parser
+        item_filter = combine_filters(selection, delta_state)
+        if item_filter is not None or columns is not None or children:
+            xml_parser = XMLParser(
+                self.xml_parser.custom_fields,
+                item_filter=item_filter,
+                columns=columns,
+                engine=self.xml_parser.engine,
+                children=children,
+                schema=self.xml_parser.schema
             )
+        store = xml_parser.new_column_store()
+        links = []
+        with report.stage('parse', "Procesando archivo XML...", 0, 60) as stage:
+            def parse_progress(items, bytes_read):
+                stage.advance(
+                    items, bytes_read,
+                    bytes_read / file_size if file_size else 1.0
+                )
+
+            for item, link in xml_parser.iter_file(
+                file_path, self.workers, progress=parse_progress, keys=keys
+            ):
+                store.append(item)
+                links.append(link)
+        report.missing_keys = list(xml_parser.missing_keys)
+
+        if not len(store) and delta_state is None:
+            raise ValueError("No se encontraron datos para procesar")
+
+        # Creación del DataFrame
+        with report.stage('dataframe', "Creando DataFrame...", 60, 70) as stage:
+            df = xml_parser.to_dataframe(store)
+            child_frames = xml_parser.to_child_frames() if children else None
+            stage.advance(items=len(df))
+        return df, links, child_frames
 
     def run(self):
         """Inicia la aplicación."""
@@ -69,4 +485,4 @@ class JiraXMLConverter:
 
 if __name__ == "__main__":
     app = JiraXMLConverter()
-    app.run()
\ No newline at end of file
+    app.run()
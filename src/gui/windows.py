@@ -2,52 +2,97 @@
 Módulo de interfaz gráfica para el conversor XML a Excel.
 """
 
+import queue
 import tkinter as tk
 from tkinter import ttk, filedialog
 import threading
 
+# Intervalo con que el loop de Tk revisa la cola de progreso (ms)
+POLL_INTERVAL_MS = 50
+
 class MainWindow:
-    """Ventana principal de la aplicación."""
+    """
+    Ventana principal de la aplicación.
+
+    La conversión se ejecuta en un hilo aparte. Tk no admite llamadas desde
+    otros hilos, así que ese hilo solo deja mensajes en una cola y el loop
+    principal los aplica a los widgets cada POLL_INTERVAL_MS; la ventana
+    sigue respondiendo durante conversiones largas.
+    """
 
     def __init__(self, process_callback):
         """
         Inicializa la ventana principal.
 
         Args:
-            process_callback (callable): Función para procesar el archivo XML
+            process_callback (callable): Función para procesar el archivo XML.
+                Se ejecuta en un hilo aparte y debe revisar cancel_event.
         """
         self.root = tk.Tk()
         self.root.title("Conversor XML Jira a Excel")
-        self.root.geometry("600x350")
+        self.root.geometry("600x420")
         self.process_callback = process_callback
+        self.cancel_event = threading.Event()
+        self._events = queue.Queue()
+        self._worker = None
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        self.root.after(POLL_INTERVAL_MS, self._poll_events)
 
     def setup_ui(self):
         """Configura los elementos de la interfaz gráfica."""
         # Configuración de estilo
         style = ttk.Style()
         style.configure("Custom.TButton", padding=10)
-        
+
         # Frame principal
         main_frame = ttk.Frame(self.root, padding="20")
         main_frame.pack(fill=tk.BOTH, expand=True)
 
         # Título
         title_label = ttk.Label(
-            main_frame, 
+            main_frame,
             text="Conversor de XML Jira a Excel",
             font=("Helvetica", 14, "bold")
         )
         title_label.pack(pady=10)
 
-        # Botón de selección
+        # Botones de selección y cancelación
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(pady=20)
+
         self.select_button = ttk.Button(
-            main_frame,
-            text="Seleccionar archivo XML",
+            button_frame,
+            text="Seleccionar archivos XML",
             command=self.select_file,
             style="Custom.TButton"
         )
-        self.select_button.pack(pady=20)
+        self.select_button.pack(side=tk.LEFT, padx=5)
+
+        self.cancel_button = ttk.Button(
+            button_frame,
+            text="Cancelar",
+            command=self.cancel,
+            style="Custom.TButton",
+            state="disabled"
+        )
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+
+        # Descarga de una búsqueda de Jira (vista XML); las credenciales se
+        # leen de JIRA_USER y JIRA_TOKEN
+        url_frame = ttk.Frame(main_frame)
+        url_frame.pack(pady=5, fill=tk.X)
+
+        self.url_entry = ttk.Entry(url_frame)
+        self.url_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+
+        self.fetch_button = ttk.Button(
+            url_frame,
+            text="Descargar búsqueda",
+            command=self.fetch_url,
+            style="Custom.TButton"
+        )
+        self.fetch_button.pack(side=tk.LEFT, padx=5)
 
         # Barra de progreso
         self.progress = ttk.Progressbar(
@@ -77,23 +122,104 @@ class MainWindow:
         self.error_label.pack(pady=10)
 
     def select_file(self):
-        """Maneja la selección de archivo y inicia el procesamiento."""
-        file_path = filedialog.askopenfilename(
+        """
+        Maneja la selección de archivos e inicia el procesamiento.
+
+        Con varios archivos (por ejemplo, las páginas de una exportación de
+        Jira) se genera un solo Excel sin tareas duplicadas.
+        """
+        file_paths = filedialog.askopenfilenames(
             filetypes=[("XML files", "*.xml")]
         )
-        if file_path:
-            self.select_button["state"] = "disabled"
-            self.error_label["text"] = ""
-            thread = threading.Thread(
-                target=self.process_callback, 
-                args=(file_path,)
+        if file_paths:
+            self._start(
+                file_paths[0] if len(file_paths) == 1 else list(file_paths)
             )
-            thread.start()
+
+    def fetch_url(self):
+        """
+        Inicia la descarga y conversión de la búsqueda indicada en el campo
+        de URL (vista XML de Jira, todas sus páginas).
+        """
+        url = self.url_entry.get().strip()
+        if url:
+            self._start(url)
+
+    def _start(self, source):
+        """
+        Inicia la conversión en el hilo de trabajo.
+
+        Args:
+            source (str/list): Archivo, archivos o URL a convertir
+        """
+        self.select_button["state"] = "disabled"
+        self.fetch_button["state"] = "disabled"
+        self.cancel_button["state"] = "normal"
+        self.error_label["text"] = ""
+        self.cancel_event.clear()
+        self._worker = threading.Thread(
+            target=self._run, args=(source,), daemon=True
+        )
+        self._worker.start()
+
+    def cancel(self):
+        """Solicita la cancelación de la conversión en curso."""
+        self.cancel_event.set()
+        self.cancel_button["state"] = "disabled"
+        self.status_label["text"] = "Cancelando..."
+
+    def close(self):
+        """Cancela la conversión en curso, si la hay, y cierra la ventana."""
+        self.cancel_event.set()
+        if self._worker is not None:
+            self._worker.join(timeout=2)
+        self.root.destroy()
 
     def update_progress(self, value, status_text, error_text=None):
         """
         Actualiza la barra de progreso y mensajes.
 
+        Puede llamarse desde cualquier hilo: el cambio se aplica en el loop
+        principal de Tk.
+
+        Args:
+            value (int): Valor del progreso (0-100)
+            status_text (str): Texto de estado
+            error_text (str, optional): Texto de error
+        """
+        self._events.put(('progress', value, status_text, error_text))
+
+    def _run(self, file_path):
+        """
+        Ejecuta la conversión en el hilo de trabajo.
+
+        Args:
+            file_path (str/list): Archivo, archivos o URL seleccionados
+        """
+        try:
+            self.process_callback(file_path)
+        finally:
+            self._events.put(('finished',))
+
+    def _poll_events(self):
+        """Aplica los mensajes pendientes del hilo de trabajo."""
+        try:
+            while True:
+                event = self._events.get_nowait()
+                if event[0] == 'progress':
+                    self._apply_progress(*event[1:])
+                else:
+                    self.select_button["state"] = "normal"
+                    self.fetch_button["state"] = "normal"
+                    self.cancel_button["state"] = "disabled"
+        except queue.Empty:
+            pass
+        self.root.after(POLL_INTERVAL_MS, self._poll_events)
+
+    def _apply_progress(self, value, status_text, error_text=None):
+        """
+        Muestra el progreso en los widgets (solo desde el loop de Tk).
+
         Args:
             value (int): Valor del progreso (0-100)
             status_text (str): Texto de estado
@@ -103,11 +229,7 @@ class MainWindow:
         self.status_label["text"] = status_text
         if error_text:
             self.error_label["text"] = f"Error: {error_text}"
-            self.select_button["state"] = "normal"
-        elif value == 100:
-            self.select_button["state"] = "normal"
-        self.root.update_idletasks()
 
     def run(self):
         """Inicia el loop principal de la aplicación."""
-        self.root.mainloop()
\ No newline at end of file
+        self.root.mainloop()
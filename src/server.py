@@ -0,0 +1,627 @@
+"""
+Servicio HTTP de conversión basado en asyncio.
+
+Recibe exportaciones XML por HTTP, las guarda en disco a medida que llegan
+y las convierte en un pool de procesos de tamaño fijo, sin interfaz
+gráfica (no importa tkinter):
+
+    python -m src.server --port 8080 --work-dir /var/lib/jira-xml2xlsx
+
+API:
+
+    POST   /jobs?format=xlsx    Cuerpo: el XML. Responde 202 con el trabajo.
+    GET    /jobs/<id>           Estado, progreso e informe del trabajo.
+    GET    /jobs/<id>/result    Descarga el archivo generado.
+    DELETE /jobs/<id>           Elimina el trabajo y sus archivos.
+
+Los trabajos esperan en una cola acotada; cuando está llena se responde
+503 con Retry-After sin leer el cuerpo, de modo que los clientes reintentan
+en lugar de acumular subidas. El tamaño de cada subida y la memoria de cada
+proceso de conversión también están limitados, para que un export enorme no
+deje sin recursos al resto.
+"""
+
+import argparse
+import asyncio
+import errno
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import parse_qs, urlsplit
+from .converter import JiraXMLConverter
+from .utils import WRITERS
+from .utils.xml_parser import PARSER_ENGINES
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Bloque de lectura y escritura de las subidas y descargas (bytes)
+STREAM_BLOCK_SIZE = 1024 * 1024
+
+# Tamaño máximo de la línea de petición más las cabeceras (bytes)
+MAX_HEADER_BYTES = 64 * 1024
+
+# Segundos sugeridos al cliente para reintentar con la cola llena
+RETRY_AFTER = 5
+
+logger = logging.getLogger(__name__)
+
+# Estados de un trabajo
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+HTTP_REASONS = {
+    200: 'OK',
+    202: 'Accepted',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    409: 'Conflict',
+    411: 'Length Required',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable',
+}
+
+class HTTPError(Exception):
+    """Error que se devuelve al cliente con un código HTTP."""
+
+    def __init__(self, status, message, headers=None):
+        """
+        Inicializa el error.
+
+        Args:
+            status (int): Código HTTP
+            message (str): Descripción del error
+            headers (dict, optional): Cabeceras adicionales de la respuesta
+        """
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+class Job:
+    """Trabajo de conversión y su estado."""
+
+    def __init__(self, job_id, directory, output_format):
+        """
+        Inicializa el trabajo.
+
+        Args:
+            job_id (str): Identificador del trabajo
+            directory (str): Directorio con la entrada y la salida
+            output_format (str): Formato de salida
+        """
+        self.id = job_id
+        self.directory = directory
+        self.output_format = output_format
+        self.input_path = os.path.join(directory, 'input.xml')
+        self.output_path = os.path.join(directory, f'output.{output_format}')
+        self.status = QUEUED
+        self.progress = 0
+        self.status_text = None
+        self.error = None
+        self.report = None
+        self.bytes_received = 0
+
+    def to_dict(self):
+        """
+        Convierte el trabajo en un diccionario serializable a JSON.
+
+        Returns:
+            dict: Estado público del trabajo
+        """
+        return {
+            'id': self.id,
+            'status': self.status,
+            'format': self.output_format,
+            'progress': self.progress,
+            'status_text': self.status_text,
+            'bytes_received': self.bytes_received,
+            'error': self.error,
+            'report': self.report,
+        }
+
+class ConversionService:
+    """
+    Servicio de conversión: servidor HTTP, cola de trabajos y pool de
+    procesos.
+
+    Con `concurrency` procesos se convierten a la vez como máximo
+    `concurrency` archivos; hasta `max_queue` trabajos más esperan en la
+    cola. El progreso de cada conversión llega desde los procesos hijos por
+    una cola de multiprocessing y se expone en GET /jobs/<id>.
+    """
+
+    def __init__(self, work_dir, concurrency=2, max_queue=8,
+                 max_upload_bytes=2 * 1024 ** 3, memory_limit_mb=None,
+                 engine='auto'):
+        """
+        Inicializa el servicio.
+
+        Args:
+            work_dir (str): Directorio donde se guardan entradas y salidas
+            concurrency (int, optional): Conversiones simultáneas (procesos)
+            max_queue (int, optional): Trabajos en espera antes de responder
+                503 a nuevas subidas
+            max_upload_bytes (int, optional): Tamaño máximo de una subida
+            memory_limit_mb (int, optional): Memoria máxima (espacio de
+                direcciones) de cada proceso de conversión; sin límite si es
+                None. Solo en plataformas con el módulo resource.
+            engine (str, optional): Motor de parsing XML
+        """
+        self.work_dir = work_dir
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.max_upload_bytes = max_upload_bytes
+        self.memory_limit_mb = memory_limit_mb
+        self.engine = engine
+        self.jobs = {}
+        self._queue = None
+        self._pending = 0
+        self._pool = None
+        self._progress_queue = None
+        self._tasks = []
+        self._server = None
+        os.makedirs(work_dir, exist_ok=True)
+
+    async def start(self, host='127.0.0.1', port=8080):
+        """
+        Arranca el pool de procesos, los despachadores y el servidor HTTP.
+
+        Args:
+            host (str, optional): Dirección de escucha
+            port (int, optional): Puerto; con 0 se elige uno libre
+
+        Returns:
+            tuple: (host, puerto) en que escucha el servidor
+        """
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        # SimpleQueue escribe directamente en el pipe, sin hilo auxiliar que
+        # pueda fallar al arrancar con el límite de memoria del proceso
+        self._progress_queue = multiprocessing.SimpleQueue()
+        self._pool = self._new_pool()
+        self._tasks = [
+            loop.create_task(self._dispatch())
+            for _ in range(self.concurrency)
+        ]
+        self._tasks.append(loop.create_task(self._relay_progress()))
+        self._server = await asyncio.start_server(
+            self._handle_connection, host, port, limit=MAX_HEADER_BYTES
+        )
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        """Atiende peticiones hasta que se cancela la tarea."""
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        """Detiene el servidor, los despachadores y el pool de procesos."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._progress_queue.put(None)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        # Al cancelar un despachador se cancela también su trabajo si aún no
+        # había empezado; cada uno tiene como mucho uno en el pool
+        self._pool.shutdown(wait=True)
+        self._progress_queue.close()
+
+    def _new_pool(self):
+        """Crea el pool de procesos de conversión."""
+        return ProcessPoolExecutor(
+            max_workers=self.concurrency,
+            initializer=_init_job_worker,
+            initargs=(self._progress_queue, self.memory_limit_mb)
+        )
+
+    async def _dispatch(self):
+        """Toma trabajos de la cola y los convierte de uno en uno."""
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            self._pending -= 1
+            if job.id not in self.jobs:  # Eliminado mientras esperaba
+                continue
+            job.status = RUNNING
+            pool = self._pool
+            try:
+                job.report = await loop.run_in_executor(
+                    pool, _run_job, job.id, job.input_path,
+                    job.output_path, job.output_format, self.engine
+                )
+                job.status = DONE
+                job.progress = 100
+            except BrokenProcessPool:
+                job.status = FAILED
+                job.error = "El proceso de conversión terminó inesperadamente"
+                # Varios trabajos del mismo pool fallan a la vez: solo el
+                # primero lo reemplaza
+                if self._pool is pool:
+                    pool.shutdown(wait=False)
+                    self._pool = self._new_pool()
+            except MemoryError:
+                job.status = FAILED
+                job.error = (
+                    f"Se superó el límite de memoria de "
+                    f"{self.memory_limit_mb} MB"
+                )
+            except Exception as e:
+                job.status = FAILED
+                job.error = str(e)
+            finally:
+                self._remove_file(job.input_path)
+
+    async def _relay_progress(self):
+        """Traslada el progreso de los procesos hijos a los trabajos."""
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await loop.run_in_executor(None, self._progress_queue.get)
+            if message is None:
+                return
+            job_id, value, status_text = message
+            job = self.jobs.get(job_id)
+            if job is not None and job.status == RUNNING:
+                job.progress = value
+                job.status_text = status_text
+
+    async def _handle_connection(self, reader, writer):
+        """
+        Atiende una petición HTTP (una por conexión).
+
+        Args:
+            reader (asyncio.StreamReader): Flujo de entrada
+            writer (asyncio.StreamWriter): Flujo de salida
+        """
+        try:
+            try:
+                method, path, query, headers = await self._read_request(reader)
+                await self._route(method, path, query, headers, reader, writer)
+            except HTTPError as e:
+                await self._send_json(
+                    writer, e.status, {'error': str(e)}, e.headers
+                )
+            except (ConnectionError, asyncio.IncompleteReadError,
+                    asyncio.CancelledError):
+                # CancelledError deriva de Exception hasta Python 3.8
+                raise
+            except Exception:
+                logger.exception("Error inesperado al atender una petición")
+                await self._send_json(
+                    writer, 500, {'error': "Error interno del servidor"}
+                )
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader):
+        """
+        Lee la línea de petición y las cabeceras.
+
+        Args:
+            reader (asyncio.StreamReader): Flujo de entrada
+
+        Returns:
+            tuple: (método, ruta, parámetros de la query, cabeceras en
+                minúsculas)
+
+        Raises:
+            HTTPError: Si la petición está mal formada
+        """
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.LimitOverrunError:
+            raise HTTPError(400, "Cabeceras demasiado grandes")
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, _ = lines[0].split(' ', 2)
+        except ValueError:
+            raise HTTPError(400, "Línea de petición inválida")
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        return method.upper(), url.path, query, headers
+
+    async def _route(self, method, path, query, headers, reader, writer):
+        """
+        Ejecuta la operación correspondiente a la petición.
+
+        Raises:
+            HTTPError: Si la ruta o el método no existen
+        """
+        parts = [part for part in path.split('/') if part]
+        if parts == ['jobs']:
+            if method != 'POST':
+                raise HTTPError(405, "Método no permitido")
+            job = await self._create_job(query, headers, reader)
+            await self._send_json(writer, 202, job.to_dict(),
+                                  {'Location': f'/jobs/{job.id}'})
+            return
+        if len(parts) in (2, 3) and parts[0] == 'jobs':
+            job = self.jobs.get(parts[1])
+            if job is None:
+                raise HTTPError(404, "Trabajo no encontrado")
+            if len(parts) == 3 and parts[2] == 'result' and method == 'GET':
+                await self._send_result(writer, job)
+                return
+            if len(parts) == 2 and method == 'GET':
+                await self._send_json(writer, 200, job.to_dict())
+                return
+            if len(parts) == 2 and method == 'DELETE':
+                self._delete_job(job)
+                await self._send_json(writer, 200, {'id': job.id})
+                return
+        raise HTTPError(404, "Ruta no encontrada")
+
+    async def _create_job(self, query, headers, reader):
+        """
+        Recibe la subida de un XML y encola su conversión.
+
+        El cuerpo se escribe en disco por bloques a medida que llega, sin
+        cargarlo completo en memoria.
+
+        Args:
+            query (dict): Parámetros de la query (format)
+            headers (dict): Cabeceras de la petición
+            reader (asyncio.StreamReader): Flujo con el cuerpo
+
+        Returns:
+            Job: Trabajo encolado
+
+        Raises:
+            HTTPError: Si la petición no es válida, el cuerpo supera el
+                límite o la cola está llena
+        """
+        output_format = query.get('format', 'xlsx')
+        if output_format not in WRITERS:
+            raise HTTPError(
+                400, f"Formato no soportado: {output_format} "
+                     f"(disponibles: {', '.join(WRITERS)})"
+            )
+        if 'content-length' not in headers:
+            raise HTTPError(411, "Se requiere Content-Length")
+        try:
+            length = int(headers['content-length'])
+        except ValueError:
+            raise HTTPError(400, "Content-Length inválido")
+        if length > self.max_upload_bytes:
+            raise HTTPError(
+                413, f"El archivo supera el máximo de "
+                     f"{self.max_upload_bytes} bytes"
+            )
+        # La plaza en la cola se reserva antes de leer el cuerpo
+        if self._pending >= self.max_queue:
+            raise HTTPError(
+                503, "Cola de conversión llena, reintente más tarde",
+                {'Retry-After': str(RETRY_AFTER)}
+            )
+        self._pending += 1
+
+        job_id = uuid.uuid4().hex
+        job = Job(job_id, os.path.join(self.work_dir, job_id), output_format)
+        loop = asyncio.get_running_loop()
+        try:
+            os.makedirs(job.directory)
+            with open(job.input_path, 'wb') as file:
+                while job.bytes_received < length:
+                    block = await reader.read(
+                        min(STREAM_BLOCK_SIZE, length - job.bytes_received)
+                    )
+                    if not block:
+                        raise HTTPError(400, "Cuerpo incompleto")
+                    await loop.run_in_executor(None, file.write, block)
+                    job.bytes_received += len(block)
+        except BaseException:
+            self._pending -= 1
+            shutil.rmtree(job.directory, ignore_errors=True)
+            raise
+        self.jobs[job_id] = job
+        self._queue.put_nowait(job)
+        return job
+
+    async def _send_result(self, writer, job):
+        """
+        Envía el archivo generado por bloques.
+
+        Raises:
+            HTTPError: Si el trabajo no terminó correctamente
+        """
+        if job.status == FAILED:
+            raise HTTPError(409, f"El trabajo falló: {job.error}")
+        if job.status != DONE:
+            raise HTTPError(409, "El trabajo todavía no terminó")
+        size = os.path.getsize(job.output_path)
+        await self._send_head(writer, 200, {
+            'Content-Type': 'application/octet-stream',
+            'Content-Length': str(size),
+            'Content-Disposition':
+                f'attachment; filename="{job.id}.{job.output_format}"',
+        })
+        loop = asyncio.get_running_loop()
+        with open(job.output_path, 'rb') as file:
+            while True:
+                block = await loop.run_in_executor(
+                    None, file.read, STREAM_BLOCK_SIZE
+                )
+                if not block:
+                    break
+                writer.write(block)
+                await writer.drain()
+
+    def _delete_job(self, job):
+        """
+        Elimina un trabajo. Si está en espera no llega a convertirse; si
+        está en curso, la conversión termina pero su resultado se descarta.
+        """
+        del self.jobs[job.id]
+        shutil.rmtree(job.directory, ignore_errors=True)
+
+    @staticmethod
+    async def _send_head(writer, status, headers):
+        """Envía la línea de estado y las cabeceras de la respuesta."""
+        lines = [f'HTTP/1.1 {status} {HTTP_REASONS.get(status, "")}']
+        lines.extend(f'{name}: {value}' for name, value in headers.items())
+        lines.append('Connection: close')
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await writer.drain()
+
+    async def _send_json(self, writer, status, data, headers=None):
+        """Envía una respuesta JSON completa."""
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        await self._send_head(writer, status, {
+            'Content-Type': 'application/json; charset=utf-8',
+            'Content-Length': str(len(body)),
+            **(headers or {}),
+        })
+        writer.write(body)
+        await writer.drain()
+
+    @staticmethod
+    def _remove_file(path):
+        """Elimina un archivo ignorando si ya no existe."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+# Cola de progreso del proceso de conversión actual
+_progress_queue = None
+
+def _init_job_worker(progress_queue, memory_limit_mb):
+    """
+    Inicializa un proceso de conversión.
+
+    Args:
+        progress_queue (multiprocessing.SimpleQueue): Cola donde se publica el
+            progreso de los trabajos
+        memory_limit_mb (int): Límite del espacio de direcciones del
+            proceso en MB, o None
+    """
+    global _progress_queue
+    _progress_queue = progress_queue
+    if memory_limit_mb and resource is not None:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def _run_job(job_id, input_path, output_path, output_format, engine):
+    """
+    Convierte un archivo en el proceso hijo.
+
+    Args:
+        job_id (str): Identificador del trabajo
+        input_path (str): XML subido
+        output_path (str): Archivo a generar
+        output_format (str): Formato de salida
+        engine (str): Motor de parsing
+
+    Returns:
+        dict: Informe de la ejecución (RunReport.to_dict)
+
+    Raises:
+        MemoryError: Si se supera el límite de memoria del proceso
+    """
+    def progress(value, status_text):
+        _progress_queue.put((job_id, value, status_text))
+
+    converter = JiraXMLConverter(gui=False, engine=engine)
+    try:
+        converter.convert(
+            input_path, output_path, progress=progress,
+            output_format=output_format
+        )
+    except OSError as e:
+        # mmap y otras llamadas al sistema fallan con ENOMEM, no MemoryError
+        if e.errno == errno.ENOMEM:
+            raise MemoryError(str(e)) from e
+        raise
+    return converter.last_report.to_dict()
+
+def build_parser():
+    """
+    Construye el parser de argumentos del servicio.
+
+    Returns:
+        argparse.ArgumentParser: Parser configurado
+    """
+    parser = argparse.ArgumentParser(
+        prog='jira-xml2xlsx-server',
+        description='Servicio HTTP de conversión de exportaciones XML de Jira.'
+    )
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Dirección de escucha (por defecto: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080,
+                        help='Puerto (por defecto: 8080)')
+    parser.add_argument('--work-dir', required=True,
+                        help='Directorio de entradas y salidas de los trabajos')
+    parser.add_argument('--concurrency', type=int, default=2,
+                        help='Conversiones simultáneas (por defecto: 2)')
+    parser.add_argument('--max-queue', type=int, default=8,
+                        help='Trabajos en espera antes de rechazar subidas '
+                             '(por defecto: 8)')
+    parser.add_argument('--max-upload-mb', type=int, default=2048,
+                        help='Tamaño máximo de cada subida en MB '
+                             '(por defecto: 2048)')
+    parser.add_argument('--memory-limit-mb', type=int,
+                        help='Memoria máxima de cada proceso de conversión '
+                             'en MB (por defecto: sin límite)')
+    parser.add_argument('--engine', default='auto',
+                        choices=PARSER_ENGINES,
+                        help='Motor de parsing XML (por defecto: auto)')
+    return parser
+
+def main(argv=None):
+    """
+    Punto de entrada del servicio.
+
+    Args:
+        argv (list, optional): Argumentos (por defecto sys.argv[1:])
+
+    Returns:
+        int: Código de salida
+    """
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(message)s')
+    service = ConversionService(
+        args.work_dir,
+        concurrency=args.concurrency,
+        max_queue=args.max_queue,
+        max_upload_bytes=args.max_upload_mb * 1024 * 1024,
+        memory_limit_mb=args.memory_limit_mb,
+        engine=args.engine
+    )
+
+    async def run():
+        host, port = await service.start(args.host, args.port)
+        print(f"Escuchando en http://{host}:{port}")
+        try:
+            await service.serve_forever()
+        finally:
+            await service.stop()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
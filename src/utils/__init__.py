@@ -1,10 +1,42 @@
 """
 Paquete de utilidades para el conversor XML de Jira a Excel.
 Contiene módulos para el manejo de datos, parsing XML y formateo Excel.
+
+Los nombres exportados se importan al usarse por primera vez, de modo que
+importar el paquete no carga pandas ni openpyxl.
 """
 
-from .data_handler import DataHandler
-from .xml_parser import XMLParser, XMLParseError
-from .excel_formatter import ExcelFormatter
+import importlib
+
+# Nombre exportado -> módulo que lo define
+_EXPORTS = {
+    'DataHandler': 'data_handler',
+    'ColumnStore': 'columns',
+    'XMLParser': 'xml_parser',
+    'XMLParseError': 'xml_parser',
+    'ExcelFormatter': 'excel_formatter',
+    'DeltaState': 'delta',
+    'RunReport': 'instrumentation',
+    'ParseCache': 'cache',
+    'ItemSelection': 'selection',
+    'OutputWriter': 'writers',
+    'WRITERS': 'writers',
+    'get_writer': 'writers',
+    'JiraFetcher': 'fetcher',
+    'FetchError': 'fetcher',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    """Importa el módulo de un nombre exportado la primera vez que se usa."""
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
 
-__all__ = ['DataHandler', 'XMLParser', 'XMLParseError', 'ExcelFormatter']
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,144 @@
+"""
+Módulo con la caché en disco de resultados de parsing.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import tempfile
+
+# Versión del parser y del formato de la caché. Debe incrementarse cuando
+# cambie el resultado de XMLParser para un mismo archivo.
+CACHE_VERSION = 1
+
+# Tamaño máximo por defecto de la caché (bytes)
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+# Bloque de lectura para calcular el hash del contenido
+HASH_BLOCK_SIZE = 8 * 1024 * 1024
+
+class ParseCache:
+    """
+    Caché de DataFrames ya parseados, indexada por contenido.
+
+    La clave combina un hash BLAKE2 del contenido del archivo con la
+    versión del parser, la configuración de campos personalizados y la
+    versión de pandas, de modo que un archivo renombrado o copiado
+    reutiliza la entrada y cualquier cambio de configuración la invalida.
+    Cuando el tamaño total supera `max_bytes` se eliminan las entradas
+    usadas hace más tiempo (LRU, según la fecha de modificación, que se
+    actualiza en cada acierto).
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Inicializa la caché.
+
+        Args:
+            directory (str): Directorio de la caché
+            max_bytes (int, optional): Tamaño máximo total en bytes
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, file_path, xml_parser):
+        """
+        Calcula la clave de un archivo para un parser.
+
+        Args:
+            file_path (str): Archivo XML
+            xml_parser (XMLParser): Parser con la configuración a usar
+
+        Returns:
+            str: Clave hexadecimal
+        """
+        import pandas as pd
+
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(json.dumps(
+            [CACHE_VERSION, pd.__version__,
+             [column.to_dict() for column in xml_parser.schema]],
+            sort_keys=True
+        ).encode('utf-8'))
+        with open(file_path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    for start in range(0, len(data), HASH_BLOCK_SIZE):
+                        digest.update(data[start:start + HASH_BLOCK_SIZE])
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Obtiene un resultado de la caché.
+
+        Args:
+            key (str): Clave calculada con `key`
+
+        Returns:
+            tuple: (DataFrame, Lista de links) o None si no existe
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                result = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Entrada de caché inválida, se descarta: {str(e)}")
+            self._remove(path)
+            return None
+        os.utime(path)
+        return result
+
+    def put(self, key, df, links):
+        """
+        Guarda un resultado en la caché y aplica el límite de tamaño.
+
+        Args:
+            key (str): Clave calculada con `key`
+            df (pandas.DataFrame): Datos parseados
+            links (list): Links de las tareas
+        """
+        descriptor, temp_path = tempfile.mkstemp(
+            dir=self.directory, suffix='.tmp'
+        )
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                pickle.dump(
+                    (df, list(links)), file, protocol=pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(temp_path, self._path(key))
+        except Exception:
+            self._remove(temp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Elimina las entradas menos usadas hasta respetar max_bytes."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.pkl'):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(os.path.join(self.directory, name))
+            total -= size
+
+    def _path(self, key):
+        """Ruta del archivo de una entrada."""
+        return os.path.join(self.directory, f'{key}.pkl')
+
+    @staticmethod
+    def _remove(path):
+        """Elimina un archivo ignorando si ya no existe."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
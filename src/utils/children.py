@@ -0,0 +1,200 @@
+"""
+Módulo con las tablas hijas de una exportación de Jira.
+
+Además de sus campos, cada <item> puede contener elementos repetidos:
+registros de trabajo, comentarios, vínculos con otras tareas y subtareas.
+Cada tabla hija normaliza uno de ellos en filas enlazadas con la tarea por
+la columna `Código`. XMLParser las extrae en la misma pasada que las filas
+principales, item a item, sin conservar el árbol XML.
+"""
+
+import re
+from .data_handler import DataHandler
+
+# Etiquetas HTML de los comentarios, que se exportan como texto plano
+HTML_TAG = re.compile(r'<[^>]+>')
+
+def _value(element, name):
+    """
+    Obtiene un dato de un elemento como atributo o como hijo.
+
+    Jira exporta algunos elementos con sus datos en atributos (comment) y
+    otros, según la versión, en elementos hijos (worklog).
+
+    Args:
+        element: Elemento XML
+        name (str): Nombre del atributo o del elemento hijo
+
+    Returns:
+        str: Valor sin espacios sobrantes, o cadena vacía
+    """
+    value = element.get(name)
+    if value is None:
+        value = element.findtext(name)
+    return DataHandler.clean_field_value(value)
+
+def _html_to_text(text):
+    """
+    Convierte el HTML de un comentario en texto plano.
+
+    Args:
+        text (str): Comentario en HTML
+
+    Returns:
+        str: Texto sin etiquetas ni entidades
+    """
+    return DataHandler.decode_html_entities(
+        HTML_TAG.sub(' ', text or '')
+    ).strip()
+
+def _hours(seconds):
+    """Convierte segundos (texto) en horas."""
+    try:
+        return int(seconds) / 3600
+    except (TypeError, ValueError):
+        return 0.0
+
+def worklog_rows(item, key):
+    """
+    Registros de trabajo de un item.
+
+    Args:
+        item: Elemento XML del item
+        key (str): Código de la tarea
+
+    Yields:
+        dict: Una fila por <worklog>
+    """
+    for worklog in item.iterfind('worklogs/worklog'):
+        yield {
+            'Código': key,
+            'ID': _value(worklog, 'id'),
+            'Autor': _value(worklog, 'author'),
+            'Fecha Inicio': _value(worklog, 'started')
+                or _value(worklog, 'startDate') or _value(worklog, 'created'),
+            'Hora Inicio': None,
+            'Horas Utilizadas': _hours(_value(worklog, 'timeSpentSeconds')),
+            'Comentario': _html_to_text(
+                worklog.findtext('comment') or worklog.text
+            ),
+        }
+
+def comment_rows(item, key):
+    """
+    Comentarios de un item.
+
+    Args:
+        item: Elemento XML del item
+        key (str): Código de la tarea
+
+    Yields:
+        dict: Una fila por <comment>
+    """
+    for comment in item.iterfind('comments/comment'):
+        yield {
+            'Código': key,
+            'ID': _value(comment, 'id'),
+            'Autor': _value(comment, 'author'),
+            'Fecha Creación': _value(comment, 'created'),
+            'Hora Creación': None,
+            'Comentario': _html_to_text(comment.text),
+        }
+
+def link_rows(item, key):
+    """
+    Vínculos de un item con otras tareas.
+
+    Args:
+        item: Elemento XML del item
+        key (str): Código de la tarea
+
+    Yields:
+        dict: Una fila por <issuelink>, con el tipo y el sentido del vínculo
+    """
+    for link_type in item.iterfind('issuelinks/issuelinktype'):
+        name = DataHandler.clean_field_value(link_type.findtext('name'))
+        for direction in ('outwardlinks', 'inwardlinks'):
+            for group in link_type.iterfind(direction):
+                description = group.get('description') or name
+                for issue_key in group.iterfind('issuelink/issuekey'):
+                    yield {
+                        'Código': key,
+                        'Tipo': name,
+                        'Relación': description,
+                        'Tarea Vinculada': DataHandler.clean_field_value(
+                            issue_key.text
+                        ),
+                    }
+
+def subtask_rows(item, key):
+    """
+    Subtareas de un item.
+
+    Args:
+        item: Elemento XML del item
+        key (str): Código de la tarea
+
+    Yields:
+        dict: Una fila por <subtask>
+    """
+    for subtask in item.iterfind('subtasks/subtask'):
+        yield {
+            'Código': key,
+            'Subtarea': DataHandler.clean_field_value(subtask.text),
+        }
+
+# Tablas hijas disponibles: nombre -> (título de la hoja, columnas,
+# función (item, código) -> filas, columnas de fecha -> columna de hora)
+CHILD_TABLES = {
+    'worklogs': (
+        'Registros de Trabajo',
+        ('Código', 'ID', 'Autor', 'Fecha Inicio', 'Hora Inicio',
+         'Horas Utilizadas', 'Comentario'),
+        worklog_rows,
+        {'Fecha Inicio': 'Hora Inicio'},
+    ),
+    'comments': (
+        'Comentarios',
+        ('Código', 'ID', 'Autor', 'Fecha Creación', 'Hora Creación',
+         'Comentario'),
+        comment_rows,
+        {'Fecha Creación': 'Hora Creación'},
+    ),
+    'links': (
+        'Vínculos',
+        ('Código', 'Tipo', 'Relación', 'Tarea Vinculada'),
+        link_rows,
+        {},
+    ),
+    'subtasks': (
+        'Subtareas',
+        ('Código', 'Subtarea'),
+        subtask_rows,
+        {},
+    ),
+}
+
+# Columnas numéricas de las tablas hijas
+CHILD_NUMERIC_COLUMNS = ('Horas Utilizadas',)
+
+def validate_children(children):
+    """
+    Comprueba los nombres de tablas hijas pedidos.
+
+    Args:
+        children (iterable): Nombres de CHILD_TABLES
+
+    Returns:
+        tuple: Nombres sin duplicados, en el orden indicado
+
+    Raises:
+        ValueError: Si alguna tabla no existe
+    """
+    children = tuple(dict.fromkeys(children))
+    unknown = [name for name in children if name not in CHILD_TABLES]
+    if unknown:
+        raise ValueError(
+            f"Tablas hijas desconocidas: {', '.join(unknown)} "
+            f"(disponibles: {', '.join(CHILD_TABLES)})"
+        )
+    return children
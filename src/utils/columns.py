@@ -0,0 +1,157 @@
+"""
+Módulo para la acumulación de items por columnas.
+"""
+
+from array import array
+
+# Columnas de baja cardinalidad que se guardan como códigos de categoría
+CATEGORICAL_COLUMNS = ('Tipo', 'Prioridad', 'Empresa', 'Estado')
+
+# Columnas numéricas que se guardan en arrays de float
+NUMERIC_COLUMNS = ('Horas Utilizadas',)
+
+class ColumnStore:
+    """
+    Acumula items procesados en buffers tipados por columna.
+
+    En lugar de conservar un diccionario por item, cada valor se añade al
+    buffer de su columna: códigos enteros para las columnas categóricas,
+    arrays de float para las numéricas y listas para el resto. El
+    DataFrame final se construye columna a columna, sin transponer filas.
+    """
+
+    def __init__(self, categorical=CATEGORICAL_COLUMNS, numeric=NUMERIC_COLUMNS):
+        """
+        Inicializa el almacén vacío.
+
+        Args:
+            categorical (iterable): Columnas a guardar como categorías
+            numeric (iterable): Columnas a guardar como float
+        """
+        self.categorical = set(categorical)
+        self.numeric = set(numeric)
+        self.columns = []
+        self._buffers = {}
+        self._categories = {}
+        self._length = 0
+
+    @classmethod
+    def from_items(cls, items, **kwargs):
+        """
+        Construye un almacén a partir de una lista de diccionarios.
+
+        Args:
+            items (list): Diccionarios con los datos de cada item
+            **kwargs: Argumentos para el constructor
+
+        Returns:
+            ColumnStore: Almacén con los items cargados
+        """
+        store = cls(**kwargs)
+        for item in items:
+            store.append(item)
+        return store
+
+    def __len__(self):
+        """Devuelve el número de filas acumuladas."""
+        return self._length
+
+    def append(self, item):
+        """
+        Añade un item a los buffers de columna.
+
+        Las columnas se fijan con el primer item; los siguientes deben
+        tener las mismas claves.
+
+        Args:
+            item (dict): Datos procesados de un item
+        """
+        if not self.columns:
+            self._init_buffers(item)
+
+        for column in self.columns:
+            value = item[column]
+            if column in self._categories:
+                codes = self._categories[column]
+                code = codes.get(value)
+                if code is None:
+                    # Los valores nulos se guardan como categoría ausente
+                    code = -1 if value is None else codes.setdefault(
+                        value, len(codes)
+                    )
+                self._buffers[column].append(code)
+            else:
+                self._buffers[column].append(value)
+        self._length += 1
+
+    def extend(self, other):
+        """
+        Añade al final las filas de otro almacén con las mismas columnas.
+
+        Los buffers se copian en bloque; solo los códigos de las columnas
+        categóricas se traducen a las categorías de este almacén.
+
+        Args:
+            other (ColumnStore): Almacén con las filas a añadir
+        """
+        if not len(other):
+            return
+        if not self.columns:
+            self._init_buffers(dict.fromkeys(other.columns))
+
+        for column in self.columns:
+            buffer = other._buffers[column]
+            if column in self._categories:
+                codes = self._categories[column]
+                mapping = [
+                    codes.setdefault(value, len(codes))
+                    for value in other._categories[column]
+                ]
+                self._buffers[column].extend(
+                    -1 if code == -1 else mapping[code] for code in buffer
+                )
+            else:
+                self._buffers[column].extend(buffer)
+        self._length += len(other)
+
+    def _init_buffers(self, item):
+        """
+        Crea los buffers tipados según las columnas del primer item.
+
+        Args:
+            item (dict): Primer item recibido
+        """
+        self.columns = list(item)
+        for column in self.columns:
+            if column in self.categorical:
+                self._buffers[column] = array('q')
+                self._categories[column] = {}
+            elif column in self.numeric:
+                self._buffers[column] = array('d')
+            else:
+                self._buffers[column] = []
+
+    def to_dataframe(self):
+        """
+        Construye el DataFrame directamente desde los buffers.
+
+        Returns:
+            pandas.DataFrame: Una columna por buffer, en el orden original
+        """
+        import numpy as np
+        import pandas as pd
+
+        data = {}
+        for column in self.columns:
+            buffer = self._buffers[column]
+            if column in self._categories:
+                categories = list(self._categories[column])
+                data[column] = pd.Categorical.from_codes(
+                    np.frombuffer(buffer, dtype=np.int64),
+                    categories=pd.Index(categories, dtype=object)
+                )
+            elif column in self.numeric:
+                data[column] = np.frombuffer(buffer, dtype=np.float64)
+            else:
+                data[column] = pd.Series(buffer, dtype=object)
+        return pd.DataFrame(data, columns=self.columns)
@@ -5,6 +5,17 @@ Módulo para el manejo y procesamiento de datos.
 from datetime import datetime
 import html
 
+# Formatos de fecha aceptados en los exports de Jira, en orden de prioridad
+JIRA_DATE_FORMATS = [
+    "%a, %d %b %Y %H:%M:%S %z", #Formato Estandar
+    "%a, %d %b %Y %H:%M:%S +0000", #Formato Alternativo
+    "%Y-%m-%d %H:%M:%S", #Formato ISO
+    "%Y-%m-%dT%H:%M:%S.%f%z", #Formato ISO de la API (registros de trabajo)
+]
+
+# Formato RFC-2822 de Jira, convertible de forma vectorizada
+RFC_2822_PATTERN = r'^[A-Za-z]{3}, \d{1,2} [A-Za-z]{3} \d{4} \d{2}:\d{2}:\d{2} [+-]\d{4}$'
+
 class DataHandler:
     """Clase para procesar y transformar datos."""
 
@@ -19,26 +30,70 @@ class DataHandler:
         Returns:
             tuple: (fecha en formato dd/mm/yyyy, hora en formato HH:MM:SS)
         """
-        if not date_str:
-            return "", ""
-            
-        try:
-            formats = [
-                "%a, %d %b %Y %H:%M:%S %z", #Formato Estandar
-                "%a, %d %b %Y %H:%M:%S +0000", #Formato Alternativo
-                "%Y-%m-%d %H:%M:%S", #Formato ISO
-            ]
-            
-            for date_format in formats:
-                try:
-                    dt = datetime.strptime(date_str, date_format)
-                    return dt.strftime("%d/%m/%Y"), dt.strftime("%H:%M:%S")
-                except ValueError:
-                    continue
-                    
-            return "", ""
-        except Exception:
+        dt = DataHandler.parse_jira_datetime(date_str)
+        if dt is None:
             return "", ""
+        return dt.strftime("%d/%m/%Y"), dt.strftime("%H:%M:%S")
+
+    @staticmethod
+    def parse_jira_datetime(date_str):
+        """
+        Convierte una fecha de Jira a datetime con la hora local del texto.
+
+        Args:
+            date_str (str): Fecha en formato Jira
+
+        Returns:
+            datetime: Fecha sin zona horaria, o None si no es válida
+        """
+        if not date_str:
+            return None
+
+        for date_format in JIRA_DATE_FORMATS:
+            try:
+                dt = datetime.strptime(date_str, date_format)
+                return dt.replace(tzinfo=None)
+            except (ValueError, TypeError):
+                continue
+        return None
+
+    @staticmethod
+    def parse_jira_dates(values):
+        """
+        Convierte una columna de fechas de Jira en una sola pasada vectorizada.
+
+        Las fechas RFC-2822 que exporta Jira ("Tue, 11 Feb 2025 17:02:43
+        -0500") se convierten con un único pd.to_datetime sobre el texto sin
+        día de la semana ni desplazamiento, conservando la hora local como
+        parse_jira_date. El resto de valores se convierte uno a uno.
+
+        Args:
+            values: Secuencia de textos de fecha
+
+        Returns:
+            pandas.Series: Fechas datetime64 sin zona horaria (NaT si vacías)
+        """
+        import pandas as pd
+
+        raw = pd.Series(values, dtype=object)
+        text = raw.where(raw.map(lambda value: isinstance(value, str)))
+        is_rfc = text.str.match(RFC_2822_PATTERN, na=False).astype(bool)
+
+        result = pd.Series(pd.NaT, index=raw.index, dtype='datetime64[ns]')
+        if is_rfc.any():
+            result[is_rfc] = pd.to_datetime(
+                text[is_rfc].str.slice(5, -6),
+                format="%d %b %Y %H:%M:%S",
+                errors='coerce'
+            )
+
+        others = ~is_rfc & text.notna() & (text != "")
+        if others.any():
+            result[others] = pd.to_datetime(
+                text[others].map(DataHandler.parse_jira_datetime)
+            )
+        return result
+
     @staticmethod
     def clean_field_value(value):
         """
@@ -0,0 +1,237 @@
+"""
+Módulo para la conversión incremental (delta) de exportaciones de Jira.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import pandas as pd
+from .data_handler import DataHandler
+from .item_index import tag_text
+
+# Versión del formato del estado guardado en disco
+STATE_VERSION = 1
+
+# Formato canónico de la fecha de actualización guardada en el estado
+STAMP_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+# Columnas de la salida con las que se construye el estado
+REQUIRED_COLUMNS = ('Código', 'Fecha Actualización', 'Hora Actualización')
+
+class DeltaState:
+    """
+    Estado de una conversión incremental.
+
+    Guarda en disco un índice compacto código -> fecha de actualización y
+    las filas de la última salida. Usado como item_filter de XMLParser,
+    descarta los items cuyo `updated` no ha cambiado antes de procesarlos;
+    después, merge combina las filas nuevas o modificadas con las
+    anteriores.
+
+    Los items que desaparecen del export se conservan, ya que un export
+    parcial no implica que la tarea se haya eliminado.
+    """
+
+    def __init__(self, path):
+        """
+        Inicializa el estado y carga el de la ejecución anterior si existe.
+
+        Args:
+            path (str): Prefijo de los archivos de estado; se usan
+                <path>.state.json y <path>.rows.pkl
+        """
+        self.path = path
+        self.updated = {}
+        self._load()
+
+    @classmethod
+    def for_file(cls, state_dir, file_path):
+        """
+        Crea el estado de un archivo de entrada dentro de un directorio.
+
+        El nombre incluye un hash de la ruta absoluta del archivo, de modo
+        que dos exports con el mismo nombre en directorios distintos no
+        comparten estado.
+
+        Args:
+            state_dir (str): Directorio de estado
+            file_path (str): Archivo XML de entrada
+
+        Returns:
+            DeltaState: Estado del archivo
+        """
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        digest = hashlib.blake2b(
+            os.path.normcase(os.path.realpath(file_path)).encode('utf-8'),
+            digest_size=6
+        ).hexdigest()
+        return cls(os.path.join(state_dir, f'{name}-{digest}'))
+
+    @staticmethod
+    def check_columns(columns):
+        """
+        Comprueba que las columnas de salida permiten guardar el estado.
+
+        Se llama antes de convertir, para no escribir una salida cuyo
+        estado no se podría guardar.
+
+        Args:
+            columns (iterable): Nombres de las columnas de salida
+
+        Raises:
+            ValueError: Si falta alguna de REQUIRED_COLUMNS
+        """
+        columns = set(columns)
+        missing = [column for column in REQUIRED_COLUMNS
+                   if column not in columns]
+        if missing:
+            raise ValueError(
+                "La conversión incremental requiere las columnas "
+                f"{', '.join(missing)}"
+            )
+
+    @property
+    def state_path(self):
+        """str: Ruta del índice código -> fecha de actualización."""
+        return f'{self.path}.state.json'
+
+    @property
+    def rows_path(self):
+        """str: Ruta de las filas de la última salida."""
+        return f'{self.path}.rows.pkl'
+
+    def __call__(self, item):
+        """
+        Indica si un item es nuevo o cambió desde la última ejecución.
+
+        Solo lee `key` y `updated`, sin procesar el resto del item.
+
+        Args:
+            item: Elemento XML del item
+
+        Returns:
+            bool: True si el item debe procesarse
+        """
+        key = (item.findtext('key') or '').strip()
+        previous = self.updated.get(key)
+        if previous is None:
+            return True
+        return _updated_stamp(item.findtext('updated')) != previous
+
+    def matches_raw(self, data, start, end):
+        """
+        Igual que la llamada al filtro, sobre los bytes del item sin parsear.
+
+        Args:
+            data (bytes): Lote con el item
+            start (int): Offset del <item>
+            end (int): Offset del </item>
+
+        Returns:
+            bool: True si el item debe parsearse
+        """
+        previous = self.updated.get(tag_text(data, b'key', start, end))
+        if previous is None:
+            return True
+        return _updated_stamp(tag_text(data, b'updated', start, end)) != previous
+
+    def merge(self, df, links):
+        """
+        Combina las filas nuevas o modificadas con las de la última salida.
+
+        Las filas de esta ejecución van primero, en el orden del export,
+        seguidas de las filas anteriores que no cambiaron.
+
+        Args:
+            df (pandas.DataFrame): Filas procesadas en esta ejecución
+            links (list): Links de esas filas
+
+        Returns:
+            tuple: (DataFrame combinado, Lista de links)
+        """
+        previous = self._load_rows()
+        if previous is None:
+            return df, list(links)
+
+        previous_df, previous_links = previous
+        if df.empty:
+            return previous_df, previous_links
+
+        keep = ~previous_df['Código'].isin(set(df['Código'])).to_numpy()
+        merged = pd.concat(
+            [df, previous_df[keep]], ignore_index=True
+        )
+        for column in df.columns:
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                merged[column] = merged[column].astype('category')
+        merged_links = list(links) + [
+            link for link, kept in zip(previous_links, keep) if kept
+        ]
+        return merged, merged_links
+
+    def save(self, df, links):
+        """
+        Guarda el índice y las filas de la salida para la próxima ejecución.
+
+        Args:
+            df (pandas.DataFrame): Filas de la salida combinada
+            links (list): Links de esas filas
+        """
+        self.check_columns(df.columns)
+
+        updated = df['Fecha Actualización'] + pd.to_timedelta(
+            df['Hora Actualización'].astype(object), errors='coerce'
+        )
+        self.updated = dict(zip(
+            df['Código'].astype(str),
+            updated.dt.strftime(STAMP_FORMAT).fillna('')
+        ))
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.rows_path, 'wb') as file:
+            pickle.dump((df, list(links)), file, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(self.state_path, 'w', encoding='utf-8') as file:
+            json.dump(
+                {'version': STATE_VERSION, 'updated': self.updated},
+                file,
+                ensure_ascii=False,
+                separators=(',', ':')
+            )
+
+    def _load(self):
+        """Carga el índice de la ejecución anterior, si es compatible."""
+        if not os.path.exists(self.state_path) or \
+                not os.path.exists(self.rows_path):
+            return
+        with open(self.state_path, encoding='utf-8') as file:
+            state = json.load(file)
+        if state.get('version') == STATE_VERSION:
+            self.updated = state['updated']
+
+    def _load_rows(self):
+        """
+        Carga las filas de la ejecución anterior.
+
+        Returns:
+            tuple: (DataFrame, Lista de links) o None si no hay estado
+        """
+        if not self.updated:
+            return None
+        with open(self.rows_path, 'rb') as file:
+            return pickle.load(file)
+
+def _updated_stamp(date_str):
+    """
+    Normaliza un `updated` de Jira al formato guardado en el estado.
+
+    Args:
+        date_str (str): Fecha en formato Jira
+
+    Returns:
+        str: Fecha en formato STAMP_FORMAT o cadena vacía
+    """
+    dt = DataHandler.parse_jira_datetime((date_str or '').strip())
+    return dt.strftime(STAMP_FORMAT) if dt else ''
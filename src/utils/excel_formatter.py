@@ -2,14 +2,47 @@
 Módulo para el formateo de archivos Excel.
 """
 
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import os
+import numpy as np
 import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font
 from openpyxl.styles.colors import BLUE
+from openpyxl.worksheet.hyperlink import Hyperlink
+from .children import CHILD_TABLES
+from .instrumentation import ConversionCancelled
+
+# Filas de datos por hoja: límite de Excel (1.048.576) menos la cabecera
+EXCEL_MAX_ROWS = 1048575
+
+# Nombre de la hoja de índice cuando la salida se divide en partes
+INDEX_SHEET = 'Índice'
+
+# Filas escritas entre dos avisos de progreso
+PROGRESS_ROWS = 1000
+
+# Filas de texto revisadas para estimar el ancho de cada columna
+WIDTH_SAMPLE_ROWS = 5000
+
+# Ancho máximo de columna (caracteres), sin contar el margen
+MAX_COLUMN_WIDTH = 60
+
+# Ancho de una fecha con formato dd/mm/yyyy
+DATE_WIDTH = 10
+
+# Columna que lleva el hipervínculo de cada tarea
+LINK_COLUMN = 'Código'
 
 class ExcelFormatter:
     """Clase para manejar el formateo de archivos Excel."""
 
-    def __init__(self, df, output_path, links=None):
+    def __init__(self, df, output_path, links=None, max_rows=None,
+                 shard_mode='sheets', workers=1, progress=None, children=None,
+                 widths=None):
         """
         Inicializa el formateador.
         
@@ -17,18 +50,47 @@ class ExcelFormatter:
             df (pandas.DataFrame): DataFrame a formatear
             output_path (str): Ruta del archivo de salida
             links (list): Lista de links para los hipervínculos
+            max_rows (int, optional): Filas de datos por hoja o archivo.
+                Por defecto el límite de Excel (EXCEL_MAX_ROWS).
+            shard_mode (str, optional): Cómo dividir las filas que superan
+                max_rows: 'sheets' (varias hojas en el mismo libro) o
+                'files' (varios libros más un libro índice en output_path)
+            workers (int, optional): Procesos para escribir los libros en
+                modo 'files'; con None se usa uno por CPU
+            progress (callable, optional): Función (filas escritas) que se
+                llama cada PROGRESS_ROWS filas; si lanza ConversionCancelled
+                la escritura se interrumpe sin guardar el libro
+            children (dict, optional): Tablas hijas (nombre de CHILD_TABLES
+                -> DataFrame) que se escriben como hojas adicionales, en el
+                libro principal o, en modo 'files', en el libro índice
+            widths (list, optional): Ancho de cada columna ya estimado; por
+                defecto se estima con estimate_column_widths
         """
+        if shard_mode not in ('sheets', 'files'):
+            raise ValueError(f"Modo de división no soportado: {shard_mode}")
         self.df = df
         self.output_path = output_path
         self.links = links or []
+        self.max_rows = min(max_rows or EXCEL_MAX_ROWS, EXCEL_MAX_ROWS)
+        self.shard_mode = shard_mode
+        self.workers = workers
+        self.progress = progress
+        self.children = children or {}
         self.writer = None
+        self._widths = widths
         
         # Convertir columnas de fecha a datetime
         self._convert_date_columns()
 
     
     def _convert_date_columns(self):
-        """Convierte las columnas de fecha a formato datetime de pandas."""
+        """
+        Convierte las columnas de fecha a formato datetime de pandas.
+
+        Las columnas que ya son datetime64 (las que genera
+        XMLParser.to_dataframe) se dejan tal cual; solo se convierten las
+        que aún llegan como texto dd/mm/yyyy.
+        """
         date_columns = [
             'Fecha Inicio',
             'Fecha Creación',
@@ -36,7 +98,8 @@ class ExcelFormatter:
         ]
         
         for col in date_columns:
-            if col in self.df.columns:
+            if col in self.df.columns and not \
+                    pd.api.types.is_datetime64_any_dtype(self.df[col]):
                 # Convertir a datetime usando pandas
                 self.df[col] = pd.to_datetime(
                     self.df[col], 
@@ -47,46 +110,208 @@ class ExcelFormatter:
     def format_excel(self):
         """
         Aplica el formato al archivo Excel.
+
+        El libro se escribe en modo write-only de openpyxl: cada fila se
+        genera con su formato e hipervínculo ya aplicados y se vuelca a
+        disco, por lo que las celdas nunca se revisitan y la memoria se
+        mantiene acotada. Si hay más filas que max_rows, la salida se
+        divide en varias hojas o libros con una hoja de índice.
         
         Returns:
             bool: True si el proceso fue exitoso
         """
+        workbook = None
         try:
-            # Usar openpyxl como motor y especificar el formato de fecha
-            self.writer = pd.ExcelWriter(
-                self.output_path,
-                engine='openpyxl',
-                datetime_format='dd/mm/yyyy'
-            )
-            
-            # Escribir el DataFrame al Excel
-            self.df.to_excel(self.writer, index=False, sheet_name='Tareas')
-            worksheet = self.writer.sheets['Tareas']
-            
-            self._format_worksheet(worksheet)
-            self._add_hyperlinks(worksheet)
-            self._format_columns(worksheet)
-            self._adjust_columns(worksheet)
-            
-            self.writer.close()
+            shards = self._shard_ranges()
+            if len(shards) > 1 and self.shard_mode == 'files':
+                self._write_shard_files(shards)
+                return True
+
+            workbook = Workbook(write_only=True)
+            if len(shards) == 1:
+                self._write_sheet(workbook, 'Tareas', *shards[0])
+            else:
+                titles = [f'Tareas {n}' for n in range(1, len(shards) + 1)]
+                self._write_index(
+                    workbook,
+                    [
+                        (title, Hyperlink(ref='', location=f"'{title}'!A1"))
+                        for title in titles
+                    ],
+                    shards
+                )
+                for title, (start, stop) in zip(titles, shards):
+                    self._write_sheet(workbook, title, start, stop)
+            self._write_children(workbook)
+
+            workbook.save(self.output_path)
             return True
+        except ConversionCancelled:
+            if workbook is not None:
+                _discard_workbook(workbook)
+            raise
         except Exception as e:
             print(f"Error formateando Excel: {str(e)}")
             return False
 
-    def _format_columns(self, worksheet):
+    def _shard_ranges(self):
         """
-        Aplica formato a las columnas según su tipo.
-        
+        Calcula los rangos de filas de cada parte.
+
+        Returns:
+            list: Tuplas (inicio, fin) de filas del DataFrame
+        """
+        total = len(self.df)
+        if total == 0:
+            return [(0, 0)]
+        return [
+            (start, min(start + self.max_rows, total))
+            for start in range(0, total, self.max_rows)
+        ]
+
+    def shard_paths(self):
+        """
+        Calcula la ruta del libro de cada parte en modo 'files'.
+
+        Returns:
+            list: Rutas <salida>_parte_NNN.xlsx, o lista vacía si la salida
+                no se divide en varios archivos
+        """
+        shards = self._shard_ranges()
+        if len(shards) == 1 or self.shard_mode != 'files':
+            return []
+        base, extension = os.path.splitext(self.output_path)
+        return [
+            f'{base}_parte_{n:03d}{extension}'
+            for n in range(1, len(shards) + 1)
+        ]
+
+    def _write_sheet(self, workbook, title, start, stop):
+        """
+        Escribe un rango de filas en una hoja nueva del libro.
+
         Args:
-            worksheet: Hoja de trabajo de Excel
+            workbook: Libro de Excel (write-only)
+            title (str): Nombre de la hoja
+            start (int): Primera fila del DataFrame
+            stop (int): Fila final (excluida)
+        """
+        worksheet = workbook.create_sheet(title)
+
+        # En modo write-only los anchos deben fijarse antes de las filas
+        self._format_worksheet(worksheet)
+        self._adjust_columns(worksheet)
+
+        worksheet.append(list(self.df.columns))
+        for row in self._iter_rows(worksheet, start, stop):
+            worksheet.append(row)
+
+    def _write_children(self, workbook):
+        """
+        Escribe cada tabla hija en sus propias hojas del libro.
+
+        Las tablas que superan max_rows se dividen en varias hojas
+        numeradas, igual que la principal.
+
+        Args:
+            workbook: Libro de Excel (write-only)
+        """
+        for name, df in self.children.items():
+            title = CHILD_TABLES[name][0]
+            formatter = ExcelFormatter(df, None, max_rows=self.max_rows)
+            shards = formatter._shard_ranges()
+            for number, (start, stop) in enumerate(shards, 1):
+                formatter._write_sheet(
+                    workbook,
+                    title if len(shards) == 1 else f'{title} {number}',
+                    start, stop
+                )
+
+    def _write_index(self, workbook, targets, shards):
+        """
+        Escribe la hoja de índice con un hipervínculo a cada parte.
+
+        Args:
+            workbook: Libro de Excel (write-only)
+            targets (list): Pares (nombre de la parte, destino del vínculo:
+                Hyperlink interno a una hoja o nombre de archivo)
+            shards (list): Rangos (inicio, fin) de cada parte
+        """
+        worksheet = workbook.create_sheet(INDEX_SHEET)
+        worksheet.column_dimensions['A'].width = max(
+            len(name) for name, _ in targets
+        ) + 2
+        for column in ('B', 'C', 'D'):
+            worksheet.column_dimensions[column].width = 16
+
+        link_font = Font(color=BLUE, underline="single")
+        codes = self.df[LINK_COLUMN] if LINK_COLUMN in self.df.columns else None
+        worksheet.append(['Parte', 'Desde', 'Hasta', 'Filas'])
+        for (name, target), (start, stop) in zip(targets, shards):
+            cell = WriteOnlyCell(worksheet, value=name)
+            cell.hyperlink = target
+            cell.font = link_font
+            worksheet.append([
+                cell,
+                codes.iloc[start] if codes is not None else start + 1,
+                codes.iloc[stop - 1] if codes is not None else stop,
+                stop - start
+            ])
+
+    def _write_shard_files(self, shards):
+        """
+        Escribe cada parte en su propio libro, en paralelo, y el libro
+        índice en output_path.
+
+        Args:
+            shards (list): Rangos (inicio, fin) de cada parte
+        """
+        paths = self.shard_paths()
+        # Todas las partes usan los anchos estimados sobre el DataFrame completo
+        if self._widths is None:
+            self._widths = estimate_column_widths(self.df)
+        jobs = [
+            (self.df.iloc[start:stop], path, self.links[start:stop],
+             self._widths)
+            for path, (start, stop) in zip(paths, shards)
+        ]
+
+        results = []
+        if self.workers == 1:
+            for job, (_, stop) in zip(jobs, shards):
+                results.append(_write_shard_file(*job))
+                self._notify(stop)
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = executor.map(_write_shard_file, *zip(*jobs))
+                for result, (_, stop) in zip(futures, shards):
+                    results.append(result)
+                    self._notify(stop)
+        if not all(results):
+            raise Exception("Error al escribir las partes del archivo Excel")
+
+        workbook = Workbook(write_only=True)
+        self._write_index(
+            workbook,
+            [(os.path.basename(path), os.path.basename(path)) for path in paths],
+            shards
+        )
+        self._write_children(workbook)
+        workbook.save(self.output_path)
+
+    def _column_formats(self):
+        """
+        Calcula el formato numérico de cada columna según su tipo.
+
+        Returns:
+            dict: Índice de columna -> (formato, solo si hay valor)
         """
+        formats = {}
+        columns = list(self.df.columns)
+
         # Formato para horas
-        if 'Horas Utilizadas' in self.df.columns:
-            col_idx = list(self.df.columns).index('Horas Utilizadas') + 1
-            for row in range(2, len(self.df) + 2):
-                cell = worksheet.cell(row=row, column=col_idx)
-                cell.number_format = '#,##0.0'
+        if 'Horas Utilizadas' in columns:
+            formats[columns.index('Horas Utilizadas')] = ('#,##0.0', False)
 
         # Formato para fechas
         date_columns = {
@@ -94,28 +319,105 @@ class ExcelFormatter:
             'Fecha Creación': 'dd/mm/yyyy',
             'Fecha Actualización': 'dd/mm/yyyy'
         }
-
         for col_name, date_format in date_columns.items():
-            if col_name in self.df.columns:
-                col_idx = list(self.df.columns).index(col_name) + 1
-                for row in range(2, len(self.df) + 2):
-                    cell = worksheet.cell(row=row, column=col_idx)
-                    if cell.value:  # Solo si hay valor
-                        cell.number_format = date_format
+            if col_name in columns:
+                formats[columns.index(col_name)] = (date_format, True)
+
+        # Otras columnas de fecha (por ejemplo, de un esquema propio)
+        for idx, col_name in enumerate(columns):
+            if idx not in formats and \
+                    pd.api.types.is_datetime64_any_dtype(self.df[col_name]):
+                formats[idx] = ('dd/mm/yyyy', True)
 
         # Formato para horas (HH:MM:SS)
         time_columns = [
+            'Hora Inicio',
             'Hora Creación',
             'Hora Actualización'
         ]
-
         for col_name in time_columns:
-            if col_name in self.df.columns:
-                col_idx = list(self.df.columns).index(col_name) + 1
-                for row in range(2, len(self.df) + 2):
-                    cell = worksheet.cell(row=row, column=col_idx)
-                    if cell.value:  # Solo si hay valor
-                        cell.number_format = 'hh:mm:ss'
+            if col_name in columns:
+                formats[columns.index(col_name)] = ('hh:mm:ss', True)
+
+        return formats
+
+    def _iter_rows(self, worksheet, start=0, stop=None):
+        """
+        Genera las filas del Excel con formato e hipervínculos aplicados.
+
+        El hipervínculo va en la columna LINK_COLUMN, esté donde esté; si
+        la salida no la incluye, las filas se escriben sin enlace.
+
+        Args:
+            worksheet: Hoja de trabajo de Excel (write-only)
+            start (int, optional): Primera fila del DataFrame
+            stop (int, optional): Fila final (excluida)
+
+        Yields:
+            list: Valores o celdas de una fila
+        """
+        formats = self._column_formats()
+        link_font = Font(color=BLUE, underline="single")
+        links = islice(self.links, start, stop)
+        link_column = self.df.columns.get_loc(LINK_COLUMN) \
+            if LINK_COLUMN in self.df.columns else None
+
+        rows = self.df.iloc[start:stop]
+        for position, values in enumerate(
+            rows.itertuples(index=False, name=None), start
+        ):
+            if position % PROGRESS_ROWS == 0:
+                self._notify(position)
+            row = [self._cell_value(value) for value in values]
+
+            for col_idx, (number_format, only_if_value) in formats.items():
+                value = row[col_idx]
+                if only_if_value and not value:
+                    continue
+                cell = WriteOnlyCell(worksheet, value=value)
+                cell.number_format = number_format
+                row[col_idx] = cell
+
+            # Hipervínculo en el código de tarea
+            link = next(links, None)
+            if link and link_column is not None and row[link_column]:
+                cell = WriteOnlyCell(worksheet, value=row[link_column])
+                cell.hyperlink = link
+                cell.font = link_font
+                row[link_column] = cell
+
+            yield row
+
+    def _notify(self, rows):
+        """
+        Informa las filas escritas hasta el momento.
+
+        Args:
+            rows (int): Filas del DataFrame ya escritas
+        """
+        if self.progress is not None:
+            self.progress(rows)
+
+    @staticmethod
+    def _cell_value(value):
+        """
+        Convierte un valor del DataFrame a un tipo escribible por openpyxl.
+
+        Args:
+            value: Valor de la celda
+
+        Returns:
+            Valor nativo de Python o None si está vacío
+        """
+        if value is None or value is pd.NaT:
+            return None
+        if isinstance(value, pd.Timestamp):
+            return value.to_pydatetime()
+        if isinstance(value, float) and value != value:
+            return None
+        if hasattr(value, 'item'):
+            return value.item()
+        return value
                         
     def _format_worksheet(self, worksheet):
         """
@@ -130,47 +432,99 @@ class ExcelFormatter:
     def _adjust_columns(self, worksheet):
         """
         Ajusta el ancho de las columnas.
-        
-        Args:
-            worksheet: Hoja de trabajo de Excel
-        """
-        for idx, col in enumerate(self.df.columns):
-            max_length = max(
-                self.df[col].astype(str).apply(len).max(),
-                len(col)
-            )
-            worksheet.column_dimensions[chr(65 + idx)].width = max_length + 2
 
-    def _format_hours(self, worksheet):
-        """
-        Aplica formato a las columnas de horas y fechas.
-        """
-        # Formato para horas
-        if 'Horas Utilizadas' in self.df.columns:
-            col_idx = list(self.df.columns).index('Horas Utilizadas')
-            for row in range(2, len(self.df) + 2):
-                cell = worksheet.cell(row=row, column=col_idx + 1)
-                cell.number_format = '#,##0.0'
-        
-        # Formato para fecha de inicio
-        if 'Fecha Inicio' in self.df.columns:
-            col_idx = list(self.df.columns).index('Fecha Inicio')
-            for row in range(2, len(self.df) + 2):
-                cell = worksheet.cell(row=row, column=col_idx + 1)
-                if cell.value:  # Solo si hay valor
-                    cell.number_format = 'dd/mm/yyyy'
+        Los anchos se estiman una sola vez por DataFrame (ver
+        estimate_column_widths) y se reutilizan en todas sus hojas y, en
+        modo 'files', en los libros de cada parte.
 
-    def _add_hyperlinks(self, worksheet):
-        """
-        Añade hipervínculos a los códigos de tarea.
-        
         Args:
             worksheet: Hoja de trabajo de Excel
         """
-        if self.links:
-            for idx, (codigo, link) in enumerate(zip(self.df['Código'], self.links), start=2):
-                if codigo and link:  # Verifica que ambos valores existan
-                    cell = worksheet.cell(row=idx, column=1)
-                    cell.hyperlink = link
-                    cell.font = Font(color=BLUE, underline="single")
-                    cell.value = codigo
\ No newline at end of file
+        if self._widths is None:
+            self._widths = estimate_column_widths(self.df)
+        for idx, width in enumerate(self._widths, 1):
+            worksheet.column_dimensions[get_column_letter(idx)].width = width
+
+
+def estimate_column_widths(df, sample_rows=WIDTH_SAMPLE_ROWS):
+    """
+    Estima el ancho de cada columna sin convertir el DataFrame a texto.
+
+    En modo write-only los anchos se escriben antes que las filas, así que
+    no pueden medirse mientras éstas se generan. En su lugar:
+
+    - Las columnas categóricas se miden por sus categorías.
+    - Las fechas tienen ancho fijo (DATE_WIDTH).
+    - El resto se mide con un máximo acumulado sobre una muestra de hasta
+      sample_rows filas repartidas por todo el DataFrame, que termina en
+      cuanto se alcanza MAX_COLUMN_WIDTH.
+
+    El coste no depende del número de filas.
+
+    Args:
+        df (pandas.DataFrame): Datos a escribir
+        sample_rows (int, optional): Filas revisadas por columna
+
+    Returns:
+        list: Ancho de cada columna, con margen, en el orden de df
+    """
+    total = len(df)
+    if total <= sample_rows:
+        positions = slice(None)
+    else:
+        positions = np.unique(
+            np.linspace(0, total - 1, sample_rows).astype(np.int64)
+        )
+
+    widths = []
+    for column in df.columns:
+        series = df[column]
+        width = len(str(column))
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            values = series.cat.categories
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            width = max(width, DATE_WIDTH)
+            values = ()
+        else:
+            values = series.iloc[positions]
+
+        for value in values:
+            if width >= MAX_COLUMN_WIDTH:
+                break
+            if value is None or value is pd.NaT or \
+                    (isinstance(value, float) and value != value):
+                continue
+            width = max(width, len(str(value)))
+        widths.append(min(width, MAX_COLUMN_WIDTH) + 2)
+    return widths
+
+
+def _discard_workbook(workbook):
+    """
+    Cierra las hojas de un libro write-only que no se va a guardar y
+    elimina sus archivos temporales.
+
+    Args:
+        workbook: Libro de Excel (write-only)
+    """
+    for worksheet in workbook.worksheets:
+        if not worksheet.closed:
+            worksheet.close()
+        # openpyxl solo borra los temporales al terminar el proceso
+        if worksheet._writer is not None:
+            worksheet._writer.cleanup()
+
+def _write_shard_file(df, output_path, links, widths):
+    """
+    Escribe una parte en su propio libro; se ejecuta en un proceso hijo.
+
+    Args:
+        df (pandas.DataFrame): Filas de la parte
+        output_path (str): Ruta del libro
+        links (list): Links de las filas
+        widths (list): Ancho de cada columna, común a todas las partes
+
+    Returns:
+        bool: True si el proceso fue exitoso
+    """
+    return ExcelFormatter(df, output_path, links, widths=widths).format_excel()
@@ -0,0 +1,416 @@
+"""
+Módulo para descargar búsquedas de Jira en formato XML.
+
+La vista XML de una búsqueda (.../SearchRequest.xml?jqlQuery=...) devuelve
+como mucho tempMax items por petición; la cabecera del canal indica qué
+parte del total contiene cada página:
+
+    <issue start="0" end="1000" total="5230"/>
+
+JiraFetcher pide la primera página para conocer el total y descarga el
+resto en paralelo sobre un pool de conexiones keep-alive, con reintentos y
+un límite de peticiones por segundo. Las páginas se entregan en orden a
+medida que llegan, con un máximo de páginas en memoria, de modo que el
+parser procesa cada una mientras se descargan las siguientes.
+
+http.client (que carga email y ssl) se importa al crear el pool, de modo
+que importar este módulo, como hace la línea de comandos, no lo carga.
+"""
+
+import base64
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Items por página pedidos a Jira (tempMax); Jira puede devolver menos
+DEFAULT_PAGE_SIZE = 1000
+
+# Conexiones simultáneas con el servidor
+DEFAULT_CONNECTIONS = 4
+
+# Reintentos de cada página ante errores de red o respuestas RETRY_STATUSES
+DEFAULT_RETRIES = 3
+
+# Espera base entre reintentos (s); se duplica en cada intento
+DEFAULT_BACKOFF = 0.5
+
+# Tiempo máximo de espera de cada petición (s)
+DEFAULT_TIMEOUT = 60
+
+# Respuestas que se reintentan (límite de peticiones y errores temporales)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Parámetros de paginación de la vista XML
+PAGE_SIZE_PARAM = 'tempMax'
+START_PARAM = 'pager/start'
+
+# Variables de entorno con las credenciales de Jira (ver auth_headers)
+USER_ENV = 'JIRA_USER'
+TOKEN_ENV = 'JIRA_TOKEN'
+
+_PAGE_HEADER = re.compile(rb'<issue\s([^>]*?)/?>')
+_PAGE_ATTRIBUTE = re.compile(rb'(start|end|total)="(\d+)"')
+
+class FetchError(Exception):
+    """Excepción para errores en la descarga de una búsqueda."""
+    pass
+
+def is_url(value):
+    """
+    Indica si una entrada es una URL HTTP(S) y no una ruta local.
+
+    Args:
+        value (str): Entrada a comprobar
+
+    Returns:
+        bool: True si empieza por http:// o https://
+    """
+    return value.lower().startswith(('http://', 'https://'))
+
+def auth_headers(user=None, token=None):
+    """
+    Construye la cabecera de autenticación para Jira.
+
+    Args:
+        user (str, optional): Usuario (email en Jira Cloud); por defecto
+            el de la variable de entorno USER_ENV
+        token (str, optional): Token de API o token de acceso personal;
+            por defecto el de la variable de entorno TOKEN_ENV
+
+    Returns:
+        dict: Authorization básica con usuario y token, Bearer solo con
+            token, o vacío sin token
+    """
+    user = user or os.environ.get(USER_ENV)
+    token = token or os.environ.get(TOKEN_ENV)
+    if not token:
+        return {}
+    if user:
+        credentials = base64.b64encode(f'{user}:{token}'.encode()).decode()
+        return {'Authorization': f'Basic {credentials}'}
+    return {'Authorization': f'Bearer {token}'}
+
+def parse_page_info(data):
+    """
+    Lee la cabecera de paginación de una página de la vista XML.
+
+    Solo se busca antes del primer <item>, sin recorrer la página.
+
+    Args:
+        data (bytes): Página descargada
+
+    Returns:
+        tuple: (start, end, total), o None si la página no tiene cabecera
+    """
+    head_end = data.find(b'<item>')
+    match = _PAGE_HEADER.search(data, 0, head_end if head_end != -1 else len(data))
+    if match is None:
+        return None
+    attributes = dict(_PAGE_ATTRIBUTE.findall(match.group(1)))
+    try:
+        return tuple(int(attributes[name]) for name in (b'start', b'end', b'total'))
+    except KeyError:
+        return None
+
+class RateLimiter:
+    """
+    Espacia las peticiones para no superar un número por segundo.
+
+    Es seguro entre hilos: cada llamada a wait reserva el siguiente
+    instante libre y espera hasta él fuera del lock.
+    """
+
+    def __init__(self, rate=None):
+        """
+        Inicializa el limitador.
+
+        Args:
+            rate (float, optional): Peticiones por segundo; sin límite si
+                es None o 0
+        """
+        self.interval = 1 / rate if rate else 0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Bloquea hasta que se puede hacer la siguiente petición."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+class ConnectionPool:
+    """
+    Conexiones keep-alive a un servidor, reutilizadas entre peticiones.
+
+    Como mucho `size` conexiones están en uso a la vez; al terminar una
+    petición la conexión vuelve al pool salvo que el servidor la cierre o
+    haya fallado.
+    """
+
+    def __init__(self, scheme, host, port=None, size=DEFAULT_CONNECTIONS,
+                 timeout=DEFAULT_TIMEOUT):
+        """
+        Inicializa el pool vacío; las conexiones se abren al usarse.
+
+        Args:
+            scheme (str): 'http' o 'https'
+            host (str): Servidor
+            port (int, optional): Puerto; por defecto el del esquema
+            size (int): Conexiones máximas
+            timeout (float): Tiempo máximo de espera de cada petición (s)
+        """
+        import http.client
+
+        self.connection_class = http.client.HTTPSConnection \
+            if scheme == 'https' else http.client.HTTPConnection
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.created = 0
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        """
+        Presta una conexión del pool.
+
+        Yields:
+            http.client.HTTPConnection: Conexión abierta o nueva. Si el
+                bloque termina con una excepción la conexión se cierra; si
+                no, vuelve al pool salvo que se haya cerrado.
+        """
+        with self._slots:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = self.connection_class(
+                    self.host, self.port, timeout=self.timeout
+                )
+                with self._lock:
+                    self.created += 1
+            try:
+                yield connection
+            except BaseException:
+                connection.close()
+                raise
+            if connection.sock is not None:
+                self._idle.put(connection)
+
+    def close(self):
+        """Cierra las conexiones libres."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+class JiraFetcher:
+    """Descarga paginada y concurrente de una búsqueda XML de Jira."""
+
+    def __init__(self, url, page_size=DEFAULT_PAGE_SIZE,
+                 connections=DEFAULT_CONNECTIONS, rate=None,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF,
+                 timeout=DEFAULT_TIMEOUT, headers=None):
+        """
+        Inicializa el fetcher.
+
+        Args:
+            url (str): URL de la vista XML de la búsqueda. Sus parámetros
+                tempMax y pager/start se sustituyen en cada página.
+            page_size (int): Items por página
+            connections (int): Páginas descargadas en paralelo
+            rate (float, optional): Peticiones por segundo como máximo
+            retries (int): Reintentos por página ante errores temporales
+            backoff (float): Espera base entre reintentos (s)
+            timeout (float): Tiempo máximo de espera de cada petición (s)
+            headers (dict, optional): Cabeceras adicionales (por ejemplo,
+                las de auth_headers)
+
+        Raises:
+            ValueError: Si la URL no es HTTP(S) o los valores no son válidos
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"URL no válida: {url}")
+        if page_size < 1 or connections < 1 or retries < 0:
+            raise ValueError(
+                "page_size y connections deben ser positivos y retries no "
+                "puede ser negativo"
+            )
+        self.url = url
+        self.page_size = page_size
+        self.connections = connections
+        self.retries = retries
+        self.backoff = backoff
+        self.headers = {
+            'Accept': 'application/xml, text/xml',
+            'Accept-Encoding': 'gzip',
+            **(headers or {}),
+        }
+        self._path = parts.path or '/'
+        self._query = [
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if key not in (PAGE_SIZE_PARAM, START_PARAM)
+        ]
+        self.pool = ConnectionPool(
+            parts.scheme, parts.hostname, parts.port, connections, timeout
+        )
+        self.limiter = RateLimiter(rate)
+        # Avance de la última descarga
+        self.total = None
+        self.page_count = None
+        self.pages_read = 0
+        self.bytes_read = 0
+
+    def page_target(self, start):
+        """
+        Calcula la ruta de la petición de una página.
+
+        Args:
+            start (int): Índice del primer item de la página
+
+        Returns:
+            str: Ruta con los parámetros de la búsqueda y de paginación
+        """
+        query = urlencode(
+            self._query + [(PAGE_SIZE_PARAM, self.page_size), (START_PARAM, start)]
+        )
+        return f'{self._path}?{query}'
+
+    def fetch_page(self, start):
+        """
+        Descarga una página, reintentando los errores temporales.
+
+        Ante una respuesta 429 o 503 con Retry-After se espera lo indicado
+        por el servidor; en el resto de casos, backoff * 2^intento.
+
+        Args:
+            start (int): Índice del primer item de la página
+
+        Returns:
+            bytes: Contenido de la página, ya descomprimido
+
+        Raises:
+            FetchError: Si la respuesta es un error no recuperable o se
+                agotan los reintentos
+        """
+        import gzip
+        import http.client
+
+        target = self.page_target(start)
+        for attempt in range(self.retries + 1):
+            self.limiter.wait()
+            delay = self.backoff * 2 ** attempt
+            try:
+                with self.pool.connection() as connection:
+                    connection.request('GET', target, headers=self.headers)
+                    response = connection.getresponse()
+                    body = response.read()
+                    if response.will_close:
+                        connection.close()
+            except (OSError, http.client.HTTPException) as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                if response.status == 200:
+                    if response.getheader('Content-Encoding') == 'gzip':
+                        body = gzip.decompress(body)
+                    return body
+                error = f"HTTP {response.status} {response.reason}"
+                if response.status not in RETRY_STATUSES:
+                    raise FetchError(f"Error descargando {target}: {error}")
+                retry_after = response.getheader('Retry-After', '')
+                if retry_after.isdigit():
+                    delay = int(retry_after)
+            if attempt < self.retries:
+                time.sleep(delay)
+        raise FetchError(
+            f"Error descargando {target} tras {self.retries + 1} intentos: "
+            f"{error}"
+        )
+
+    def iter_pages(self):
+        """
+        Descarga todas las páginas de la búsqueda.
+
+        La primera página indica el total y cuántos items devuelve el
+        servidor por página (puede ser menos que page_size si Jira limita
+        tempMax); el resto se descarga en paralelo con `connections`
+        peticiones en curso y como mucho 2 * connections páginas en memoria.
+
+        Yields:
+            bytes: Páginas en orden, cada una un XML completo
+
+        Raises:
+            FetchError: Si una página no se puede descargar o la respuesta
+                no es una búsqueda XML de Jira
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.pages_read = 0
+        self.bytes_read = 0
+        first = self.fetch_page(0)
+        info = parse_page_info(first)
+        if info is None:
+            if b'<rss' not in first[:4096]:
+                raise FetchError(
+                    f"La respuesta de {self.url} no es una búsqueda XML de Jira"
+                )
+            # Exportación sin paginación: una sola página
+            info = (0, 0, 0)
+        start, end, self.total = info
+        step = end - start
+        starts = range(end, self.total, step) if step > 0 else range(0)
+        self.page_count = 1 + len(starts)
+        self.bytes_read = len(first)
+        self.pages_read = 1
+        yield first
+        del first
+
+        if not starts:
+            self.pool.close()
+            return
+        executor = ThreadPoolExecutor(
+            max_workers=self.connections, thread_name_prefix='jira-fetch'
+        )
+        pending = deque()
+        try:
+            for page_start in starts:
+                pending.append(executor.submit(self.fetch_page, page_start))
+                if len(pending) >= self.connections * 2:
+                    yield self._page_result(pending.popleft())
+            while pending:
+                yield self._page_result(pending.popleft())
+        finally:
+            # Si el consumidor se detiene no se descargan más páginas
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+            self.pool.close()
+
+    def _page_result(self, future):
+        """
+        Espera una página y actualiza el avance.
+
+        Args:
+            future (concurrent.futures.Future): Descarga de la página
+
+        Returns:
+            bytes: Contenido de la página
+        """
+        page = future.result()
+        self.pages_read += 1
+        self.bytes_read += len(page)
+        return page
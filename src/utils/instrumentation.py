@@ -0,0 +1,237 @@
+"""
+Módulo de instrumentación del pipeline de conversión.
+
+Registra, por etapa, el tiempo, los items procesados, los bytes leídos y
+el pico de memoria del proceso, traduce el avance real de cada etapa a un
+porcentaje para la barra de progreso y genera un informe JSON de la
+ejecución.
+
+El inicio de cada etapa y cada aviso de avance son también los puntos en
+que se atiende una cancelación: si el evento de cancelación del informe
+está activo se lanza ConversionCancelled y el pipeline se detiene ahí.
+"""
+
+import json
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+class ConversionCancelled(Exception):
+    """La conversión se canceló antes de terminar."""
+    pass
+
+def peak_rss_mb():
+    """
+    Obtiene el pico de memoria residente del proceso actual.
+
+    Returns:
+        float: Pico de RSS en MB, o None si la plataforma no lo permite
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa en KB y macOS en bytes
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+class Stage:
+    """Avance de una etapa en curso."""
+
+    def __init__(self, report, name, status_text, start, end):
+        """
+        Inicializa la etapa.
+
+        Args:
+            report (RunReport): Informe al que pertenece
+            name (str): Nombre de la etapa
+            status_text (str): Texto mostrado mientras dura la etapa
+            start (int): Porcentaje de progreso al empezar
+            end (int): Porcentaje de progreso al terminar
+        """
+        self.report = report
+        self.name = name
+        self.status_text = status_text
+        self.start = start
+        self.end = end
+        self.items = None
+        self.bytes_read = None
+        self._notified = None
+
+    def advance(self, items=None, bytes_read=None, fraction=None):
+        """
+        Actualiza el avance de la etapa.
+
+        Args:
+            items (int, optional): Items procesados hasta el momento
+            bytes_read (int, optional): Bytes leídos hasta el momento
+            fraction (float, optional): Parte completada (0-1)
+
+        Raises:
+            ConversionCancelled: Si se solicitó la cancelación
+        """
+        self.report.check_cancelled()
+        if items is not None:
+            self.items = items
+        if bytes_read is not None:
+            self.bytes_read = bytes_read
+        if fraction is None:
+            return
+        value = self.start + int((self.end - self.start) * min(fraction, 1.0))
+        # Solo se notifica cuando cambia el porcentaje o el número de items
+        if (value, self.items) == self._notified:
+            return
+        self._notified = (value, self.items)
+        status_text = self.status_text
+        if self.items is not None:
+            status_text = f"{status_text} ({self.items:,} items)"
+        self.report.notify(value, status_text)
+
+class RunReport:
+    """
+    Informe de una ejecución del conversor.
+
+    Cada etapa se mide con `stage`; el resultado puede consultarse con
+    to_dict o guardarse con save para comparar ejecuciones.
+    """
+
+    def __init__(self, progress=None, source=None, cancel_event=None):
+        """
+        Inicializa el informe.
+
+        Args:
+            progress (callable, optional): Función (valor, texto) que recibe
+                el avance en porcentaje, como MainWindow.update_progress
+            source (str, optional): Archivo de entrada
+            cancel_event (threading.Event, optional): Evento que, al
+                activarse, cancela la conversión en el siguiente aviso de
+                avance
+        """
+        self.progress = progress
+        self.source = source
+        self.cancel_event = cancel_event
+        self.output = None
+        self.started = datetime.now()
+        self.stages = {}
+        # Códigos pedidos que no estaban en el archivo (conversión con keys)
+        self.missing_keys = []
+
+    def notify(self, value, status_text):
+        """
+        Envía el avance a la función de progreso, si existe.
+
+        Args:
+            value (int): Porcentaje (0-100)
+            status_text (str): Texto de estado
+        """
+        if self.progress is not None:
+            self.progress(value, status_text)
+
+    def check_cancelled(self):
+        """
+        Detiene la conversión si se solicitó su cancelación.
+
+        Raises:
+            ConversionCancelled: Si el evento de cancelación está activo
+        """
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ConversionCancelled("Conversión cancelada")
+
+    @contextmanager
+    def stage(self, name, status_text, start, end):
+        """
+        Mide una etapa del pipeline.
+
+        Args:
+            name (str): Nombre de la etapa
+            status_text (str): Texto mostrado mientras dura la etapa
+            start (int): Porcentaje de progreso al empezar
+            end (int): Porcentaje de progreso al terminar
+
+        Yields:
+            Stage: Etapa en curso, para informar el avance
+
+        Raises:
+            ConversionCancelled: Si se solicitó la cancelación
+        """
+        self.check_cancelled()
+        current = Stage(self, name, status_text, start, end)
+        self.notify(start, status_text)
+        started = time.perf_counter()
+        yield current
+        self.record(
+            name, time.perf_counter() - started, current.items,
+            current.bytes_read
+        )
+
+    def record(self, name, seconds, items=None, bytes_read=None):
+        """
+        Registra una etapa medida fuera de stage().
+
+        Sirve para etapas cuyo tiempo se acumula en varios tramos, por
+        ejemplo dentro de un bucle por lotes.
+
+        Args:
+            name (str): Nombre de la etapa
+            seconds (float): Duración de la etapa
+            items (int, optional): Items procesados
+            bytes_read (int, optional): Bytes leídos
+        """
+        result = {'seconds': round(seconds, 4)}
+        if items is not None:
+            result['items'] = items
+            result['items_per_second'] = round(items / seconds, 1) \
+                if seconds else None
+        if bytes_read is not None:
+            result['bytes_read'] = bytes_read
+        result['peak_rss_mb'] = peak_rss_mb()
+        self.stages[name] = result
+
+    @property
+    def total_seconds(self):
+        """float: Suma del tiempo de todas las etapas."""
+        return round(sum(stage['seconds'] for stage in self.stages.values()), 4)
+
+    def slowest_stage(self):
+        """
+        Obtiene la etapa que más tiempo consumió.
+
+        Returns:
+            str: Nombre de la etapa, o None si no hay etapas
+        """
+        if not self.stages:
+            return None
+        return max(self.stages, key=lambda name: self.stages[name]['seconds'])
+
+    def to_dict(self):
+        """
+        Convierte el informe en un diccionario serializable a JSON.
+
+        Returns:
+            dict: Metadatos de la ejecución y resultados por etapa
+        """
+        return {
+            'source': self.source,
+            'output': self.output,
+            'started': self.started.isoformat(timespec='seconds'),
+            'stages': self.stages,
+            'missing_keys': self.missing_keys,
+            'total_seconds': self.total_seconds,
+            'slowest_stage': self.slowest_stage(),
+            'peak_rss_mb': peak_rss_mb(),
+        }
+
+    def save(self, path):
+        """
+        Guarda el informe en formato JSON.
+
+        Args:
+            path (str): Ruta del archivo a generar
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False, indent=2)
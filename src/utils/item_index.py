@@ -0,0 +1,302 @@
+"""
+Módulo con el índice de offsets de los items de una exportación de Jira.
+"""
+
+import json
+import mmap
+import os
+import warnings
+import xml.etree.ElementTree as ET
+from xml.parsers.expat import ErrorString
+
+# Versión del formato del índice guardado en disco. La 2 comprueba la
+# estructura del documento al construirse; los índices anteriores se
+# reconstruyen.
+INDEX_VERSION = 2
+
+class ItemIndex:
+    """
+    Índice de acceso aleatorio a los <item> de un archivo XML.
+
+    Guarda, por cada item, su offset y longitud en bytes junto con su
+    código y su fecha de actualización (texto crudo de Jira). Se construye
+    en una sola pasada sobre el archivo mapeado en memoria, buscando solo
+    las etiquetas necesarias y sin parsear XML, y se persiste junto al
+    archivo para reutilizarlo mientras éste no cambie (mismo tamaño y
+    fecha de modificación).
+    """
+
+    def __init__(self, file_path, offsets, lengths, keys, updated,
+                 size=None, mtime_ns=None):
+        """
+        Inicializa el índice.
+
+        Args:
+            file_path (str): Archivo XML indexado
+            offsets (list): Offset en bytes de cada <item>
+            lengths (list): Longitud en bytes de cada <item>
+            keys (list): Código de cada item
+            updated (list): Fecha de actualización de cada item
+            size (int, optional): Tamaño del archivo al indexarlo
+            mtime_ns (int, optional): Fecha de modificación al indexarlo
+        """
+        self.file_path = file_path
+        self.offsets = offsets
+        self.lengths = lengths
+        self.keys = keys
+        self.updated = updated
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self._positions = None
+
+    def __len__(self):
+        return len(self.offsets)
+
+    @staticmethod
+    def default_path(file_path):
+        """
+        Obtiene la ruta del índice de un archivo.
+
+        Args:
+            file_path (str): Archivo XML
+
+        Returns:
+            str: Ruta <archivo>.idx.json
+        """
+        return f'{file_path}.idx.json'
+
+    @classmethod
+    def build(cls, file_path):
+        """
+        Construye el índice recorriendo el archivo una vez.
+
+        Args:
+            file_path (str): Archivo XML
+
+        Returns:
+            ItemIndex: Índice del archivo
+
+        Raises:
+            ValueError: Si algún <item> no está cerrado o el resto del
+                documento no es un export válido (ver DocumentOutline)
+        """
+        offsets, lengths, keys, updated = [], [], [], []
+        outline = DocumentOutline()
+        with open(file_path, 'rb') as file:
+            stat = os.fstat(file.fileno())
+            if stat.st_size:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    position = 0
+                    while True:
+                        start = data.find(b'<item>', position)
+                        if start == -1:
+                            break
+                        end = data.find(b'</item>', start)
+                        if end == -1:
+                            raise ValueError("unclosed <item> element")
+                        outline.feed(data[position:start], position)
+                        position = end + len(b'</item>')
+                        offsets.append(start)
+                        lengths.append(position - start)
+                        keys.append(tag_text(data, b'key', start, end))
+                        updated.append(tag_text(data, b'updated', start, end))
+                    outline.feed(data[position:], position)
+        outline.close()
+        return cls(
+            file_path, offsets, lengths, keys, updated,
+            size=stat.st_size, mtime_ns=stat.st_mtime_ns
+        )
+
+    @classmethod
+    def load(cls, file_path, index_path=None):
+        """
+        Carga el índice persistido si sigue siendo válido para el archivo.
+
+        Args:
+            file_path (str): Archivo XML
+            index_path (str, optional): Ruta del índice. Por defecto
+                <archivo>.idx.json
+
+        Returns:
+            ItemIndex: Índice cargado, o None si no existe, está obsoleto o
+                no se puede leer (por ejemplo, si quedó cortado)
+        """
+        index_path = index_path or cls.default_path(file_path)
+        if not os.path.exists(index_path):
+            return None
+        stat = os.stat(file_path)
+        try:
+            with open(index_path, encoding='utf-8') as file:
+                state = json.load(file)
+            if state.get('version') != INDEX_VERSION or \
+                    state['size'] != stat.st_size or \
+                    state['mtime_ns'] != stat.st_mtime_ns:
+                return None
+            return cls(
+                file_path, state['offsets'], state['lengths'], state['keys'],
+                state['updated'], size=state['size'],
+                mtime_ns=state['mtime_ns']
+            )
+        except (OSError, ValueError, KeyError, AttributeError):
+            # Índice ilegible o incompleto: se trata como obsoleto
+            return None
+
+    @classmethod
+    def load_or_build(cls, file_path, index_path=None):
+        """
+        Carga el índice persistido o lo construye y lo guarda.
+
+        Si no se puede escribir junto al archivo, el índice se usa igual
+        sin persistirlo.
+
+        Args:
+            file_path (str): Archivo XML
+            index_path (str, optional): Ruta del índice
+
+        Returns:
+            ItemIndex: Índice válido para el archivo
+        """
+        index = cls.load(file_path, index_path)
+        if index is None:
+            index = cls.build(file_path)
+            try:
+                index.save(index_path)
+            except OSError as e:
+                warnings.warn(
+                    f"No se pudo guardar el índice: {str(e)}", RuntimeWarning,
+                    stacklevel=2
+                )
+        return index
+
+    def save(self, index_path=None):
+        """
+        Guarda el índice en disco.
+
+        Args:
+            index_path (str, optional): Ruta del índice. Por defecto
+                <archivo>.idx.json
+        """
+        index_path = index_path or self.default_path(self.file_path)
+        with open(index_path, 'w', encoding='utf-8') as file:
+            json.dump(
+                {
+                    'version': INDEX_VERSION,
+                    'size': self.size,
+                    'mtime_ns': self.mtime_ns,
+                    'offsets': self.offsets,
+                    'lengths': self.lengths,
+                    'keys': self.keys,
+                    'updated': self.updated,
+                },
+                file,
+                ensure_ascii=False,
+                separators=(',', ':')
+            )
+
+    def locate(self, keys):
+        """
+        Obtiene la posición en el archivo de los items indicados.
+
+        Args:
+            keys (iterable): Códigos de los items
+
+        Returns:
+            tuple: (Lista de pares (offset, longitud) en el orden del
+                archivo, Lista de códigos que no están en el índice)
+        """
+        if self._positions is None:
+            self._positions = {key: i for i, key in enumerate(self.keys)}
+        found, missing = [], []
+        for key in dict.fromkeys(keys):
+            position = self._positions.get(key)
+            if position is None:
+                missing.append(key)
+            else:
+                found.append(position)
+        spans = [(self.offsets[i], self.lengths[i]) for i in sorted(found)]
+        return spans, missing
+
+class DocumentOutline:
+    """
+    Comprueba la estructura de un export sin parsear sus items.
+
+    Recibe, en orden, todo lo que queda fuera de los <item> (la cabecera
+    del canal, lo que hay entre items y el cierre) y lo parsea como un
+    documento propio, que debe ser <rss><channel>...</channel></rss>. Así
+    un archivo truncado, que no es XML o con marcado roto fuera de los
+    items falla aunque todos sus items sean válidos.
+    """
+
+    def __init__(self):
+        """Inicializa la comprobación sin contenido."""
+        self._parser = ET.XMLParser()
+
+    def feed(self, data, offset):
+        """
+        Añade el siguiente fragmento de fuera de los items.
+
+        Args:
+            data (bytes): Fragmento del documento
+            offset (int): Offset del fragmento en el archivo, para el error
+
+        Raises:
+            ValueError: Si el fragmento no es XML válido
+        """
+        if not data:
+            return
+        try:
+            self._parser.feed(data)
+        except ET.ParseError as e:
+            raise ValueError(
+                f"invalid markup outside <item> elements near byte {offset} "
+                f"({ErrorString(e.code)})"
+            )
+
+    def close(self):
+        """
+        Termina la comprobación.
+
+        Raises:
+            ValueError: Si el documento está incompleto o no es un export
+                XML de Jira
+        """
+        try:
+            root = self._parser.close()
+        except ET.ParseError as e:
+            raise ValueError(
+                f"incomplete document, missing </channel></rss> "
+                f"({ErrorString(e.code)})"
+            )
+        if root.tag != 'rss' or root.find('channel') is None:
+            raise ValueError(
+                f"not a Jira XML export: expected <rss><channel>, got <{root.tag}>"
+            )
+
+def tag_text(data, tag, start, end):
+    """
+    Obtiene el texto del primer elemento `tag` dentro de un rango de bytes.
+
+    No interpreta entidades ni CDATA; sirve para leer campos simples como
+    `key` o `updated` sin parsear el XML.
+
+    Args:
+        data (bytes/mmap.mmap): Contenido XML
+        tag (bytes): Nombre de la etiqueta
+        start (int): Inicio del rango
+        end (int): Fin del rango
+
+    Returns:
+        str: Texto del elemento, o cadena vacía si no existe
+    """
+    position = data.find(b'<' + tag, start, end)
+    while position != -1 and data[position + len(tag) + 1] not in b' >':
+        position = data.find(b'<' + tag, position + 1, end)
+    if position == -1:
+        return ''
+    text_start = data.find(b'>', position, end) + 1
+    if text_start == 0 or data[text_start - 2] == ord('/'):
+        return ''
+    text_end = data.find(b'</' + tag + b'>', text_start, end)
+    if text_end == -1:
+        return ''
+    return data[text_start:text_end].decode('utf-8', errors='ignore').strip()
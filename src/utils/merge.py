@@ -0,0 +1,181 @@
+"""
+Módulo para combinar varias exportaciones de Jira en una sola salida.
+
+Jira limita cada exportación XML a 1000 tareas, por lo que un proyecto
+grande se exporta en varias páginas que además pueden solaparse. La
+combinación se hace en dos pasadas:
+
+1. Se indexa cada archivo con ItemIndex (offsets, código y `updated` de
+   cada item, sin parsear XML) y se elige, por código, el item con el
+   `updated` más reciente.
+2. Se parsean solo los items elegidos, leyendo sus bytes directamente.
+
+Ambas pasadas reparten los archivos entre varios procesos. En memoria solo
+se mantienen un código y una fecha por tarea distinta y los items elegidos,
+por lo que el consumo depende del número de tareas únicas y no del tamaño
+total de las entradas.
+"""
+
+import os
+from .data_handler import DataHandler
+from .item_index import ItemIndex
+from .xml_parser import XMLParser, XMLParseError
+
+def index_files(file_paths, workers=None, progress=None):
+    """
+    Obtiene el índice de offsets de cada archivo.
+
+    Los índices se guardan junto a cada archivo (<archivo>.idx.json) y se
+    reutilizan mientras éste no cambie.
+
+    Args:
+        file_paths (list): Archivos XML
+        workers (int, optional): Número de procesos; con None uno por CPU
+        progress (callable, optional): Función (archivos indexados) que se
+            llama al terminar cada archivo
+
+    Returns:
+        list: ItemIndex de cada archivo, en el mismo orden
+
+    Raises:
+        XMLParseError: Si algún archivo no se puede leer
+    """
+    indexes = []
+    for index in _map(_load_index, [(path,) for path in file_paths], workers):
+        indexes.append(index)
+        if progress is not None:
+            progress(len(indexes))
+    return indexes
+
+def newest_spans(indexes):
+    """
+    Elige, para cada código, el item con el `updated` más reciente.
+
+    Con la misma fecha se conserva el del archivo posterior en la lista
+    (o la aparición posterior dentro del mismo archivo). Los items sin
+    código no se combinan: se conservan todos.
+
+    Args:
+        indexes (list): ItemIndex de cada archivo, en orden
+
+    Returns:
+        list: Por archivo, lista de pares (offset, longitud) de los items
+            elegidos, en el orden del archivo
+    """
+    newest = {}
+    unkeyed = []
+    for file_number, index in enumerate(indexes):
+        for position, (key, updated) in enumerate(zip(index.keys, index.updated)):
+            if not key:
+                unkeyed.append((file_number, position))
+                continue
+            stamp = DataHandler.parse_jira_datetime(updated)
+            current = newest.get(key)
+            if current is not None and current[0] is not None and \
+                    (stamp is None or stamp < current[0]):
+                continue
+            newest[key] = (stamp, file_number, position)
+
+    spans = [[] for _ in indexes]
+    locations = [(file_number, position) for _, file_number, position
+                 in newest.values()]
+    for file_number, position in sorted(locations + unkeyed):
+        index = indexes[file_number]
+        spans[file_number].append(
+            (index.offsets[position], index.lengths[position])
+        )
+    return spans
+
+def iter_selected(file_paths, spans, xml_parser, workers=None, progress=None):
+    """
+    Parsea los items elegidos de cada archivo.
+
+    Args:
+        file_paths (list): Archivos XML
+        spans (list): Por archivo, pares (offset, longitud) de los items a
+            parsear, como los de newest_spans
+        xml_parser (XMLParser): Parser con la configuración a usar (campos,
+            filtro de items, columnas, motor y tablas hijas). Las filas
+            hijas de los items elegidos quedan en su child_rows.
+        workers (int, optional): Número de procesos; con None uno por CPU
+        progress (callable, optional): Función (archivos terminados, items)
+            que se llama al terminar cada archivo
+
+    Yields:
+        tuple: (Diccionario con datos procesados, link del item), archivo
+            a archivo en el orden de las entradas
+
+    Raises:
+        XMLParseError: Si algún item no se puede parsear
+    """
+    tasks = [
+        (path, file_spans, xml_parser.custom_fields, xml_parser.item_filter,
+         xml_parser.columns, xml_parser.engine, xml_parser.children,
+         xml_parser.schema)
+        for path, file_spans in zip(file_paths, spans)
+    ]
+    xml_parser.take_child_rows()
+    count = 0
+    results = _map(_parse_spans, tasks, workers)
+    for done, (items, links, child_rows) in enumerate(results, 1):
+        xml_parser.add_child_rows(child_rows)
+        count += len(items)
+        if progress is not None:
+            progress(done, count)
+        yield from zip(items, links)
+
+def _map(function, tasks, workers):
+    """
+    Aplica una función a cada tarea, en serie o en varios procesos.
+
+    Args:
+        function (callable): Función de nivel de módulo
+        tasks (list): Tuplas de argumentos
+        workers (int): Número de procesos; con None uno por CPU
+
+    Returns:
+        iterator: Resultados en el orden de las tareas
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(tasks))
+    if workers <= 1:
+        return (function(*task) for task in tasks)
+    return _map_parallel(function, tasks, workers)
+
+def _map_parallel(function, tasks, workers):
+    """Versión en varios procesos de _map."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(function, *zip(*tasks))
+
+def _load_index(file_path):
+    """
+    Carga o construye el índice de un archivo.
+
+    Raises:
+        XMLParseError: Si el archivo no se puede leer
+    """
+    try:
+        return ItemIndex.load_or_build(file_path)
+    except (OSError, ValueError) as e:
+        raise XMLParseError(f"Error reading file {file_path}: {str(e)}")
+
+def _parse_spans(file_path, spans, custom_fields, item_filter, columns, engine,
+                 children=None, schema=None):
+    """
+    Parsea los items elegidos de un archivo.
+
+    Returns:
+        tuple: (Lista de diccionarios con datos procesados, Lista de links,
+            filas hijas como las de XMLParser.take_child_rows)
+    """
+    xml_parser = XMLParser(
+        custom_fields, item_filter, columns, engine, children, schema
+    )
+    items, links = [], []
+    for item, link in xml_parser.iter_spans(file_path, spans):
+        items.append(item)
+        links.append(link)
+    return items, links, xml_parser.take_child_rows()
@@ -0,0 +1,321 @@
+"""
+Módulo con el esquema declarativo de las columnas de salida.
+
+Cada columna indica de dónde sale su valor (una etiqueta hija del <item>,
+opcionalmente uno de sus atributos, un campo personalizado o la hora de
+otra columna de fecha) y su tipo. Al crear el parser el esquema se compila
+una sola vez en un ExtractionPlan: una tabla etiqueta -> (posición de la
+columna, conversor), de modo que cada item se procesa con un único
+recorrido de sus hijos, sea cual sea el número de columnas.
+
+Un esquema propio se puede cargar de un JSON con load_schema:
+
+    [
+        {"name": "Código", "tag": "key"},
+        {"name": "Resumen", "tag": "summary", "type": "html"},
+        {"name": "Asignado (id)", "tag": "assignee", "attribute": "accountid"},
+        {"name": "Sprint", "customfield": "Sprint"},
+        {"name": "Creada", "tag": "created", "type": "date"},
+        {"name": "Hora", "time_of": "Creada"}
+    ]
+"""
+
+import json
+from .data_handler import DataHandler
+
+# Etiqueta que agrupa los campos personalizados de un item
+CUSTOMFIELDS_TAG = 'customfields'
+
+# Campos personalizados a extraer (nombre o id en Jira -> tipo de valor).
+# Los campos que no forman parte de las columnas estándar se añaden al
+# final de cada fila con el nombre configurado.
+DEFAULT_CUSTOM_FIELDS = {
+    'Empresa': 'text',
+    'Tipo tarea': 'text',
+    'Horas utilizadas': 'number',
+    'Start date': 'date',
+}
+
+# Tipos de columna:
+# - text: texto sin espacios sobrantes
+# - html: texto con las entidades HTML decodificadas
+# - number: float (0.0 si falta o no es numérico)
+# - date: texto crudo de Jira; XMLParser.to_dataframe lo convierte en bloque
+# - user: texto del elemento o, si está vacío, su atributo accountid
+COLUMN_TYPES = ('text', 'html', 'number', 'date', 'user')
+
+class Column:
+    """Definición declarativa de una columna de salida."""
+
+    def __init__(self, name, tag=None, attribute=None, customfield=None,
+                 time_of=None, type='text', default=None):
+        """
+        Inicializa la columna.
+
+        Args:
+            name (str): Nombre de la columna en la salida
+            tag (str, optional): Etiqueta hija del <item> de la que se lee
+                el valor (se usa la primera aparición)
+            attribute (str, optional): Atributo de `tag` a leer en lugar de
+                su texto
+            customfield (str, optional): Nombre o id del campo personalizado
+            time_of (str, optional): Columna de tipo date de la que se
+                deriva la hora (HH:MM:SS) en to_dataframe
+            type (str, optional): Tipo de valor de COLUMN_TYPES
+            default (optional): Valor si el origen no aparece en el item.
+                Por defecto 0.0 en columnas number, None en columnas de hora
+                y cadena vacía en el resto. Una columna sin origen toma
+                siempre este valor.
+
+        Raises:
+            ValueError: Si la definición no es válida
+        """
+        sources = [source for source in (tag, customfield, time_of)
+                   if source is not None]
+        if len(sources) > 1:
+            raise ValueError(
+                f"La columna {name} debe tener un solo origen "
+                "(tag, customfield o time_of)"
+            )
+        if attribute is not None and tag is None:
+            raise ValueError(f"La columna {name} indica attribute sin tag")
+        if type not in COLUMN_TYPES:
+            raise ValueError(
+                f"Tipo de columna no soportado en {name}: {type} "
+                f"(disponibles: {', '.join(COLUMN_TYPES)})"
+            )
+        self.name = name
+        self.tag = tag
+        self.attribute = attribute
+        self.customfield = customfield
+        self.time_of = time_of
+        self.type = type
+        if default is None and time_of is None:
+            default = 0.0 if type == 'number' else ''
+        self.default = default
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Crea una columna a partir de su definición en JSON.
+
+        Args:
+            data (dict): Claves name, tag, attribute, customfield, time_of,
+                type y default
+
+        Returns:
+            Column: Columna definida
+
+        Raises:
+            ValueError: Si faltan claves o hay claves desconocidas
+        """
+        if not isinstance(data, dict) or 'name' not in data:
+            raise ValueError(f"Definición de columna sin name: {data!r}")
+        unknown = set(data) - {'name', 'tag', 'attribute', 'customfield',
+                               'time_of', 'type', 'default'}
+        if unknown:
+            raise ValueError(
+                f"Claves desconocidas en la columna {data['name']}: "
+                f"{', '.join(sorted(unknown))}"
+            )
+        return cls(**data)
+
+    def to_dict(self):
+        """
+        Devuelve la definición de la columna como diccionario.
+
+        Returns:
+            dict: Solo las claves con valor
+        """
+        data = {
+            'name': self.name,
+            'tag': self.tag,
+            'attribute': self.attribute,
+            'customfield': self.customfield,
+            'time_of': self.time_of,
+            'type': self.type,
+            'default': self.default,
+        }
+        return {key: value for key, value in data.items() if value is not None}
+
+    def __repr__(self):
+        items = ', '.join(f'{key}={value!r}' for key, value in self.to_dict().items())
+        return f'Column({items})'
+
+def default_schema(custom_fields=None):
+    """
+    Construye el esquema de las columnas estándar.
+
+    Args:
+        custom_fields (dict, optional): Campos personalizados a extraer
+            (nombre o id -> tipo), como en XMLParser. Las columnas estándar
+            cuyo campo no está configurado quedan siempre vacías; los campos
+            que no son estándar se añaden al final.
+
+    Returns:
+        list: Columnas, en el orden de salida
+    """
+    if custom_fields is None:
+        custom_fields = DEFAULT_CUSTOM_FIELDS
+
+    def field(name, field_name):
+        field_type = custom_fields.get(
+            field_name, DEFAULT_CUSTOM_FIELDS[field_name]
+        )
+        if field_name not in custom_fields:
+            return Column(name, type=field_type)
+        return Column(name, customfield=field_name, type=field_type)
+
+    schema = [
+        Column('Código', tag='key'),
+        Column('Tipo', tag='type'),
+        Column('Prioridad', tag='priority'),
+        field('Empresa', 'Empresa'),
+        field('Tipo Tarea', 'Tipo tarea'),
+        field('Horas Utilizadas', 'Horas utilizadas'),
+        Column('Estado', tag='status'),
+        Column('Resumen', tag='summary', type='html'),
+        Column('Asignado', tag='assignee', type='user', default='No asignado'),
+        Column('Reportado por', tag='reporter', type='user',
+               default='No especificado'),
+        field('Fecha Inicio', 'Start date'),
+        Column('Fecha Creación', tag='created', type='date'),
+        Column('Hora Creación', time_of='Fecha Creación'),
+        Column('Fecha Actualización', tag='updated', type='date'),
+        Column('Hora Actualización', time_of='Fecha Actualización'),
+    ]
+    schema.extend(
+        Column(field_name, customfield=field_name, type=field_type)
+        for field_name, field_type in custom_fields.items()
+        if field_name not in DEFAULT_CUSTOM_FIELDS
+    )
+    return schema
+
+def load_schema(path):
+    """
+    Carga un esquema de columnas de un archivo JSON.
+
+    Args:
+        path (str): Archivo con una lista de definiciones de columna
+
+    Returns:
+        list: Columnas, en el orden de salida
+
+    Raises:
+        ValueError: Si el archivo no contiene un esquema válido
+        OSError: Si el archivo no se puede leer
+    """
+    with open(path, encoding='utf-8') as file:
+        try:
+            data = json.load(file)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Esquema inválido en {path}: {e}")
+    if not isinstance(data, list) or not data:
+        raise ValueError(f"El esquema de {path} debe ser una lista de columnas")
+    return validate_schema([Column.from_dict(column) for column in data])
+
+def validate_schema(schema):
+    """
+    Comprueba que un esquema es coherente.
+
+    Args:
+        schema (list): Columnas
+
+    Returns:
+        list: Las mismas columnas
+
+    Raises:
+        ValueError: Si hay nombres repetidos o una columna de hora no
+            apunta a una columna de fecha del esquema
+    """
+    names = [column.name for column in schema]
+    repeated = sorted({name for name in names if names.count(name) > 1})
+    if repeated:
+        raise ValueError(f"Columnas repetidas en el esquema: {', '.join(repeated)}")
+    dates = {column.name for column in schema if column.type == 'date'}
+    for column in schema:
+        if column.time_of is not None and column.time_of not in dates:
+            raise ValueError(
+                f"La columna {column.name} deriva de {column.time_of}, "
+                "que no es una columna de fecha del esquema"
+            )
+    return schema
+
+class ExtractionPlan:
+    """
+    Esquema compilado: qué hacer con cada hijo de un <item>.
+
+    Las filas se construyen como listas con una posición por columna,
+    inicializadas con los valores por defecto. `tags` indica, para cada
+    etiqueta hija, las posiciones que rellena y con qué conversor;
+    `fields` hace lo mismo para los campos personalizados, que se leen del
+    hijo CUSTOMFIELDS_TAG.
+    """
+
+    def __init__(self, schema):
+        """
+        Compila las columnas indicadas.
+
+        Args:
+            schema (list): Columnas a calcular, en orden
+        """
+        self.columns = [column.name for column in schema]
+        self.defaults = [column.default for column in schema]
+        self.tags = {}
+        self.fields = []
+        for slot, column in enumerate(schema):
+            if column.tag is not None:
+                self.tags.setdefault(column.tag, []).append(
+                    (slot, _tag_converter(column))
+                )
+            elif column.customfield is not None:
+                self.fields.append(
+                    (column.customfield, slot, _field_converter(column))
+                )
+        if self.fields:
+            self.tags.setdefault(CUSTOMFIELDS_TAG, [])
+        # Campos personalizados que deben indexarse
+        self.wanted_fields = {field for field, _, _ in self.fields}
+
+def _tag_converter(column):
+    """
+    Crea el conversor elemento -> valor de una columna con etiqueta.
+
+    Args:
+        column (Column): Columna con tag
+
+    Returns:
+        callable: Función (elemento XML) -> valor
+    """
+    clean = DataHandler.clean_field_value
+    if column.attribute is not None:
+        attribute = column.attribute
+        return lambda element: clean(element.get(attribute))
+    if column.type == 'number':
+        return lambda element: DataHandler.process_numeric_field(element.text)
+    if column.type == 'html':
+        return lambda element: DataHandler.decode_html_entities(
+            clean(element.text)
+        )
+    if column.type == 'user':
+        default = column.default
+        return lambda element: element.text or element.attrib.get(
+            'accountid', default
+        )
+    return lambda element: clean(element.text)
+
+def _field_converter(column):
+    """
+    Crea el conversor valor crudo -> valor de un campo personalizado.
+
+    Args:
+        column (Column): Columna con customfield
+
+    Returns:
+        callable: Función (texto del customfieldvalue) -> valor
+    """
+    if column.type == 'number':
+        return DataHandler.process_numeric_field
+    if column.type == 'date':
+        return DataHandler.clean_field_value
+    return DataHandler.decode_html_entities
@@ -0,0 +1,189 @@
+"""
+Módulo con los filtros de selección de items.
+
+Los filtros son objetos invocables que reciben el elemento <item> sin
+procesar y devuelven False para descartarlo; se usan como item_filter de
+XMLParser, por lo que se evalúan antes de cualquier conversión de fechas,
+HTML o campos personalizados. Deben poder serializarse con pickle para el
+modo paralelo.
+
+Los filtros que además implementan `matches_raw` se aplican primero sobre
+los bytes de cada item, antes del parsing XML: los items descartados ahí
+ni siquiera se parsean.
+"""
+
+import html
+from .data_handler import DataHandler
+from .item_index import tag_text
+
+class ItemSelection:
+    """
+    Selección de items por campos baratos de leer.
+
+    Cada criterio acepta una colección de valores; un item se conserva si
+    cumple todos los criterios indicados. Solo se lee el texto de las
+    etiquetas necesarias y la fecha `updated` solo se convierte si hay un
+    rango de fechas.
+    """
+
+    def __init__(self, keys=None, statuses=None, types=None, assignees=None,
+                 projects=None, updated_from=None, updated_to=None):
+        """
+        Inicializa la selección.
+
+        Args:
+            keys (iterable, optional): Códigos de las tareas
+            statuses (iterable, optional): Estados
+            types (iterable, optional): Tipos de tarea
+            assignees (iterable, optional): Nombres de los asignados
+            projects (iterable, optional): Claves de proyecto (TD, BENCH...)
+            updated_from (datetime, optional): Actualizadas desde esta fecha
+            updated_to (datetime, optional): Actualizadas antes de esta fecha
+        """
+        self.criteria = [
+            (tag, frozenset(values))
+            for tag, values in (
+                ('key', keys),
+                ('status', statuses),
+                ('type', types),
+                ('assignee', assignees),
+            )
+            if values is not None
+        ]
+        self.projects = frozenset(projects) if projects is not None else None
+        self.updated_from = updated_from
+        self.updated_to = updated_to
+
+    def __call__(self, item):
+        """
+        Indica si el item cumple la selección.
+
+        Args:
+            item: Elemento XML del item
+
+        Returns:
+            bool: True si el item debe procesarse
+        """
+        project = item.find('project')
+        return self._matches(
+            lambda tag: (item.findtext(tag) or '').strip(),
+            project.get('key') if project is not None else None
+        )
+
+    def matches_raw(self, data, start, end):
+        """
+        Indica si un item sin parsear cumple la selección.
+
+        Args:
+            data (bytes): Lote con el item
+            start (int): Offset del <item>
+            end (int): Offset del </item>
+
+        Returns:
+            bool: True si el item debe parsearse
+        """
+        project = None
+        if self.projects is not None:
+            position = data.find(b'<project ', start, end)
+            if position != -1:
+                close = data.find(b'>', position, end)
+                tag = data[position:close].decode('utf-8', errors='ignore')
+                marker = tag.find(' key="')
+                if marker != -1:
+                    value_start = marker + len(' key="')
+                    project = html.unescape(
+                        tag[value_start:tag.find('"', value_start)]
+                    )
+        return self._matches(
+            lambda tag: html.unescape(
+                tag_text(data, tag.encode('ascii'), start, end)
+            ),
+            project
+        )
+
+    def _matches(self, get_text, project):
+        """
+        Evalúa los criterios sobre los valores de un item.
+
+        Args:
+            get_text (callable): Función etiqueta -> texto del item
+            project (str): Clave del proyecto del item
+
+        Returns:
+            bool: True si el item cumple todos los criterios
+        """
+        for tag, values in self.criteria:
+            if get_text(tag) not in values:
+                return False
+        if self.projects is not None and project not in self.projects:
+            return False
+        if self.updated_from is not None or self.updated_to is not None:
+            updated = DataHandler.parse_jira_datetime(get_text('updated'))
+            if updated is None:
+                return False
+            if self.updated_from is not None and updated < self.updated_from:
+                return False
+            if self.updated_to is not None and updated >= self.updated_to:
+                return False
+        return True
+
+class AllFilters:
+    """Combina varios filtros de items: se conservan los que pasan todos."""
+
+    def __init__(self, *filters):
+        """
+        Inicializa la combinación.
+
+        Args:
+            *filters: Filtros de items
+        """
+        self.filters = list(filters)
+
+    def __call__(self, item):
+        return all(item_filter(item) for item_filter in self.filters)
+
+    def matches_raw(self, data, start, end):
+        """Aplica los filtros que admiten evaluación sobre bytes."""
+        return all(
+            item_filter.matches_raw(data, start, end)
+            for item_filter in self.filters
+            if hasattr(item_filter, 'matches_raw')
+        )
+
+class UniqueKeys:
+    """
+    Descarta los items cuyo código ya apareció antes.
+
+    Sirve para leer páginas de una búsqueda que pueden solaparse. Debe ir
+    el último al combinarlo con otros filtros, para registrar solo los
+    items que pasan los demás; no implementa matches_raw porque cada item
+    debe contarse una sola vez.
+    """
+
+    def __init__(self):
+        """Inicializa el filtro sin códigos vistos."""
+        self.seen = set()
+
+    def __call__(self, item):
+        key = (item.findtext('key') or '').strip()
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        return True
+
+def combine_filters(*filters):
+    """
+    Combina filtros de items en uno solo.
+
+    Args:
+        *filters: Filtros de items o None
+
+    Returns:
+        callable: Filtro combinado, el único filtro indicado, o None
+    """
+    filters = [item_filter for item_filter in filters if item_filter is not None]
+    if not filters:
+        return None
+    if len(filters) == 1:
+        return filters[0]
+    return AllFilters(*filters)
@@ -0,0 +1,264 @@
+"""
+Módulo con los formatos de salida del conversor.
+
+Todos los writers reciben el mismo DataFrame (fechas datetime64, horas
+float y columnas categóricas) y lo escriben con los tipos nativos de su
+formato. Para añadir un formato basta con registrar una subclase de
+OutputWriter en WRITERS.
+
+Las tablas hijas (registros de trabajo, comentarios...) se escriben como
+hojas adicionales en xlsx y como archivos <salida>_<tabla>.<formato> en el
+resto de formatos.
+"""
+
+import importlib
+import os
+
+# Nombre de la columna con el link de cada tarea en formatos sin hipervínculos
+LINK_COLUMN = 'Enlace'
+
+class OutputWriter:
+    """Clase base para los formatos de salida."""
+
+    extension = None
+
+    def __init__(self, df, output_path, links=None, progress=None,
+                 children=None):
+        """
+        Inicializa el writer.
+
+        Args:
+            df (pandas.DataFrame): Datos a escribir
+            output_path (str): Ruta del archivo de salida
+            links (list): Lista de links de las tareas
+            progress (callable, optional): Función (filas escritas) que los
+                formatos por filas llaman durante la escritura; si lanza una
+                excepción, la escritura se interrumpe
+            children (dict, optional): Tablas hijas a escribir junto a la
+                principal (nombre -> DataFrame, ver XMLParser.to_child_frames)
+        """
+        self.df = df
+        self.output_path = output_path
+        self.links = links or []
+        self.progress = progress
+        self.children = children or {}
+
+    def _notify(self, rows):
+        """
+        Informa las filas escritas hasta el momento.
+
+        Args:
+            rows (int): Filas ya escritas
+        """
+        if self.progress is not None:
+            self.progress(rows)
+
+    def write(self):
+        """
+        Escribe el archivo de salida.
+
+        Raises:
+            Exception: Si hay error al escribir
+        """
+        raise NotImplementedError
+
+    def child_paths(self):
+        """
+        Calcula la ruta del archivo de cada tabla hija.
+
+        Returns:
+            dict: Nombre de tabla -> <salida>_<tabla>.<extensión>
+        """
+        base, extension = os.path.splitext(self.output_path)
+        return {name: f'{base}_{name}{extension}' for name in self.children}
+
+    def output_paths(self):
+        """
+        Enumera todos los archivos que genera el writer.
+
+        Se usa para eliminar una salida parcial si la escritura se cancela.
+
+        Returns:
+            list: La salida principal y los archivos de las tablas hijas
+        """
+        return [self.output_path, *self.child_paths().values()]
+
+    def _write_children(self):
+        """Escribe cada tabla hija en su propio archivo, con este formato."""
+        for name, path in self.child_paths().items():
+            type(self)(self.children[name], path).write()
+
+    def _frame_with_links(self):
+        """
+        Devuelve el DataFrame con la columna de links añadida.
+
+        Returns:
+            pandas.DataFrame: Datos con la columna LINK_COLUMN si hay links
+        """
+        if not self.links:
+            return self.df
+        return self.df.assign(**{LINK_COLUMN: list(self.links)})
+
+class XlsxWriter(OutputWriter):
+    """Escribe Excel con formato e hipervínculos mediante ExcelFormatter."""
+
+    extension = 'xlsx'
+
+    def __init__(self, df, output_path, links=None, max_rows=None,
+                 shard_mode='sheets', workers=1, progress=None, children=None):
+        """
+        Inicializa el writer.
+
+        Args:
+            df (pandas.DataFrame): Datos a escribir
+            output_path (str): Ruta del archivo de salida
+            links (list): Lista de links de las tareas
+            max_rows (int, optional): Filas por hoja o archivo
+            shard_mode (str, optional): 'sheets' o 'files'
+            workers (int, optional): Procesos para escribir las partes
+            progress (callable, optional): Función (filas escritas)
+            children (dict, optional): Tablas hijas, como hojas adicionales
+        """
+        super().__init__(df, output_path, links, progress, children)
+        self.max_rows = max_rows
+        self.shard_mode = shard_mode
+        self.workers = workers
+        self.formatter = None
+
+    def write(self):
+        from .excel_formatter import ExcelFormatter
+
+        self.formatter = ExcelFormatter(
+            self.df, self.output_path, self.links,
+            max_rows=self.max_rows,
+            shard_mode=self.shard_mode,
+            workers=self.workers,
+            progress=self.progress,
+            children=self.children
+        )
+        if not self.formatter.format_excel():
+            raise Exception("Error al formatear el archivo Excel")
+
+    def output_paths(self):
+        """
+        Enumera todos los archivos que genera el writer.
+
+        Las tablas hijas van en hojas del mismo libro; en modo 'files' se
+        añaden los libros de cada parte.
+
+        Returns:
+            list: El libro principal (o índice) y los de cada parte
+        """
+        paths = [self.output_path]
+        if self.formatter is not None:
+            paths.extend(self.formatter.shard_paths())
+        return paths
+
+class CSVWriter(OutputWriter):
+    """Escribe CSV en UTF-8 con fechas ISO."""
+
+    extension = 'csv'
+
+    # Filas escritas por bloque; el progreso se informa entre bloques
+    chunk_rows = 10000
+
+    def write(self):
+        df = self._frame_with_links()
+        with open(self.output_path, 'w', encoding='utf-8', newline='') as file:
+            for start in range(0, max(len(df), 1), self.chunk_rows):
+                self._notify(start)
+                df.iloc[start:start + self.chunk_rows].to_csv(
+                    file,
+                    header=start == 0,
+                    index=False,
+                    date_format='%Y-%m-%d'
+                )
+        self._write_children()
+
+class ParquetWriter(OutputWriter):
+    """Escribe Parquet con columnas categóricas como diccionarios."""
+
+    extension = 'parquet'
+
+    def write(self):
+        parquet = _import_pyarrow('parquet', 'pyarrow.parquet')
+        parquet.write_table(
+            _to_arrow_table(self._frame_with_links(), self.extension),
+            self.output_path
+        )
+        self._write_children()
+
+class ArrowWriter(OutputWriter):
+    """Escribe un archivo Arrow IPC (Feather v2)."""
+
+    extension = 'arrow'
+
+    def write(self):
+        pa = _import_pyarrow('arrow', 'pyarrow')
+        table = _to_arrow_table(self._frame_with_links(), self.extension)
+        with pa.OSFile(self.output_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        self._write_children()
+
+# Formatos de salida disponibles (nombre -> clase)
+WRITERS = {
+    writer.extension: writer
+    for writer in (XlsxWriter, CSVWriter, ParquetWriter, ArrowWriter)
+}
+
+def get_writer(output_format):
+    """
+    Obtiene la clase writer de un formato.
+
+    Args:
+        output_format (str): Nombre del formato ('xlsx', 'csv', ...)
+
+    Returns:
+        type: Subclase de OutputWriter
+
+    Raises:
+        ValueError: Si el formato no existe
+    """
+    try:
+        return WRITERS[output_format]
+    except KeyError:
+        raise ValueError(
+            f"Formato de salida no soportado: {output_format} "
+            f"(disponibles: {', '.join(WRITERS)})"
+        )
+
+def _import_pyarrow(output_format, module_name):
+    """
+    Importa pyarrow, dependencia opcional de los formatos columnares.
+
+    Args:
+        output_format (str): Formato que la necesita
+        module_name (str): Módulo a importar
+
+    Returns:
+        module: Módulo importado
+
+    Raises:
+        ImportError: Si pyarrow no está instalado
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        raise ImportError(
+            f"El formato {output_format} requiere pyarrow: pip install pyarrow"
+        )
+
+def _to_arrow_table(df, output_format):
+    """
+    Convierte el DataFrame a una tabla Arrow sin índice.
+
+    Args:
+        df (pandas.DataFrame): Datos a convertir
+        output_format (str): Formato que la necesita
+
+    Returns:
+        pyarrow.Table: Tabla con categorías como dictionary
+    """
+    pa = _import_pyarrow(output_format, 'pyarrow')
+    return pa.Table.from_pandas(df, preserve_index=False)
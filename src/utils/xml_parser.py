@@ -3,9 +3,32 @@ Módulo para el procesamiento de archivos XML.
 """
 
 import xml.etree.ElementTree as ET
-import codecs
-import re
+from collections import deque
+import importlib
+import mmap
+import os
+from .children import CHILD_TABLES, CHILD_NUMERIC_COLUMNS, validate_children
+from .columns import ColumnStore, NUMERIC_COLUMNS
 from .data_handler import DataHandler
+from .item_index import DocumentOutline, ItemIndex
+from .schema import (
+    CUSTOMFIELDS_TAG, DEFAULT_CUSTOM_FIELDS, ExtractionPlan, default_schema,
+    validate_schema,
+)
+
+# Tamaño aproximado de cada lote de items en modo streaming (serie)
+CHUNK_SIZE = 1024 * 1024
+
+# Bytes de control no válidos en XML 1.0. Son ASCII y nunca forman parte de
+# una secuencia UTF-8 multibyte, por lo que se eliminan antes de decodificar.
+CONTROL_BYTES = bytes(range(0x00, 0x09)) + b'\x0b\x0c' + \
+    bytes(range(0x0e, 0x20)) + b'\x7f'
+
+# Tamaño aproximado de cada lote de items enviado a un proceso (modo paralelo)
+PARALLEL_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Motores de parsing: 'auto' usa lxml si está instalado y si no ElementTree
+PARSER_ENGINES = ('auto', 'etree', 'lxml')
 
 class XMLParseError(Exception):
     """Excepción personalizada para errores de parsing XML."""
@@ -14,16 +37,100 @@ class XMLParseError(Exception):
 class XMLParser:
     """Clase para procesar archivos XML de Jira."""
 
-    def __init__(self):
-        """Inicializa el parser XML."""
+    def __init__(self, custom_fields=None, item_filter=None, columns=None,
+                 engine='auto', children=None, schema=None):
+        """
+        Inicializa el parser XML.
+
+        Args:
+            custom_fields (dict, optional): Campos personalizados a extraer,
+                como nombre o id del campo -> tipo ('text', 'number' o
+                'date'). Por defecto DEFAULT_CUSTOM_FIELDS. Los campos 'date'
+                se entregan como texto crudo y se convierten en to_dataframe.
+            item_filter (callable, optional): Función que recibe el elemento
+                <item> sin procesar y devuelve False para descartarlo antes
+                de cualquier conversión. Debe poder serializarse con pickle
+                para el modo paralelo.
+            columns (list, optional): Columnas a generar, en ese orden. Las
+                demás no se calculan (ni sus campos personalizados se
+                leen). Por defecto todas.
+            engine (str, optional): Motor de parsing de PARSER_ENGINES. Ambos
+                motores producen exactamente el mismo resultado.
+            children (list, optional): Tablas hijas de CHILD_TABLES a extraer
+                en la misma pasada (registros de trabajo, comentarios,
+                vínculos, subtareas). Sus filas se acumulan en child_rows.
+            schema (list, optional): Columnas (schema.Column) a generar en
+                lugar de las estándar; custom_fields se ignora. Por defecto
+                default_schema(custom_fields).
+
+        Raises:
+            ValueError: Si alguna columna, tabla hija, el esquema o el motor
+                no son válidos
+            ImportError: Si se pide 'lxml' y no está instalado
+        """
         self.data_handler = DataHandler()
+        self.item_filter = item_filter
+        self.engine = resolve_engine(engine)
+        self._fromstring, self._parse_error = _engine_parser(self.engine)
+        # Bytes del archivo consumidos por la última lectura incremental
+        self.bytes_read = 0
+        # Códigos pedidos con keys que no están en el archivo (última lectura)
+        self.missing_keys = []
+        if schema is None:
+            self.custom_fields = dict(
+                DEFAULT_CUSTOM_FIELDS if custom_fields is None else custom_fields
+            )
+            schema = default_schema(self.custom_fields)
+        else:
+            schema = validate_schema(list(schema))
+            self.custom_fields = {
+                column.customfield: column.type for column in schema
+                if column.customfield is not None
+            }
+        self.schema = schema
+
+        by_name = {column.name: column for column in schema}
+        if columns is None:
+            self.columns = list(by_name)
+        else:
+            unknown = [column for column in columns if column not in by_name]
+            if unknown:
+                raise ValueError(
+                    f"Columnas desconocidas: {', '.join(unknown)} "
+                    f"(disponibles: {', '.join(by_name)})"
+                )
+            self.columns = list(dict.fromkeys(columns))
+
+        # Las columnas de hora se derivan de su fecha en to_dataframe, por lo
+        # que la fecha se calcula aunque no se haya pedido
+        computed = list(self.columns)
+        for column in self.columns:
+            time_of = by_name[column].time_of
+            if time_of is not None and time_of not in computed:
+                computed.append(time_of)
+        self._computed_columns = computed
+        self._plan = ExtractionPlan([by_name[column] for column in computed])
+        self._wanted_fields = self._plan.wanted_fields
+        # Columnas de fecha -> columna de hora derivada (o None)
+        self._date_columns = {
+            column.name: None for column in schema if column.type == 'date'
+        }
+        for column in schema:
+            if column.time_of is not None:
+                self._date_columns[column.time_of] = column.name
+
+        self.children = validate_children(children or ())
+        # Filas de las tablas hijas de la última lectura (nombre -> ColumnStore)
+        self.child_rows = self._new_child_stores()
 
-    def parse_file(self, file_path):
+    def parse_file(self, file_path, workers=1):
         """
         Parsea un archivo XML de Jira.
         
         Args:
             file_path (str): Ruta al archivo XML
+            workers (int, optional): Número de procesos. Con 1 se procesa en
+                serie; con None se usa un proceso por CPU.
             
         Returns:
             list: Lista de items procesados
@@ -31,42 +138,433 @@ class XMLParser:
         Raises:
             XMLParseError: Si hay error en el parsing
         """
+        items, links = [], []
+        for item, link in self.iter_file(file_path, workers):
+            items.append(item)
+            links.append(link)
+        return items, links
+
+    def iter_file(self, file_path, workers=1, progress=None, keys=None):
+        """
+        Parsea un archivo XML de Jira en modo streaming.
+
+        Recorre el archivo mapeado en memoria por lotes de items completos
+        (unos CHUNK_SIZE bytes cada uno); cada lote se limpia a nivel de
+        bytes, se parsea y se libera antes de leer el siguiente. El consumo
+        de memoria se mantiene constante sin importar el tamaño del archivo.
+
+        Args:
+            file_path (str): Ruta al archivo XML
+            workers (int, optional): Número de procesos. Con 1 se procesa en
+                serie; con None se usa un proceso por CPU.
+            progress (callable, optional): Función (items, bytes leídos) que
+                se llama cada vez que se consume un bloque del archivo
+            keys (iterable, optional): Códigos de los items a procesar. Se
+                localizan con el índice de offsets del archivo (ItemIndex,
+                que se crea y guarda la primera vez) y solo se leen esos
+                items, en el orden del archivo. Los códigos que no están en
+                el archivo quedan en missing_keys.
+
+        Yields:
+            tuple: (Diccionario con datos procesados, link del item)
+
+        Raises:
+            XMLParseError: Si hay error en la lectura o el parsing
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.missing_keys = []
+        if keys is not None:
+            items = self._iter_file_indexed(file_path, keys)
+        elif workers > 1:
+            items = self._iter_file_parallel(file_path, workers)
+        else:
+            items = self._iter_file_serial(file_path)
+
+        count = 0
+        bytes_read = None
+        for processed_item, link in items:
+            count += 1
+            if progress is not None and self.bytes_read != bytes_read:
+                bytes_read = self.bytes_read
+                progress(count, bytes_read)
+            yield processed_item, link
+        if progress is not None:
+            progress(count, self.bytes_read)
+
+    def _iter_file_serial(self, file_path):
+        """
+        Procesa el archivo en el proceso actual.
+
+        Args:
+            file_path (str): Ruta al archivo XML
+
+        Yields:
+            tuple: (Diccionario con datos procesados, link del item)
+        """
+        self.bytes_read = 0
+        self.child_rows = self._new_child_stores()
+        for chunk in self._iter_item_chunks(file_path, CHUNK_SIZE):
+            items, links = self._parse_chunk(chunk)
+            self.bytes_read += len(chunk)
+            yield from zip(items, links)
+
+    def _iter_file_indexed(self, file_path, keys):
+        """
+        Procesa solo los items indicados accediendo directamente a sus bytes.
+
+        Args:
+            file_path (str): Ruta al archivo XML
+            keys (iterable): Códigos de los items
+
+        Returns:
+            iterator: Pares (Diccionario con datos procesados, link del item)
+        """
         try:
-            content = self._read_file(file_path)
-            cleaned_content = self._clean_content(content)
-            root = ET.fromstring(cleaned_content)
-            return self._process_items(root)
-        except Exception as e:
-            raise XMLParseError(f"Error parsing XML: {str(e)}")
+            index = ItemIndex.load_or_build(file_path)
+        except (OSError, ValueError) as e:
+            raise XMLParseError(f"Error reading file: {str(e)}")
+        spans, self.missing_keys = index.locate(keys)
+        return self.iter_spans(file_path, spans)
 
-    def _read_file(self, file_path):
+    def iter_spans(self, file_path, spans):
         """
-        Lee el contenido del archivo XML.
-        
+        Procesa los items que ocupan los rangos de bytes indicados.
+
+        Los items se leen del archivo mapeado en memoria y se parsean por
+        lotes de unos CHUNK_SIZE bytes, sin recorrer el resto del archivo.
+
         Args:
-            file_path (str): Ruta al archivo
-            
+            file_path (str): Ruta al archivo XML
+            spans (list): Pares (offset, longitud) de elementos <item>
+                completos, como los de ItemIndex
+
+        Yields:
+            tuple: (Diccionario con datos procesados, link del item)
+        """
+        self.bytes_read = 0
+        self.child_rows = self._new_child_stores()
+        if not spans:
+            return
+        with open(file_path, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            batch = []
+            size = 0
+            for position, (offset, length) in enumerate(spans, 1):
+                batch.append(data[offset:offset + length])
+                size += length
+                if size < CHUNK_SIZE and position < len(spans):
+                    continue
+                items, links = self._parse_chunk(b''.join(batch))
+                self.bytes_read += size
+                batch = []
+                size = 0
+                yield from zip(items, links)
+
+    def iter_bytes(self, data):
+        """
+        Procesa un XML completo que ya está en memoria, como una página
+        descargada de Jira.
+
+        Se recorre por lotes de unos CHUNK_SIZE bytes igual que un archivo;
+        `data` no se copia entero.
+
+        Args:
+            data (bytes): Contenido del XML
+
+        Yields:
+            tuple: (Diccionario con datos procesados, link del item)
+
+        Raises:
+            XMLParseError: Si el contenido está vacío o no es XML válido
+        """
+        self.bytes_read = 0
+        self.child_rows = self._new_child_stores()
+        if not data:
+            raise XMLParseError("Error parsing XML: empty document")
+        for chunk, position in _split_items(data, CHUNK_SIZE):
+            items, links = self._parse_chunk(chunk)
+            self.bytes_read = position
+            yield from zip(items, links)
+
+    def new_column_store(self, items=()):
+        """
+        Crea un almacén por columnas con los tipos de este parser.
+
+        Args:
+            items (iterable, optional): Items iniciales
+
+        Returns:
+            ColumnStore: Almacén listo para recibir items
+        """
+        numeric = list(NUMERIC_COLUMNS) + [
+            column.name for column in self.schema if column.type == 'number'
+        ]
+        return ColumnStore.from_items(items, numeric=numeric)
+
+    def to_dataframe(self, items):
+        """
+        Construye el DataFrame a partir de los items procesados.
+
+        Las columnas de fecha se convierten en una sola pasada vectorizada a
+        datetime64 (día, sin hora) y de ellas se derivan las columnas de hora
+        en formato HH:MM:SS.
+
+        Args:
+            items (ColumnStore/list): Items acumulados por columnas, o lista
+                de diccionarios devueltos por parse_file o iter_file
+
+        Returns:
+            pandas.DataFrame: Datos listos para el formateador
+        """
+        if not isinstance(items, ColumnStore):
+            items = self.new_column_store(items)
+        df = items.to_dataframe()
+        self._convert_dates(df, self._date_columns)
+        if len(self._computed_columns) != len(self.columns):
+            df = df[[column for column in self.columns if column in df.columns]]
+        return df
+
+    def to_child_frames(self, child_rows=None):
+        """
+        Construye un DataFrame por tabla hija.
+
+        Las fechas se convierten igual que en to_dataframe. Las tablas sin
+        filas se devuelven vacías pero con sus columnas.
+
+        Args:
+            child_rows (dict, optional): Nombre de tabla -> ColumnStore. Por
+                defecto las filas de la última lectura (child_rows).
+
+        Returns:
+            dict: Nombre de tabla -> pandas.DataFrame, en el orden de children
+        """
+        import pandas as pd
+
+        if child_rows is None:
+            child_rows = self.child_rows
+        frames = {}
+        for name in self.children:
+            _, columns, _, date_columns = CHILD_TABLES[name]
+            store = child_rows[name]
+            if len(store):
+                df = store.to_dataframe()
+            else:
+                df = pd.DataFrame({column: pd.Series(dtype=object)
+                                   for column in columns})
+            self._convert_dates(df, date_columns)
+            frames[name] = df
+        return frames
+
+    def take_child_rows(self):
+        """
+        Entrega las filas hijas acumuladas y empieza con tablas vacías.
+
+        Returns:
+            dict: Nombre de tabla -> ColumnStore
+        """
+        child_rows = self.child_rows
+        self.child_rows = self._new_child_stores()
+        return child_rows
+
+    def add_child_rows(self, child_rows):
+        """
+        Añade a child_rows las filas hijas obtenidas por otro parser (por
+        ejemplo, en un proceso hijo).
+
+        Args:
+            child_rows (dict): Nombre de tabla -> ColumnStore
+        """
+        for name, store in child_rows.items():
+            self.child_rows[name].extend(store)
+
+    def _new_child_stores(self):
+        """
+        Crea un almacén vacío por tabla hija.
+
+        Returns:
+            dict: Nombre de tabla -> ColumnStore
+        """
+        return {
+            name: ColumnStore(numeric=CHILD_NUMERIC_COLUMNS)
+            for name in self.children
+        }
+
+    def _convert_dates(self, df, date_columns):
+        """
+        Convierte las columnas de fecha de un DataFrame, en el sitio.
+
+        Args:
+            df (pandas.DataFrame): Datos con las fechas como texto de Jira
+            date_columns (dict): Columna de fecha -> columna de hora derivada
+                (o None)
+        """
+        for date_col, time_col in date_columns.items():
+            if date_col not in df.columns:
+                continue
+            dates = self.data_handler.parse_jira_dates(df[date_col])
+            if time_col in df.columns:
+                df[time_col] = dates.dt.strftime('%H:%M:%S').fillna('')
+            df[date_col] = dates.dt.normalize()
+
+    def _iter_file_parallel(self, file_path, workers):
+        """
+        Procesa el archivo repartiendo lotes de items entre varios procesos.
+
+        Los resultados se entregan en el orden original del archivo. El
+        número de lotes en vuelo está acotado para no cargar el archivo
+        completo en memoria.
+
+        Args:
+            file_path (str): Ruta al archivo XML
+            workers (int): Número de procesos
+
+        Yields:
+            tuple: (Diccionario con datos procesados, link del item)
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_chunk_worker,
+            initargs=(
+                self.custom_fields, self.item_filter, self.columns, self.engine,
+                self.children, self.schema
+            )
+        ) as executor:
+            self.bytes_read = 0
+            self.child_rows = self._new_child_stores()
+            pending = deque()
+            submitted = 0
+            for chunk in self._iter_item_chunks(file_path):
+                submitted += len(chunk)
+                pending.append(
+                    (executor.submit(_parse_item_chunk, chunk), submitted)
+                )
+                if len(pending) >= workers * 2:
+                    yield from self._chunk_results(pending.popleft())
+            while pending:
+                yield from self._chunk_results(pending.popleft())
+
+    def _chunk_results(self, entry):
+        """
+        Espera el resultado de un lote y actualiza los bytes consumidos.
+
+        Args:
+            entry (tuple): (Future del lote, bytes enviados hasta ese lote)
+
         Returns:
-            str: Contenido del archivo
+            iterator: Pares (Diccionario con datos procesados, link del item)
+        """
+        future, submitted = entry
+        items, links, child_rows = future.result()
+        self.bytes_read = submitted
+        self.add_child_rows(child_rows)
+        return zip(items, links)
+
+    def _iter_item_chunks(self, file_path, chunk_size=None):
+        """
+        Divide el archivo en lotes de bytes que contienen items completos.
+
+        Los cortes se hacen siempre después de un </item>, por lo que cada
+        lote es un fragmento XML válido por sí mismo.
+
+        Args:
+            file_path (str): Ruta al archivo XML
+            chunk_size (int, optional): Tamaño aproximado de cada lote
+
+        Yields:
+            bytes: Lote con uno o más elementos <item>
         """
+        chunk_size = chunk_size or PARALLEL_CHUNK_SIZE
         try:
-            with codecs.open(file_path, 'r', encoding='utf-8', 
-                           errors='ignore') as file:
-                return file.read()
+            file = open(file_path, 'rb')
         except Exception as e:
             raise XMLParseError(f"Error reading file: {str(e)}")
 
-    def _clean_content(self, content):
+        with file:
+            if os.fstat(file.fileno()).st_size == 0:
+                raise XMLParseError("Error parsing XML: empty file")
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                released = 0
+                for chunk, position in _split_items(data, chunk_size):
+                    yield chunk
+                    released = _release_pages(data, released, position)
+
+    def _parse_chunk(self, chunk):
         """
-        Limpia el contenido XML.
-        
+        Parsea y procesa un lote de items.
+
+        Los caracteres de control se eliminan sobre los bytes crudos antes
+        de decodificar, sin copias intermedias del texto.
+
         Args:
-            content (str): Contenido XML
-            
+            chunk (bytes): Lote de elementos <item> completos
+
+        Returns:
+            tuple: (Lista de diccionarios con datos procesados, Lista de links)
+
+        Raises:
+            XMLParseError: Si el lote no es XML válido
+        """
+        matches_raw = getattr(self.item_filter, 'matches_raw', None)
+        if matches_raw is not None:
+            chunk = self._prefilter_chunk(chunk, matches_raw)
+            if not chunk:
+                return [], []
+        content = self._clean_bytes(chunk).decode('utf-8', errors='ignore')
+        try:
+            root = self._fromstring(f"<items>{content}</items>")
+        except self._parse_error as e:
+            raise XMLParseError(f"Error parsing XML: {str(e)}")
+        return self._process_items(root)
+
+    @staticmethod
+    def _prefilter_chunk(chunk, matches_raw):
+        """
+        Descarta de un lote los items que el filtro rechaza sin parsearlos.
+
+        Args:
+            chunk (bytes): Lote de elementos <item> completos
+            matches_raw (callable): Función (datos, inicio, fin) -> bool
+
+        Returns:
+            bytes: Lote con los items aceptados
+        """
+        kept = []
+        total = accepted = position = 0
+        while True:
+            start = chunk.find(b'<item>', position)
+            if start == -1:
+                break
+            end = chunk.find(b'</item>', start)
+            if end == -1:
+                raise XMLParseError("Error parsing XML: unclosed <item> element")
+            # Lo que hay entre items se conserva para que se siga parseando
+            if position:
+                kept.append(chunk[position:start])
+            position = end + len(b'</item>')
+            total += 1
+            if matches_raw(chunk, start, end):
+                accepted += 1
+                kept.append(chunk[start:position])
+        if accepted == total:
+            return chunk
+        kept = b''.join(kept)
+        return kept if kept.strip() else b''
+
+    @staticmethod
+    def _clean_bytes(data):
+        """
+        Elimina los caracteres de control no válidos en XML.
+
+        Args:
+            data (bytes): Contenido XML sin decodificar
+
         Returns:
-            str: Contenido limpio
+            bytes: Contenido limpio
         """
-        return re.sub(r'[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F]', '', content)
+        return data.translate(None, CONTROL_BYTES)
 
     def _process_items(self, root):
         """
@@ -83,8 +581,12 @@ class XMLParser:
         links = []
 
         for item in items:
+            if not self._accepts(item):
+                continue
             try:
                 processed_item = self._process_single_item(item)
+                if self.children:
+                    self._process_children(item)
                 processed_items.append(processed_item)
                 links.append(self._get_text(item, 'link'))
             except Exception as e:
@@ -93,104 +595,274 @@ class XMLParser:
 
         return processed_items, links
 
-    def _process_single_item(self, item):
+    def _process_children(self, item):
         """
-        Procesa un único item del XML.
+        Añade las filas hijas de un item a child_rows.
+
+        Las filas de todas las tablas se calculan antes de añadir ninguna,
+        de modo que un item con errores no deja filas hijas sueltas.
+
+        Args:
+            item: Elemento XML del item
         """
-        fecha_creacion, hora_creacion = self.data_handler.parse_jira_date(
-            self._get_text(item, 'created')
-        )
-        fecha_actualizacion, hora_actualizacion = self.data_handler.parse_jira_date(
-            self._get_text(item, 'updated')
-        )
-        
-        # Obtener fecha de inicio desde el campo personalizado
-        fecha_inicio = self._get_customfield_value(item, 'Start date')
-        if fecha_inicio:
-            fecha_inicio, _ = self.data_handler.parse_jira_date(fecha_inicio)
+        key = self._get_text(item, 'key')
+        rows = [
+            (name, list(CHILD_TABLES[name][2](item, key)))
+            for name in self.children
+        ]
+        for name, table_rows in rows:
+            store = self.child_rows[name]
+            for row in table_rows:
+                store.append(row)
 
-        return {
-            'Código': self._get_text(item, 'key'),
-            'Tipo': self._get_text(item, 'type'),
-            'Prioridad': self._get_text(item, 'priority'),
-            'Empresa': self._get_customfield_value(item, 'Empresa'),
-            'Tipo Tarea': self._get_customfield_value(item, 'Tipo tarea'),
-            'Horas Utilizadas': self._get_customfield_value(item, 'Horas utilizadas'),
-            'Estado': self._get_text(item, 'status'),
-            'Resumen': self.data_handler.decode_html_entities(
-                self._get_text(item, 'summary')
-            ),
-            'Asignado': self._get_assignee(item),
-            'Reportado por': self._get_reporter(item),
-            'Fecha Inicio': fecha_inicio,  # Nueva columna
-            'Fecha Creación': fecha_creacion,
-            'Hora Creación': hora_creacion,
-            'Fecha Actualización': fecha_actualizacion,
-            'Hora Actualización': hora_actualizacion
-        }
-    def _get_text(self, item, tag):
+    def _accepts(self, item):
         """
-        Obtiene el texto de un elemento XML de forma segura.
-        
+        Indica si el item pasa el filtro configurado.
+
         Args:
             item: Elemento XML del item
-            tag (str): Nombre de la etiqueta
-            
+
         Returns:
-            str: Texto del elemento o cadena vacía
+            bool: True si el item debe procesarse
         """
-        element = item.find(tag)
-        return self.data_handler.clean_field_value(
-            element.text if element is not None else ''
-        )
+        return self.item_filter is None or self.item_filter(item)
+
+    def _process_single_item(self, item):
+        """
+        Procesa un único item del XML.
 
-    def _get_customfield_value(self, item, field_name):
+        Los hijos del item se recorren una sola vez: cada etiqueta del plan
+        compilado rellena sus columnas y el recorrido termina en cuanto se
+        han visto todas. Solo se calculan las columnas configuradas y solo
+        se recorren los campos personalizados si alguna de ellas los
+        necesita.
         """
-        Obtiene el valor de un campo personalizado por nombre.
-        
+        plan = self._plan
+        row = list(plan.defaults)
+        pending = dict(plan.tags)
+        for child in item:
+            handlers = pending.pop(child.tag, None)
+            if handlers is None:
+                continue
+            if child.tag == CUSTOMFIELDS_TAG:
+                self._fill_customfields(child, row)
+            else:
+                for slot, convert in handlers:
+                    row[slot] = convert(child)
+            if not pending:
+                break
+        return dict(zip(plan.columns, row))
+
+    def _fill_customfields(self, customfields, row):
+        """
+        Rellena las columnas de campos personalizados de una fila.
+
         Args:
-            item: Elemento XML del item
-            field_name (str): Nombre del campo personalizado
-            
-        Returns:
-            str/float: Valor del campo personalizado
+            customfields: Elemento <customfields> del item
+            row (list): Fila en construcción
         """
-        for customfield in item.findall(".//customfield"):
-            name_elem = customfield.find('customfieldname')
-            if name_elem is not None and name_elem.text == field_name:
-                value_elem = customfield.find('.//customfieldvalue')
-                if value_elem is not None:
-                    if field_name == 'Horas utilizadas':
-                        return self.data_handler.process_numeric_field(value_elem.text)
-                    return self.data_handler.decode_html_entities(value_elem.text)
-        return 0.0 if field_name == 'Horas utilizadas' else ''
+        by_name, by_id = self._index_customfields(customfields)
+        for field_name, slot, convert in self._plan.fields:
+            if field_name in by_name:
+                row[slot] = convert(by_name[field_name])
+            elif field_name in by_id:
+                row[slot] = convert(by_id[field_name])
 
-    def _get_assignee(self, item):
+    def _get_text(self, item, tag):
         """
-        Obtiene el nombre del asignado de forma segura.
+        Obtiene el texto de un elemento XML de forma segura.
         
         Args:
             item: Elemento XML del item
+            tag (str): Nombre de la etiqueta
             
         Returns:
-            str: Nombre del asignado o 'No asignado'
+            str: Texto del elemento o cadena vacía
         """
-        assignee = item.find('assignee')
-        if assignee is not None:
-            return assignee.text or assignee.attrib.get('accountid', 'No asignado')
-        return 'No asignado'
+        return self.data_handler.clean_field_value(item.findtext(tag))
 
-    def _get_reporter(self, item):
+    def _index_customfields(self, item):
         """
-        Obtiene el nombre del reportero de forma segura.
-        
+        Recorre una sola vez los campos personalizados del item.
+
+        Solo se guardan los campos que necesitan las columnas configuradas;
+        si un campo aparece más de una vez se conserva la primera aparición
+        con valor.
+
         Args:
-            item: Elemento XML del item
-            
+            item: Elemento XML del item o su elemento <customfields>
+
         Returns:
-            str: Nombre del reportero o 'No especificado'
+            tuple: (dict nombre -> valor crudo, dict id -> valor crudo)
         """
-        reporter = item.find('reporter')
-        if reporter is not None:
-            return reporter.text or reporter.attrib.get('accountid', 'No especificado')
-        return 'No especificado'
\ No newline at end of file
+        by_name = {}
+        by_id = {}
+        wanted = self._wanted_fields
+        for customfield in item.iter('customfield'):
+            name_elem = customfield.find('customfieldname')
+            name = name_elem.text if name_elem is not None else None
+            field_id = customfield.get('id')
+            wanted_name = name in wanted and name not in by_name
+            wanted_id = field_id in wanted and field_id not in by_id
+            if not (wanted_name or wanted_id):
+                continue
+            value_elem = customfield.find('.//customfieldvalue')
+            if value_elem is None:
+                continue
+            if wanted_name:
+                by_name[name] = value_elem.text
+            if wanted_id:
+                by_id[field_id] = value_elem.text
+        return by_name, by_id
+
+
+def resolve_engine(engine='auto'):
+    """
+    Determina el motor de parsing a usar.
+
+    Args:
+        engine (str): 'auto', 'etree' o 'lxml'
+
+    Returns:
+        str: 'lxml' o 'etree'
+
+    Raises:
+        ValueError: Si el motor no existe
+        ImportError: Si se pide 'lxml' y no está instalado
+    """
+    if engine not in PARSER_ENGINES:
+        raise ValueError(
+            f"Motor de parsing no soportado: {engine} "
+            f"(disponibles: {', '.join(PARSER_ENGINES)})"
+        )
+    if engine == 'etree':
+        return engine
+    try:
+        importlib.import_module('lxml.etree')
+    except ImportError:
+        if engine == 'lxml':
+            raise ImportError(
+                "El motor lxml requiere lxml: pip install lxml"
+            )
+        return 'etree'
+    return 'lxml'
+
+def _engine_parser(engine):
+    """
+    Obtiene la función de parsing y la excepción de error de un motor.
+
+    Args:
+        engine (str): 'lxml' o 'etree'
+
+    Returns:
+        tuple: (función texto XML -> elemento raíz, clase de excepción)
+    """
+    if engine == 'etree':
+        return ET.fromstring, ET.ParseError
+    lxml_etree = importlib.import_module('lxml.etree')
+    # Sin resolución de entidades externas ni red; huge_tree admite textos
+    # muy largos (descripciones con imágenes embebidas)
+    parser = lxml_etree.XMLParser(
+        huge_tree=True, resolve_entities=False, no_network=True
+    )
+    return (
+        lambda content: lxml_etree.fromstring(content, parser),
+        lxml_etree.XMLSyntaxError
+    )
+
+def _split_items(data, chunk_size):
+    """
+    Recorre un buffer en lotes de elementos <item> completos.
+
+    Lo que queda entre lotes (cabecera del canal, separación y cierre del
+    documento) se comprueba con DocumentOutline; lo que hay entre items de
+    un mismo lote se parsea junto con el lote. El error de estructura se
+    lanza después del último lote.
+
+    Args:
+        data (bytes/mmap.mmap): Contenido del XML
+        chunk_size (int): Tamaño aproximado de cada lote
+
+    Yields:
+        tuple: (Lote de bytes, offset del final del lote en `data`)
+
+    Raises:
+        XMLParseError: Si el último <item> no está cerrado, o el documento
+            está truncado, no es XML o no es un export de Jira
+    """
+    outline = DocumentOutline()
+    position = 0
+    try:
+        while True:
+            start = data.find(b'<item>', position)
+            if start == -1:
+                break
+            end = data.find(b'</item>', start + chunk_size)
+            if end == -1:
+                end = data.rfind(b'</item>', start)
+            if end == -1:
+                raise XMLParseError("Error parsing XML: unclosed <item> element")
+            outline.feed(data[position:start], position)
+            position = end + len(b'</item>')
+            yield data[start:position], position
+        outline.feed(data[position:], position)
+        outline.close()
+    except ValueError as e:
+        raise XMLParseError(f"Error parsing XML: {str(e)}")
+
+def _release_pages(data, released, position):
+    """
+    Libera de la memoria del proceso las páginas del mmap ya consumidas.
+
+    Las páginas leídas de un mapeo de archivo cuentan en el RSS del proceso
+    hasta que se descartan; sin esto, recorrer un archivo grande acaba
+    reportando su tamaño completo como memoria usada.
+
+    Args:
+        data (mmap.mmap): Archivo mapeado
+        released (int): Offset hasta el que ya se liberaron páginas
+        position (int): Offset hasta el que se consumió el archivo
+
+    Returns:
+        int: Nuevo offset liberado (múltiplo del tamaño de página)
+    """
+    upto = position - position % mmap.PAGESIZE
+    if upto > released and hasattr(mmap, 'MADV_DONTNEED'):
+        data.madvise(mmap.MADV_DONTNEED, released, upto - released)
+        return upto
+    return released
+
+# Parser de cada proceso hijo del modo paralelo
+_chunk_parser = None
+
+def _init_chunk_worker(custom_fields, item_filter, columns=None, engine='auto',
+                       children=None, schema=None):
+    """
+    Crea el parser de un proceso hijo una sola vez.
+
+    Args:
+        custom_fields (dict): Configuración de campos personalizados
+        item_filter (callable): Filtro de items (o None)
+        columns (list, optional): Columnas a generar
+        engine (str, optional): Motor de parsing
+        children (list, optional): Tablas hijas a extraer
+        schema (list, optional): Esquema de columnas
+    """
+    global _chunk_parser
+    _chunk_parser = XMLParser(
+        custom_fields, item_filter, columns, engine, children, schema
+    )
+
+def _parse_item_chunk(chunk):
+    """
+    Procesa un lote de items en un proceso hijo.
+
+    Args:
+        chunk (bytes): Lote de elementos <item> completos
+
+    Returns:
+        tuple: (Lista de diccionarios con datos procesados, Lista de links,
+            filas hijas del lote como las de take_child_rows)
+    """
+    items, links = _chunk_parser._parse_chunk(chunk)
+    return items, links, _chunk_parser.take_child_rows()
@@ -0,0 +1,59 @@
+import pytest
+from benchmarks.synthetic import write_export
+from benchmarks.run_benchmarks import STAGES, run_pipeline, compare_results
+from benchmarks.import_time import main as import_time_main, measure_import
+from src.utils.xml_parser import XMLParser
+
+class TestSyntheticExport:
+    @pytest.fixture
+    def export_path(self, tmp_path):
+        """Fixture con un export sintético pequeño."""
+        path = tmp_path / "export.xml"
+        write_export(str(path), 25, custom_fields=30, comments=3,
+                     description_size=500)
+        return path
+
+    def test_generated_export_parses(self, export_path):
+        """El export sintético se parsea con los campos esperados."""
+        items, links = XMLParser().parse_file(str(export_path))
+        assert len(items) == 25
+        assert items[0]['Código'] == 'BENCH-25'
+        assert links[-1].endswith('BENCH-1')
+        assert all(item['Empresa'] for item in items)
+        assert all(item['Horas Utilizadas'] > 0 for item in items)
+
+    def test_generated_export_is_deterministic(self, export_path, tmp_path):
+        """La misma semilla genera el mismo archivo."""
+        other = tmp_path / "other.xml"
+        write_export(str(other), 25, custom_fields=30, comments=3,
+                     description_size=500)
+        assert other.read_bytes() == export_path.read_bytes()
+
+    def test_run_pipeline(self, export_path, tmp_path):
+        """El harness mide todas las etapas y permite comparar ejecuciones."""
+        result = run_pipeline(str(export_path), str(tmp_path))
+        assert result['items'] == 25
+        assert list(result['stages']) == list(STAGES)
+        current = {'runs': [dict(result, issues=25)]}
+        slower = {'runs': [dict(result, issues=25, stages={
+            name: dict(stage, seconds=stage['seconds'] * 10 + 1)
+            for name, stage in result['stages'].items()
+        })]}
+        assert not any(row[-1] for row in compare_results(current, current))
+        assert all(row[-1] for row in compare_results(slower, current))
+
+
+class TestImportTime:
+    @pytest.mark.parametrize("module", ["src", "src.cli"])
+    def test_no_heavy_imports(self, module):
+        """Importar los puntos de entrada no carga pandas, openpyxl ni tkinter."""
+        result = measure_import(module, repeat=1)
+        assert result['heavy'] == []
+        assert result['ms'] > 0
+
+    def test_budget(self):
+        """El benchmark falla si la importación supera el presupuesto."""
+        assert import_time_main(["src.cli", "--repeat", "1",
+                                 "--budget", "100000"]) == 0
+        assert import_time_main(["src.cli", "--repeat", "1",
+                                 "--budget", "0"]) == 1
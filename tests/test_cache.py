@@ -0,0 +1,57 @@
+import os
+import shutil
+import pytest
+from src.converter import JiraXMLConverter
+from src.utils.cache import ParseCache
+from src.utils.xml_parser import XMLParser
+
+class TestParseCache:
+    @pytest.fixture
+    def export_path(self, tmp_path):
+        """Fixture con una copia del export de ejemplo."""
+        source = os.path.join('examples', 'sample_xml', 'export-activities.xml')
+        path = tmp_path / "export.xml"
+        shutil.copy(source, path)
+        return str(path)
+
+    def test_key_depends_on_content_and_config(self, export_path, tmp_path):
+        """La clave depende del contenido y de la configuración, no de la ruta."""
+        cache = ParseCache(str(tmp_path / "cache"))
+        copy_path = str(tmp_path / "copia.xml")
+        shutil.copy(export_path, copy_path)
+        key = cache.key(export_path, XMLParser())
+        assert cache.key(copy_path, XMLParser()) == key
+        assert cache.key(export_path, XMLParser({'Empresa': 'text'})) != key
+        with open(copy_path, 'a', encoding='utf-8') as file:
+            file.write('\n')
+        assert cache.key(copy_path, XMLParser()) != key
+
+    def test_repeat_conversion_skips_parsing(self, export_path, tmp_path, monkeypatch):
+        """La segunda conversión del mismo contenido no parsea el XML."""
+        cache = ParseCache(str(tmp_path / "cache"))
+        converter = JiraXMLConverter(gui=False)
+        converter.convert(export_path, str(tmp_path / "a.csv"),
+                          output_format='csv', cache=cache)
+        assert 'parse' in converter.last_report.stages
+
+        def fail(*args, **kwargs):
+            raise AssertionError("no debe parsear")
+        monkeypatch.setattr(XMLParser, 'iter_file', fail)
+        converter.convert(export_path, str(tmp_path / "b.xlsx"), cache=cache)
+        assert 'parse' not in converter.last_report.stages
+        assert converter.last_report.stages['cache']['items'] == 39
+        assert (tmp_path / "b.xlsx").exists()
+
+    def test_lru_eviction(self, export_path, tmp_path):
+        """Al superar el tamaño máximo se elimina la entrada menos usada."""
+        cache = ParseCache(str(tmp_path / "cache"))
+        df = XMLParser().to_dataframe(XMLParser().parse_file(export_path)[0])
+        cache.put('a', df, [])
+        size = os.path.getsize(cache._path('a'))
+        cache.put('b', df, [])
+        os.utime(cache._path('a'), (1, 1))
+        os.utime(cache._path('b'), (2, 2))
+        assert cache.get('a') is not None
+        cache.max_bytes = size * 2
+        cache.put('c', df, [])
+        assert sorted(os.listdir(cache.directory)) == ['a.pkl', 'c.pkl']
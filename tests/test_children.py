@@ -0,0 +1,136 @@
+import pytest
+import pandas as pd
+from openpyxl import load_workbook
+from src.cli import main
+from src.converter import JiraXMLConverter
+from src.utils.columns import ColumnStore
+from src.utils.xml_parser import XMLParser
+
+CHILDREN = ['worklogs', 'comments', 'links', 'subtasks']
+
+ITEM_WITH_CHILDREN = """
+<item><link>https://jira.company.com/browse/T-1</link><key>T-1</key>
+<status>Done</status><summary>uno</summary>
+<issuelinks><issuelinktype id="1"><name>Blocks</name>
+<outwardlinks description="blocks"><issuelink><issuekey>T-2</issuekey></issuelink></outwardlinks>
+<inwardlinks description="is blocked by"><issuelink><issuekey>T-3</issuekey></issuelink></inwardlinks>
+</issuelinktype></issuelinks>
+<subtasks><subtask id="9">T-9</subtask></subtasks>
+<comments>
+<comment id="10" author="ana" created="Thu, 6 Feb 2025 10:30:00 -0500">&lt;p&gt;Hola &amp;amp; adiós&lt;/p&gt;</comment>
+<comment id="11" author="luis" created="Fri, 7 Feb 2025 11:00:00 -0500">Listo</comment>
+</comments>
+<worklogs><worklog><id>5</id><author>ana</author>
+<started>2025-02-06T08:15:00.000-0500</started>
+<timeSpentSeconds>5400</timeSpentSeconds><comment>revisión</comment></worklog></worklogs>
+</item>
+"""
+
+ITEM_WITHOUT_CHILDREN = """
+<item><link>https://jira.company.com/browse/T-2</link><key>T-2</key>
+<status>Open</status><summary>dos</summary></item>
+"""
+
+class TestChildTables:
+    @pytest.fixture
+    def export_path(self, tmp_path):
+        """Fixture con un export cuyos items tienen elementos hijos."""
+        path = tmp_path / "export.xml"
+        path.write_text(
+            "<rss><channel>" + ITEM_WITH_CHILDREN + ITEM_WITHOUT_CHILDREN
+            + "</channel></rss>",
+            encoding="utf-8"
+        )
+        return str(path)
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_child_frames(self, export_path, workers):
+        """Las tablas hijas se extraen en la misma pasada, en serie o en paralelo."""
+        parser = XMLParser(children=CHILDREN)
+        items = list(parser.iter_file(export_path, workers))
+        frames = parser.to_child_frames()
+
+        assert len(items) == 2
+        assert list(frames) == CHILDREN
+        worklogs = frames['worklogs']
+        assert worklogs.iloc[0]['Horas Utilizadas'] == 1.5
+        assert worklogs.iloc[0]['Hora Inicio'] == '08:15:00'
+        assert worklogs.iloc[0]['Fecha Inicio'] == pd.Timestamp('2025-02-06')
+        comments = frames['comments']
+        assert list(comments['Comentario']) == ['Hola & adiós', 'Listo']
+        assert list(comments['Hora Creación']) == ['10:30:00', '11:00:00']
+        links = frames['links']
+        assert list(links['Relación']) == ['blocks', 'is blocked by']
+        assert list(links['Tarea Vinculada']) == ['T-2', 'T-3']
+        assert list(frames['subtasks']['Subtarea']) == ['T-9']
+        for df in frames.values():
+            assert set(df['Código']) == {'T-1'}
+
+    def test_empty_tables_keep_columns(self, tmp_path):
+        """Una tabla sin filas conserva sus columnas."""
+        path = tmp_path / "export.xml"
+        path.write_text(
+            "<rss><channel>" + ITEM_WITHOUT_CHILDREN + "</channel></rss>",
+            encoding="utf-8"
+        )
+        parser = XMLParser(children=['worklogs'])
+        list(parser.iter_file(str(path)))
+        df = parser.to_child_frames()['worklogs']
+        assert df.empty
+        assert 'Horas Utilizadas' in df.columns
+
+    def test_unknown_table(self):
+        """Una tabla hija desconocida es un error."""
+        with pytest.raises(ValueError, match="Tablas hijas desconocidas"):
+            XMLParser(children=['attachments'])
+
+    def test_xlsx_sheets(self, export_path, tmp_path):
+        """En xlsx cada tabla hija es una hoja adicional."""
+        output_path = tmp_path / "out.xlsx"
+        JiraXMLConverter(gui=False).convert(
+            export_path, str(output_path), children=['comments', 'links']
+        )
+        workbook = load_workbook(output_path)
+        assert workbook.sheetnames == ['Tareas', 'Comentarios', 'Vínculos']
+        assert workbook['Comentarios'].max_row == 3
+
+    def test_csv_files(self, export_path, tmp_path):
+        """En los demás formatos cada tabla hija es un archivo aparte."""
+        output_dir = tmp_path / "out"
+        output_dir.mkdir()
+        assert main([export_path, "-o", str(output_dir), "-f", "csv",
+                     "--children", "subtasks", "comments", "-q"]) == 0
+        subtasks = pd.read_csv(output_dir / "export_subtasks.csv")
+        assert list(subtasks['Subtarea']) == ['T-9']
+        comments = pd.read_csv(output_dir / "export_comments.csv")
+        assert len(comments) == 2
+
+    def test_merge_children(self, export_path, tmp_path):
+        """Al combinar, las filas hijas son las de los items elegidos."""
+        newer = tmp_path / "newer.xml"
+        newer.write_text(
+            "<rss><channel>" + ITEM_WITH_CHILDREN.replace(
+                "<summary>uno</summary>",
+                "<summary>uno</summary><updated>Sat, 8 Feb 2025 09:00:00 -0500</updated>"
+            ).replace("<subtask id=\"9\">T-9</subtask>", "")
+            + "</channel></rss>",
+            encoding="utf-8"
+        )
+        output_path = tmp_path / "merged.csv"
+        JiraXMLConverter(gui=False).merge(
+            [export_path, str(newer)], str(output_path),
+            output_format="csv", workers=1, children=['subtasks', 'comments']
+        )
+        assert pd.read_csv(tmp_path / "merged_subtasks.csv").empty
+        assert len(pd.read_csv(tmp_path / "merged_comments.csv")) == 2
+
+    def test_column_store_extend(self):
+        """extend traduce los códigos de las columnas categóricas."""
+        first = ColumnStore.from_items([{'Tipo': 'Bug', 'N': 'a'}])
+        second = ColumnStore.from_items(
+            [{'Tipo': 'Task', 'N': 'b'}, {'Tipo': 'Bug', 'N': 'c'}]
+        )
+        first.extend(second)
+        df = first.to_dataframe()
+        assert list(df['Tipo']) == ['Bug', 'Task', 'Bug']
+        assert list(df['N']) == ['a', 'b', 'c']
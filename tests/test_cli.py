@@ -0,0 +1,159 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import pytest
+import pandas as pd
+from src.cli import main, collect_inputs
+
+class TestCLI:
+    @pytest.fixture
+    def export_dir(self, tmp_path):
+        """Fixture con un directorio que contiene dos exports."""
+        source = os.path.join('examples', 'sample_xml', 'export-activities.xml')
+        shutil.copy(source, tmp_path / "a.xml")
+        shutil.copy(os.path.join('tests', 'data', 'sample.xml'), tmp_path / "b.xml")
+        (tmp_path / "notes.txt").write_text("ignorar")
+        return tmp_path
+
+    def test_collect_inputs(self, export_dir):
+        """Los directorios se expanden a sus archivos .xml."""
+        files = collect_inputs([str(export_dir), str(export_dir / "a.xml")])
+        assert [os.path.basename(f) for f in files] == ["a.xml", "b.xml"]
+
+    def test_convert_directory(self, export_dir, tmp_path):
+        """Se convierte cada archivo del directorio al directorio de salida."""
+        output_dir = tmp_path / "out"
+        assert main([str(export_dir), "-o", str(output_dir), "-q"]) == 0
+        assert sorted(os.listdir(output_dir)) == ["a.xlsx", "b.xlsx"]
+
+    @pytest.fixture
+    def sibling_exports(self, tmp_path):
+        """Fixture con dos export.xml distintos en directorios hermanos."""
+        exports = tmp_path / "exports"
+        for name, source in (
+            ("a", os.path.join('examples', 'sample_xml', 'export-activities.xml')),
+            ("b", os.path.join('tests', 'data', 'sample.xml')),
+        ):
+            (exports / name).mkdir(parents=True)
+            shutil.copy(source, exports / name / "export.xml")
+        return exports
+
+    def test_recursive_keeps_subpaths(self, sibling_exports, tmp_path):
+        """Los archivos con el mismo nombre conservan su subruta en --output."""
+        output_dir = tmp_path / "out"
+        assert main([str(sibling_exports), "-r", "-o", str(output_dir),
+                     "-f", "csv", "-q"]) == 0
+        lengths = {
+            name: len(pd.read_csv(output_dir / name / "export.csv"))
+            for name in ("a", "b")
+        }
+        assert lengths["a"] == 39 and lengths["b"] != 39
+
+    def test_state_per_input_path(self, sibling_exports, tmp_path):
+        """Dos exports con el mismo nombre no comparten el estado incremental."""
+        output_dir = tmp_path / "out"
+        state_dir = tmp_path / "state"
+        expected = {}
+        for run in range(2):
+            assert main([str(sibling_exports), "-r", "-o", str(output_dir),
+                         "-f", "csv", "--state-dir", str(state_dir),
+                         "-q"]) == 0
+            for name in ("a", "b"):
+                df = pd.read_csv(output_dir / name / "export.csv")
+                expected.setdefault(name, set(df["Código"]))
+                assert set(df["Código"]) == expected[name]
+        assert expected["a"] != expected["b"]
+        assert len([name for name in os.listdir(state_dir)
+                    if name.endswith(".state.json")]) == 2
+
+    def test_state_dir_requires_columns(self, export_dir, tmp_path, capsys):
+        """--state-dir sin las columnas del estado se rechaza antes de convertir."""
+        output_path = tmp_path / "out.csv"
+        assert main([str(export_dir / "a.xml"), "-o", str(output_path),
+                     "-f", "csv", "--columns", "Código", "Estado",
+                     "--state-dir", str(tmp_path / "state")]) == 2
+        assert "Fecha Actualización" in capsys.readouterr().err
+        assert not output_path.exists()
+
+    def test_duplicate_outputs(self, sibling_exports, tmp_path, capsys):
+        """Dos entradas que generarían la misma salida se rechazan."""
+        output_dir = tmp_path / "out"
+        assert main([str(sibling_exports / "a" / "export.xml"),
+                     str(sibling_exports / "b" / "export.xml"),
+                     "-o", str(output_dir), "-q"]) == 2
+        assert "misma salida" in capsys.readouterr().err
+        assert not os.listdir(output_dir)
+
+    def test_convert_single_file(self, export_dir, tmp_path):
+        """Con una sola entrada, --output puede ser el archivo final."""
+        output_path = tmp_path / "final.xlsx"
+        assert main([str(export_dir / "a.xml"), "-o", str(output_path)]) == 0
+        assert output_path.exists()
+
+    def test_parallel_jobs(self, export_dir, tmp_path):
+        """La conversión de varios archivos en paralelo produce las salidas."""
+        output_dir = tmp_path / "out"
+        assert main([str(export_dir), "-o", str(output_dir), "-j", "2", "-q"]) == 0
+        assert sorted(os.listdir(output_dir)) == ["a.xlsx", "b.xlsx"]
+
+    def test_report(self, export_dir, tmp_path):
+        """Con --report se guarda un informe JSON junto a cada salida."""
+        output_dir = tmp_path / "out"
+        assert main([str(export_dir), "-o", str(output_dir), "--report", "-q"]) == 0
+        assert sorted(os.listdir(output_dir)) == [
+            "a.xlsx", "a.xlsx.report.json", "b.xlsx", "b.xlsx.report.json"
+        ]
+
+    def test_keys(self, export_dir, tmp_path):
+        """Con --keys solo se exportan las tareas indicadas."""
+        output_path = tmp_path / "subset.csv"
+        assert main([str(export_dir / "a.xml"), "-o", str(output_path),
+                     "-f", "csv", "--keys", "TD-41", "TD-2", "-q"]) == 0
+        assert list(pd.read_csv(output_path)["Código"]) == ["TD-41", "TD-2"]
+        assert (export_dir / "a.xml.idx.json").exists()
+
+    def test_keys_not_found(self, export_dir, tmp_path, capsys):
+        """Los códigos que no están en el archivo se avisan por stderr."""
+        output_path = tmp_path / "subset.csv"
+        assert main([str(export_dir / "a.xml"), "-o", str(output_path),
+                     "-f", "csv", "--keys", "TD-41", "NOPE-1", "--report"]) == 0
+        captured = capsys.readouterr()
+        assert "NOPE-1" not in captured.out
+        assert "tareas no encontradas: NOPE-1" in captured.err
+        with open(f"{output_path}.report.json", encoding="utf-8") as file:
+            assert json.load(file)["missing_keys"] == ["NOPE-1"]
+
+    def test_selection_and_columns(self, export_dir, tmp_path):
+        """Los filtros y la proyección de columnas se aplican a la salida."""
+        output_path = tmp_path / "finalizadas.csv"
+        assert main([str(export_dir / "a.xml"), "-o", str(output_path),
+                     "-f", "csv", "--status", "En proceso",
+                     "--columns", "Código", "Estado", "-q"]) == 0
+        df = pd.read_csv(output_path)
+        assert list(df.columns) == ["Código", "Estado", "Enlace"]
+        assert set(df["Estado"]) == {"En proceso"} and len(df) == 3
+
+    def test_invalid_date(self, export_dir):
+        """Una fecha con formato inválido produce código de salida 2."""
+        assert main([str(export_dir), "--updated-from", "01/02/2025"]) == 2
+
+    def test_failures_exit_code(self, export_dir, tmp_path):
+        """Un archivo inválido produce código de salida 1."""
+        (export_dir / "broken.xml").write_text("<rss><channel>")
+        assert main([str(export_dir), "-o", str(tmp_path / "out"), "-q"]) == 1
+
+    def test_missing_input(self):
+        """Una entrada inexistente produce código de salida 2."""
+        assert main(["no_existe.xml"]) == 2
+
+    def test_does_not_import_tkinter(self, export_dir, tmp_path):
+        """La línea de comandos no importa tkinter."""
+        code = (
+            "import sys; from src.cli import main; "
+            f"main([{str(export_dir / 'a.xml')!r}, '-o', "
+            f"{str(tmp_path / 'x.xlsx')!r}, '-q']); "
+            "assert 'tkinter' not in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,34 @@
+import pandas as pd
+from src.utils.columns import ColumnStore
+
+class TestColumnStore:
+    ITEMS = [
+        {'Código': 'T-1', 'Estado': 'Done', 'Horas Utilizadas': 1.5},
+        {'Código': 'T-2', 'Estado': 'To Do', 'Horas Utilizadas': 0.0},
+        {'Código': 'T-3', 'Estado': 'Done', 'Horas Utilizadas': 2.0},
+        {'Código': 'T-4', 'Estado': None, 'Horas Utilizadas': 3.0},
+    ]
+
+    def test_matches_row_dataframe(self):
+        """El DataFrame por columnas tiene los mismos valores que por filas."""
+        df = ColumnStore.from_items(self.ITEMS).to_dataframe()
+        expected = pd.DataFrame(self.ITEMS)
+        assert list(df.columns) == list(expected.columns)
+        assert len(df) == 4
+        assert df['Código'].tolist() == expected['Código'].tolist()
+        assert df['Horas Utilizadas'].tolist() == [1.5, 0.0, 2.0, 3.0]
+        assert df['Estado'].tolist()[:3] == ['Done', 'To Do', 'Done']
+        assert pd.isna(df['Estado'][3])
+
+    def test_column_types(self):
+        """Las columnas se construyen con su tipo nativo."""
+        df = ColumnStore.from_items(self.ITEMS).to_dataframe()
+        assert isinstance(df['Estado'].dtype, pd.CategoricalDtype)
+        assert list(df['Estado'].cat.categories) == ['Done', 'To Do']
+        assert df['Horas Utilizadas'].dtype == 'float64'
+
+    def test_empty_store(self):
+        """Un almacén vacío produce un DataFrame vacío."""
+        store = ColumnStore()
+        assert len(store) == 0
+        assert store.to_dataframe().empty
@@ -0,0 +1,33 @@
+import pandas as pd
+from src.utils.data_handler import DataHandler
+
+class TestDataHandler:
+    DATES = [
+        "Wed, 5 Feb 2025 12:30:00 -0500",
+        "Tue, 11 Feb 2025 00:00:00 +0000",
+        "2025-02-05 10:00:01",
+        "Invalid Date",
+        "",
+        None,
+    ]
+
+    def test_parse_jira_date(self):
+        """Prueba la conversión de fechas de Jira."""
+        assert DataHandler.parse_jira_date(self.DATES[0]) == ("05/02/2025", "12:30:00")
+        assert DataHandler.parse_jira_date("Invalid Date") == ("", "")
+
+    def test_parse_jira_dates_matches_scalar(self):
+        """La conversión vectorizada coincide con la conversión por valor."""
+        dates = DataHandler.parse_jira_dates(self.DATES)
+        expected = [DataHandler.parse_jira_date(value) for value in self.DATES]
+        converted = [
+            ("", "") if pd.isna(value)
+            else (value.strftime("%d/%m/%Y"), value.strftime("%H:%M:%S"))
+            for value in dates
+        ]
+        assert converted == expected
+
+    def test_parse_jira_dates_keeps_local_time(self):
+        """Se conserva la hora local del texto, sin convertir a UTC."""
+        dates = DataHandler.parse_jira_dates(["Wed, 5 Feb 2025 23:30:00 -0500"])
+        assert dates[0] == pd.Timestamp(2025, 2, 5, 23, 30)
@@ -0,0 +1,77 @@
+import os
+import pytest
+import pandas as pd
+from src.converter import JiraXMLConverter
+from src.utils.delta import DeltaState
+from src.utils.writers import LINK_COLUMN
+from src.utils.xml_parser import XMLParser
+
+class TestDeltaState:
+    @pytest.fixture
+    def export_path(self, tmp_path):
+        """Fixture con una copia del export de ejemplo."""
+        source = os.path.join('examples', 'sample_xml', 'export-activities.xml')
+        path = tmp_path / "export.xml"
+        path.write_bytes(open(source, 'rb').read())
+        return path
+
+    def _convert(self, export_path, tmp_path):
+        """Convierte en modo incremental y devuelve el CSV generado."""
+        output_path = tmp_path / "out.csv"
+        state = DeltaState(str(tmp_path / "state" / "export"))
+        JiraXMLConverter(gui=False).convert(
+            str(export_path), str(output_path),
+            output_format='csv', delta_state=state
+        )
+        return pd.read_csv(output_path), state
+
+    def test_first_run_processes_everything(self, export_path, tmp_path):
+        """Sin estado previo se procesan todos los items y se guarda el índice."""
+        df, state = self._convert(export_path, tmp_path)
+        assert len(df) == 39
+        assert len(state.updated) == 39
+        assert state.updated['TD-41'] == '2025-02-11T18:24:35'
+        assert os.path.exists(state.rows_path)
+
+    def test_unchanged_items_are_skipped(self, export_path, tmp_path, monkeypatch):
+        """En la segunda ejecución solo se procesan los items modificados."""
+        self._convert(export_path, tmp_path)
+        content = export_path.read_text(encoding='utf-8')
+        content = content.replace(
+            "<updated>Tue, 11 Feb 2025 18:24:35 -0500</updated>",
+            "<updated>Wed, 12 Feb 2025 09:00:00 -0500</updated>", 1
+        ).replace(
+            "<summary>Quipu - Contabilidad", "<summary>Cambiado - Contabilidad", 1
+        )
+        export_path.write_text(content, encoding='utf-8')
+
+        processed = []
+        original = XMLParser._process_single_item
+        def spy(parser, item):
+            processed.append(item.findtext('key'))
+            return original(parser, item)
+        monkeypatch.setattr(
+            'src.utils.xml_parser.XMLParser._process_single_item', spy
+        )
+
+        df, state = self._convert(export_path, tmp_path)
+        assert processed == ['TD-41']
+        assert len(df) == 39
+        assert df['Código'][0] == 'TD-41'
+        assert df['Resumen'][0].startswith('Cambiado')
+        assert df[LINK_COLUMN][0].endswith('TD-41')
+        assert state.updated['TD-41'] == '2025-02-12T09:00:00'
+        assert df['Código'].is_unique
+
+    def test_missing_state_columns(self, export_path, tmp_path):
+        """Sin las columnas del estado se falla antes de escribir la salida."""
+        output_path = tmp_path / "out.csv"
+        state = DeltaState(str(tmp_path / "state" / "export"))
+        with pytest.raises(ValueError, match="Hora Actualización"):
+            JiraXMLConverter(gui=False).convert(
+                str(export_path), str(output_path), output_format='csv',
+                delta_state=state,
+                columns=['Código', 'Fecha Actualización']
+            )
+        assert not output_path.exists()
+        assert not os.path.exists(state.state_path)
@@ -0,0 +1,152 @@
+import os
+import pytest
+import pandas as pd
+from openpyxl import load_workbook
+from src.utils.xml_parser import XMLParser
+from src.utils.excel_formatter import (
+    ExcelFormatter, INDEX_SHEET, MAX_COLUMN_WIDTH, estimate_column_widths
+)
+
+class TestExcelFormatter:
+    @pytest.fixture
+    def parsed_items(self):
+        """Fixture que proporciona los items del export de ejemplo."""
+        parser = XMLParser()
+        items, links = parser.parse_file(
+            os.path.join('examples', 'sample_xml', 'export-activities.xml')
+        )
+        return parser.to_dataframe(items), links
+
+    @pytest.fixture
+    def workbook(self, parsed_items, tmp_path):
+        """Fixture que genera el Excel del export de ejemplo."""
+        df, links = parsed_items
+        output_path = tmp_path / "output.xlsx"
+        formatter = ExcelFormatter(df, str(output_path), links)
+        assert formatter.format_excel()
+        return load_workbook(output_path)
+
+    def test_single_sheet(self, workbook, parsed_items):
+        """Se genera la hoja 'Tareas' con cabecera y una fila por item."""
+        assert workbook.sheetnames == ['Tareas']
+        worksheet = workbook['Tareas']
+        assert worksheet.max_row == len(parsed_items[0]) + 1
+        assert worksheet.cell(row=1, column=1).value == 'Código'
+
+    def test_hyperlinks(self, workbook, parsed_items):
+        """El código de tarea se escribe con su hipervínculo."""
+        cell = workbook['Tareas'].cell(row=2, column=1)
+        assert cell.value == parsed_items[0]['Código'][0]
+        assert cell.hyperlink.target == parsed_items[1][0]
+        assert cell.font.underline == "single"
+
+    def test_hyperlinks_follow_key_column(self, parsed_items, tmp_path):
+        """El enlace va en Código aunque no sea la primera columna."""
+        df, links = parsed_items
+        output_path = tmp_path / "output.xlsx"
+        ExcelFormatter(df[['Estado', 'Código', 'Resumen']], str(output_path),
+                       links).format_excel()
+        worksheet = load_workbook(output_path)['Tareas']
+        assert worksheet.cell(row=2, column=1).hyperlink is None
+        assert worksheet.cell(row=2, column=2).hyperlink.target == links[0]
+
+        ExcelFormatter(df[['Estado', 'Resumen']], str(output_path),
+                       links).format_excel()
+        worksheet = load_workbook(output_path)['Tareas']
+        assert all(cell.hyperlink is None for cell in worksheet[2])
+
+    def test_number_formats(self, workbook):
+        """Horas y fechas se escriben con su formato numérico."""
+        worksheet = workbook['Tareas']
+        header = [cell.value for cell in worksheet[1]]
+        horas = worksheet.cell(row=2, column=header.index('Horas Utilizadas') + 1)
+        fecha = worksheet.cell(row=2, column=header.index('Fecha Creación') + 1)
+        assert horas.number_format == '#,##0.0'
+        assert fecha.number_format == 'dd/mm/yyyy'
+        assert fecha.is_date
+
+
+class TestExcelFormatterSharding:
+    @pytest.fixture
+    def parsed(self):
+        """Fixture que proporciona el DataFrame y los links del ejemplo."""
+        parser = XMLParser()
+        items, links = parser.parse_file(
+            os.path.join('examples', 'sample_xml', 'export-activities.xml')
+        )
+        return parser.to_dataframe(items), links
+
+    def test_shard_sheets(self, parsed, tmp_path):
+        """Las filas se reparten en hojas con un índice enlazado."""
+        df, links = parsed
+        output_path = tmp_path / "output.xlsx"
+        assert ExcelFormatter(df, str(output_path), links, max_rows=10).format_excel()
+        workbook = load_workbook(output_path)
+        assert workbook.sheetnames == [
+            INDEX_SHEET, 'Tareas 1', 'Tareas 2', 'Tareas 3', 'Tareas 4'
+        ]
+        assert [workbook[f'Tareas {n}'].max_row for n in range(1, 5)] == [11, 11, 11, 10]
+        index = workbook[INDEX_SHEET]
+        assert index.cell(row=2, column=1).hyperlink.location == "'Tareas 1'!A1"
+        assert index.cell(row=5, column=4).value == 9
+        assert workbook['Tareas 2'].cell(row=2, column=1).hyperlink.target == links[10]
+
+    def test_shard_files(self, parsed, tmp_path):
+        """Con shard_mode='files' cada parte es un libro y el índice los enlaza."""
+        df, links = parsed
+        output_path = tmp_path / "output.xlsx"
+        formatter = ExcelFormatter(
+            df, str(output_path), links,
+            max_rows=20, shard_mode='files', workers=2
+        )
+        assert formatter.format_excel()
+        assert sorted(os.listdir(tmp_path)) == [
+            "output.xlsx", "output_parte_001.xlsx", "output_parte_002.xlsx"
+        ]
+        index = load_workbook(output_path)[INDEX_SHEET]
+        assert index.cell(row=3, column=1).hyperlink.target == "output_parte_002.xlsx"
+        part = load_workbook(tmp_path / "output_parte_002.xlsx")['Tareas']
+        assert part.max_row == 20
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_shard_files_share_widths(self, tmp_path, workers):
+        """Todas las partes usan los anchos estimados una vez para todo."""
+        df = pd.DataFrame({'Resumen': ['corto'] * 3 + ['x' * 30]})
+        output_path = tmp_path / "output.xlsx"
+        formatter = ExcelFormatter(
+            df, str(output_path), max_rows=2, shard_mode='files',
+            workers=workers
+        )
+        assert formatter.format_excel()
+        for part in ("output_parte_001.xlsx", "output_parte_002.xlsx"):
+            worksheet = load_workbook(tmp_path / part)['Tareas']
+            assert worksheet.column_dimensions['A'].width == 32
+
+class TestColumnWidths:
+    def test_estimate_by_dtype(self):
+        """Categorías, fechas y texto se miden sin convertir el DataFrame."""
+        df = pd.DataFrame({
+            'Estado': pd.Categorical(['Finalizada', 'En proceso']),
+            'Fecha': pd.to_datetime(['2025-01-01', None]),
+            'Resumen': ['corto', None],
+        })
+        assert estimate_column_widths(df) == [12, 12, 9]
+
+    def test_width_cap(self):
+        """Los textos largos no ensanchan la columna más allá del límite."""
+        df = pd.DataFrame({'Resumen': ['x' * 500]})
+        assert estimate_column_widths(df) == [MAX_COLUMN_WIDTH + 2]
+
+    def test_sample_covers_last_rows(self):
+        """La muestra de un DataFrame grande incluye filas de todo el rango."""
+        df = pd.DataFrame({'Código': ['T-1'] * 999 + ['TAREA-LARGA-1000']})
+        assert estimate_column_widths(df, sample_rows=10) == [18]
+
+    def test_more_than_26_columns(self, tmp_path):
+        """Las columnas después de la Z se direccionan con varias letras."""
+        df = pd.DataFrame({f'Columna {n}': ['x' * n] for n in range(30)})
+        output_path = tmp_path / "output.xlsx"
+        assert ExcelFormatter(df, str(output_path)).format_excel()
+        worksheet = load_workbook(output_path).active
+        assert worksheet.column_dimensions['AA'].width == 28
+        assert worksheet.column_dimensions['AD'].width == 31
@@ -0,0 +1,211 @@
+import gzip
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import pytest
+import pandas as pd
+from src.cli import main
+from src.converter import JiraXMLConverter
+from src.utils.fetcher import FetchError, JiraFetcher, parse_page_info
+from src.utils.xml_parser import XMLParser
+
+EXAMPLE = os.path.join('examples', 'sample_xml', 'export-activities.xml')
+
+SEARCH_PATH = '/sr/jira.issueviews:searchrequest-xml/temp/SearchRequest.xml'
+
+class JiraStub(ThreadingHTTPServer):
+    """Servidor que sirve el export de ejemplo como la vista XML de Jira."""
+
+    daemon_threads = True
+
+    def __init__(self, max_page=None, failures=0, fail_status=503):
+        super().__init__(('127.0.0.1', 0), JiraStubHandler)
+        with open(EXAMPLE, 'rb') as file:
+            data = file.read()
+        first = data.find(b'<item>')
+        self.head = re.sub(rb'<issue [^>]*/>', b'{header}', data[:first])
+        self.items = re.findall(rb'<item>.*?</item>', data, re.DOTALL)
+        self.max_page = max_page
+        self.failures = failures
+        self.fail_status = fail_status
+        self.requests = []
+        self.clients = set()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return (f'http://127.0.0.1:{self.server_address[1]}{SEARCH_PATH}'
+                '?jqlQuery=project+%3D+TD')
+
+    def page(self, start, size):
+        """Devuelve la página que empieza en `start`."""
+        size = min(size, self.max_page or size)
+        items = self.items[start:start + size]
+        header = (f'<issue start="{start}" end="{start + len(items)}" '
+                  f'total="{len(self.items)}"/>').encode()
+        return (self.head.replace(b'{header}', header) + b''.join(items)
+                + b'</channel></rss>')
+
+class JiraStubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        query = parse_qs(urlsplit(self.path).query)
+        with server.lock:
+            server.requests.append((query, dict(self.headers)))
+            server.clients.add(self.client_address)
+            failing = server.failures > 0
+            server.failures -= failing
+        if failing:
+            body = b'busy'
+            self.send_response(server.fail_status)
+        else:
+            body = server.page(int(query['pager/start'][0]),
+                               int(query['tempMax'][0]))
+            self.send_response(200)
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = gzip.compress(body)
+                self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestFetcher:
+    @pytest.fixture
+    def start_stub(self):
+        """Fixture que arranca servidores stub en un hilo."""
+        servers = []
+
+        def start(**options):
+            stub = JiraStub(**options)
+            threading.Thread(target=stub.serve_forever, daemon=True).start()
+            servers.append(stub)
+            return stub
+
+        yield start
+        for stub in servers:
+            stub.shutdown()
+            stub.server_close()
+
+    @staticmethod
+    def parse_pages(fetcher):
+        """Parsea las páginas a medida que llegan y devuelve los links."""
+        parser = XMLParser()
+        return [link for page in fetcher.iter_pages()
+                for _, link in parser.iter_bytes(page)]
+
+    def test_parse_page_info(self):
+        """La cabecera de paginación se lee antes del primer item."""
+        assert parse_page_info(
+            b'<rss><channel><issue start="40" end="80" total="95"/><item>'
+        ) == (40, 80, 95)
+        assert parse_page_info(b'<rss><channel><item></item>') is None
+
+    def test_fetch_all_pages(self, start_stub):
+        """Las páginas se descargan en paralelo y se entregan en orden."""
+        stub = start_stub()
+        fetcher = JiraFetcher(stub.url, page_size=10, connections=3)
+        _, expected = XMLParser().parse_file(EXAMPLE)
+        assert self.parse_pages(fetcher) == expected
+        assert fetcher.page_count == fetcher.pages_read == 4
+        starts = sorted(int(query['pager/start'][0])
+                        for query, _ in stub.requests)
+        assert starts == [0, 10, 20, 30]
+        assert all(query['jqlQuery'] == ['project = TD']
+                   for query, _ in stub.requests)
+        # Conexiones keep-alive: como mucho una por descarga simultánea
+        assert len(stub.clients) == fetcher.pool.created <= 3
+
+    def test_stop_early(self, start_stub):
+        """Si se deja de leer no se descargan las páginas pendientes."""
+        stub = start_stub()
+        fetcher = JiraFetcher(stub.url, page_size=1, connections=1)
+        pages = fetcher.iter_pages()
+        next(pages)
+        next(pages)
+        pages.close()
+        # Primera página, la entregada y como mucho una en curso
+        assert len(stub.requests) <= 3
+        assert fetcher.pages_read == 2
+
+    def test_server_page_limit(self, start_stub):
+        """Si Jira devuelve menos items que tempMax se pagina con su tamaño."""
+        stub = start_stub(max_page=15)
+        fetcher = JiraFetcher(stub.url, connections=2)
+        assert len(self.parse_pages(fetcher)) == 39
+        assert fetcher.page_count == 3
+
+    def test_retries_temporary_errors(self, start_stub):
+        """Los errores temporales se reintentan."""
+        stub = start_stub(failures=2)
+        fetcher = JiraFetcher(stub.url, page_size=20, backoff=0)
+        assert len(self.parse_pages(fetcher)) == 39
+        assert len(stub.requests) == 4
+
+    @pytest.mark.parametrize("status, requests", [(500, 2), (404, 1)])
+    def test_fetch_errors(self, start_stub, status, requests):
+        """Se agotan los reintentos o se falla sin reintentar."""
+        stub = start_stub(failures=10, fail_status=status)
+        fetcher = JiraFetcher(stub.url, retries=1, backoff=0)
+        with pytest.raises(FetchError, match=f"HTTP {status}"):
+            self.parse_pages(fetcher)
+        assert len(stub.requests) == requests
+
+    def test_rate_limit(self, start_stub):
+        """Las peticiones se espacian según el límite por segundo."""
+        stub = start_stub()
+        fetcher = JiraFetcher(stub.url, page_size=10, connections=4, rate=20)
+        start = time.monotonic()
+        self.parse_pages(fetcher)
+        assert time.monotonic() - start >= 3 / 20
+
+    def test_convert_matches_file(self, start_stub, tmp_path):
+        """La búsqueda descargada genera la misma salida que el archivo."""
+        stub = start_stub()
+        converter = JiraXMLConverter(gui=False)
+        from_file = converter.convert(
+            EXAMPLE, str(tmp_path / "file.csv"), output_format='csv'
+        )
+        fetched = converter.fetch(
+            JiraFetcher(stub.url, page_size=7), str(tmp_path / "url.csv"),
+            output_format='csv', children=['worklogs']
+        )
+        pd.testing.assert_frame_equal(pd.read_csv(fetched),
+                                      pd.read_csv(from_file))
+        assert os.path.isfile(tmp_path / "url_worklogs.csv")
+        stage = converter.last_report.stages['fetch']
+        assert stage['items'] == 39
+        assert stage['bytes_read'] > os.path.getsize(EXAMPLE)
+
+    def test_overlapping_pages(self, start_stub, tmp_path):
+        """Una tarea repetida entre páginas aparece una sola vez."""
+        stub = start_stub()
+        # La segunda página repite el último item de la primera
+        stub.items.insert(10, stub.items[9])
+        output_path = JiraXMLConverter(gui=False).fetch(
+            JiraFetcher(stub.url, page_size=10), str(tmp_path / "out.csv"),
+            output_format='csv'
+        )
+        df = pd.read_csv(output_path)
+        assert len(df) == 39
+        assert df['Código'].is_unique
+
+    def test_cli_url(self, start_stub, tmp_path, monkeypatch):
+        """Una URL como entrada descarga la búsqueda con el token del entorno."""
+        stub = start_stub()
+        monkeypatch.setenv('JIRA_TOKEN', 'secreto')
+        monkeypatch.delenv('JIRA_USER', raising=False)
+        output_path = tmp_path / "out.csv"
+        assert main([stub.url, "-o", str(output_path), "-f", "csv",
+                     "--page-size", "20", "--connections", "2", "-q"]) == 0
+        assert len(pd.read_csv(output_path)) == 39
+        assert {headers['Authorization'] for _, headers in stub.requests} == \
+            {'Bearer secreto'}
+        assert main([stub.url, "--merge", "-q"]) == 2
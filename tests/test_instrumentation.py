@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+import pytest
+from src.converter import JiraXMLConverter
+from src.utils.instrumentation import ConversionCancelled, RunReport
+
+class TestRunReport:
+    def test_stage_records_metrics(self):
+        """Cada etapa registra tiempo, items, bytes y memoria."""
+        report = RunReport()
+        with report.stage('parse', "Procesando...", 0, 50) as stage:
+            stage.advance(items=10, bytes_read=1000, fraction=1.0)
+        result = report.stages['parse']
+        assert result['items'] == 10
+        assert result['bytes_read'] == 1000
+        assert result['seconds'] >= 0
+        assert 'peak_rss_mb' in result
+        assert report.slowest_stage() == 'parse'
+
+    def test_progress_is_scaled_to_stage_range(self):
+        """El avance de la etapa se traduce a su rango de porcentajes."""
+        calls = []
+        report = RunReport(lambda value, text: calls.append(value))
+        with report.stage('parse', "Procesando...", 20, 60) as stage:
+            stage.advance(items=1, fraction=0.5)
+            stage.advance(items=1, fraction=0.5)
+            stage.advance(items=2, fraction=1.0)
+        assert calls == [20, 40, 60]
+
+class TestConverterInstrumentation:
+    @pytest.fixture
+    def example_xml_path(self):
+        return os.path.join('examples', 'sample_xml', 'export-activities.xml')
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_convert_reports_stages(self, example_xml_path, tmp_path, workers):
+        """La conversión informa el avance real y genera el informe."""
+        calls = []
+        converter = JiraXMLConverter(workers=workers, gui=False)
+        output_path = converter.convert(
+            example_xml_path, str(tmp_path / "out.csv"),
+            progress=lambda value, text: calls.append((value, text)),
+            output_format='csv'
+        )
+        values = [value for value, _ in calls]
+        assert values == sorted(values)
+        assert values[-1] == 100
+        assert any('39 items' in text for _, text in calls)
+
+        report = converter.last_report
+        assert list(report.stages) == ['parse', 'dataframe', 'write']
+        assert report.stages['parse']['items'] == 39
+        assert report.stages['parse']['bytes_read'] > 0
+
+        report_path = tmp_path / "report.json"
+        report.save(str(report_path))
+        data = json.loads(report_path.read_text(encoding='utf-8'))
+        assert data['output'] == output_path
+        assert data['slowest_stage'] in report.stages
+
+class TestCancellation:
+    @pytest.fixture
+    def example_xml_path(self):
+        return os.path.join('examples', 'sample_xml', 'export-activities.xml')
+
+    def test_stage_checks_cancellation(self):
+        """Con el evento activo, el siguiente aviso cancela la etapa."""
+        event = threading.Event()
+        report = RunReport(cancel_event=event)
+        with pytest.raises(ConversionCancelled):
+            with report.stage('parse', "Procesando...", 0, 50) as stage:
+                stage.advance(items=1, fraction=0.1)
+                event.set()
+                stage.advance(items=2, fraction=0.2)
+        assert 'parse' not in report.stages
+
+    @pytest.mark.parametrize('output_format', ['xlsx', 'csv'])
+    def test_cancel_while_writing(self, example_xml_path, tmp_path,
+                                  monkeypatch, output_format):
+        """Cancelar durante la escritura no deja un archivo incompleto."""
+        monkeypatch.setattr('src.utils.excel_formatter.PROGRESS_ROWS', 10)
+        monkeypatch.setattr('src.utils.writers.CSVWriter.chunk_rows', 10)
+        event = threading.Event()
+
+        def progress(value, text):
+            if "(10 items)" in text and value >= 75:
+                event.set()
+
+        output_path = tmp_path / f"out.{output_format}"
+        report = RunReport(progress, cancel_event=event)
+        with pytest.raises(ConversionCancelled):
+            JiraXMLConverter(gui=False).convert(
+                example_xml_path, str(output_path), report=report,
+                output_format=output_format
+            )
+        assert 'parse' in report.stages and 'write' not in report.stages
+        assert not output_path.exists()
+
+    def test_cancel_while_writing_shard_files(self, example_xml_path,
+                                              tmp_path):
+        """Cancelar en modo 'files' elimina también las partes ya escritas."""
+        event = threading.Event()
+
+        def progress(value, text):
+            if "(20 items)" in text and value >= 75:
+                event.set()
+
+        output_dir = tmp_path / "out"
+        output_dir.mkdir()
+        report = RunReport(progress, cancel_event=event)
+        with pytest.raises(ConversionCancelled):
+            JiraXMLConverter(gui=False).convert(
+                example_xml_path, str(output_dir / "out.xlsx"), report=report,
+                writer_options={'max_rows': 10, 'shard_mode': 'files'}
+            )
+        assert os.listdir(output_dir) == []
+
+    def test_cancel_while_parsing(self, example_xml_path, tmp_path, monkeypatch):
+        """Cancelar durante el parsing detiene la lectura del archivo."""
+        monkeypatch.setattr('src.utils.xml_parser.CHUNK_SIZE', 1)
+        event = threading.Event()
+        report = RunReport(
+            lambda value, text: event.set() if "(5 items)" in text else None,
+            cancel_event=event
+        )
+        converter = JiraXMLConverter(gui=False)
+        with pytest.raises(ConversionCancelled):
+            converter.convert(
+                example_xml_path, str(tmp_path / "out.csv"), report=report,
+                output_format='csv'
+            )
+        assert report.stages == {}
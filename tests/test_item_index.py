@@ -0,0 +1,82 @@
+import os
+import shutil
+import pytest
+from src.utils.item_index import ItemIndex
+from src.utils.xml_parser import XMLParser
+
+class TestItemIndex:
+    @pytest.fixture
+    def export_path(self, tmp_path):
+        """Fixture con una copia del export de ejemplo."""
+        source = os.path.join('examples', 'sample_xml', 'export-activities.xml')
+        path = tmp_path / "export.xml"
+        shutil.copy(source, path)
+        return str(path)
+
+    def test_build(self, export_path):
+        """El índice registra offset, código y actualización de cada item."""
+        index = ItemIndex.build(export_path)
+        assert len(index) == 39
+        assert index.keys[0] == 'TD-41'
+        assert index.updated[0] == 'Tue, 11 Feb 2025 18:24:35 -0500'
+        with open(export_path, 'rb') as file:
+            file.seek(index.offsets[0])
+            item = file.read(index.lengths[0])
+        assert item.startswith(b'<item>') and item.endswith(b'</item>')
+
+    def test_build_truncated_file(self, export_path):
+        """Un archivo cortado después de un </item> no se indexa."""
+        with open(export_path, 'rb') as file:
+            data = file.read()
+        with open(export_path, 'wb') as file:
+            file.write(data[:data.rfind(b'</item>', 0, len(data) // 2) + 7])
+        with pytest.raises(ValueError, match="incomplete document"):
+            ItemIndex.build(export_path)
+
+    def test_load_or_build_persists(self, export_path):
+        """El índice se guarda junto al XML y se invalida si éste cambia."""
+        ItemIndex.load_or_build(export_path)
+        assert os.path.exists(ItemIndex.default_path(export_path))
+        assert ItemIndex.load(export_path).keys[0] == 'TD-41'
+
+        with open(export_path, 'a', encoding='utf-8') as file:
+            file.write('\n')
+        assert ItemIndex.load(export_path) is None
+
+    @pytest.mark.parametrize("content", ['{"version": 2, "size"', '[]', ''])
+    def test_load_or_build_corrupt_index(self, export_path, content):
+        """Un índice cortado o corrupto se reconstruye en lugar de fallar."""
+        index_path = ItemIndex.default_path(export_path)
+        with open(index_path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        assert ItemIndex.load(export_path) is None
+        assert len(ItemIndex.load_or_build(export_path)) == 39
+        assert len(ItemIndex.load(export_path)) == 39
+
+    def test_save_failure_warns(self, export_path, tmp_path, capsys):
+        """Si el índice no se puede guardar se avisa sin escribir en stdout."""
+        index_path = str(tmp_path / "missing" / "export.idx.json")
+        with pytest.warns(RuntimeWarning, match="No se pudo guardar"):
+            index = ItemIndex.load_or_build(export_path, index_path)
+        assert len(index) == 39
+        assert capsys.readouterr().out == ''
+
+    def test_locate(self, export_path):
+        """Los items se devuelven en el orden del archivo."""
+        index = ItemIndex.build(export_path)
+        spans, missing = index.locate(['TD-2', 'TD-41', 'NOPE'])
+        assert [offset for offset, _ in spans] == sorted(
+            index.offsets[index.keys.index(key)] for key in ('TD-2', 'TD-41')
+        )
+        assert missing == ['NOPE']
+
+    def test_iter_file_with_keys(self, export_path):
+        """Solo se procesan los items seleccionados, igual que en el parsing completo."""
+        parser = XMLParser()
+        items, links = parser.parse_file(export_path)
+        expected = [(item, link) for item, link in zip(items, links)
+                    if item['Código'] in ('TD-2', 'TD-41')]
+        assert list(parser.iter_file(export_path, keys=['TD-41', 'TD-2'])) == expected
+        assert parser.missing_keys == []
+        assert list(parser.iter_file(export_path, keys=['NOPE'])) == []
+        assert parser.missing_keys == ['NOPE']
@@ -0,0 +1,101 @@
+import pytest
+import pandas as pd
+from src.cli import main
+from src.converter import JiraXMLConverter
+from src.utils.item_index import ItemIndex
+from src.utils.merge import newest_spans
+from src.utils.xml_parser import XMLParser
+
+def item(key, updated, summary):
+    """Devuelve un <item> mínimo de Jira."""
+    return (
+        f"<item><link>https://jira.company.com/browse/{key}</link>"
+        f"<key>{key}</key><status>Done</status>"
+        f"<updated>{updated}</updated><summary>{summary}</summary></item>"
+    )
+
+def export(*items):
+    """Devuelve un export XML con los items indicados."""
+    return "<rss><channel>" + "".join(items) + "</channel></rss>"
+
+class TestMerge:
+    @pytest.fixture
+    def pages(self, tmp_path):
+        """Fixture con tres páginas de export que se solapan."""
+        contents = [
+            export(
+                item("T-1", "Wed, 5 Feb 2025 09:00:00 -0500", "original"),
+                item("T-2", "Wed, 5 Feb 2025 10:00:00 -0500", "vigente"),
+            ),
+            export(
+                item("T-1", "Thu, 6 Feb 2025 09:00:00 -0500", "modificada"),
+                item("T-3", "Thu, 6 Feb 2025 11:00:00 -0500", "nueva"),
+            ),
+            export(
+                item("T-2", "Tue, 4 Feb 2025 10:00:00 -0500", "antigua"),
+            ),
+        ]
+        paths = []
+        for number, content in enumerate(contents, 1):
+            path = tmp_path / f"page{number}.xml"
+            path.write_text(content, encoding="utf-8")
+            paths.append(str(path))
+        return paths
+
+    def test_newest_spans(self, pages):
+        """Por código se elige el item con el updated más reciente."""
+        spans = newest_spans([ItemIndex.build(path) for path in pages])
+        assert [len(file_spans) for file_spans in spans] == [1, 2, 0]
+
+    def test_same_updated_keeps_last(self, tmp_path):
+        """Con la misma fecha se conserva la aparición posterior."""
+        path = tmp_path / "export.xml"
+        path.write_text(export(
+            item("T-1", "Wed, 5 Feb 2025 09:00:00 -0500", "primera"),
+            item("T-1", "Wed, 5 Feb 2025 09:00:00 -0500", "segunda"),
+        ), encoding="utf-8")
+        index = ItemIndex.build(str(path))
+        assert newest_spans([index]) == [[(index.offsets[1], index.lengths[1])]]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_merge(self, pages, tmp_path, workers):
+        """La salida contiene cada tarea una vez, en su versión más reciente."""
+        output_path = tmp_path / "merged.csv"
+        converter = JiraXMLConverter(gui=False)
+        converter.merge(
+            pages, str(output_path), output_format="csv", workers=workers
+        )
+        df = pd.read_csv(output_path)
+        assert list(df["Código"]) == ["T-2", "T-1", "T-3"]
+        assert list(df["Resumen"]) == ["vigente", "modificada", "nueva"]
+        assert converter.last_report.stages['index']['items'] == 3
+
+    def test_merge_matches_single_file(self, tmp_path):
+        """Sin duplicados, combinar equivale a convertir cada archivo."""
+        path = tmp_path / "export.xml"
+        path.write_text(export(
+            item("T-1", "Wed, 5 Feb 2025 09:00:00 -0500", "a"),
+            item("T-2", "Wed, 5 Feb 2025 10:00:00 -0500", "b"),
+        ), encoding="utf-8")
+        converter = JiraXMLConverter(gui=False)
+        merged = tmp_path / "merged.csv"
+        single = tmp_path / "single.csv"
+        converter.merge([str(path)], str(merged), output_format="csv")
+        converter.convert(str(path), str(single), output_format="csv")
+        assert merged.read_bytes() == single.read_bytes()
+
+    def test_cli_merge(self, pages, tmp_path):
+        """Con --merge todas las entradas generan una sola salida."""
+        output_dir = tmp_path / "out"
+        output_dir.mkdir()
+        assert main(pages + ["-o", str(output_dir), "-f", "csv",
+                             "--merge", "-q"]) == 0
+        df = pd.read_csv(output_dir / "merged.csv")
+        assert sorted(df["Código"]) == ["T-1", "T-2", "T-3"]
+
+    def test_parser_iter_spans(self, pages):
+        """iter_spans solo parsea los items indicados."""
+        index = ItemIndex.build(pages[1])
+        spans = [(index.offsets[1], index.lengths[1])]
+        items = [item for item, _ in XMLParser().iter_spans(pages[1], spans)]
+        assert [item['Código'] for item in items] == ["T-3"]
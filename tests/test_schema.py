@@ -0,0 +1,125 @@
+import json
+import os
+import xml.etree.ElementTree as ET
+import pytest
+import pandas as pd
+from openpyxl import load_workbook
+from src.cli import main
+from src.utils.cache import ParseCache
+from src.utils.schema import Column, default_schema, load_schema
+from src.utils.xml_parser import XMLParser
+
+EXAMPLE = os.path.join('examples', 'sample_xml', 'export-activities.xml')
+
+SCHEMA = [
+    {"name": "Código", "tag": "key"},
+    {"name": "Proyecto", "tag": "project", "attribute": "key"},
+    {"name": "Asignado (id)", "tag": "assignee", "attribute": "accountid"},
+    {"name": "Horas", "customfield": "Horas utilizadas", "type": "number"},
+    {"name": "Organización", "customfield": "customfield_10002"},
+    {"name": "Creada", "tag": "created", "type": "date"},
+    {"name": "Hora", "time_of": "Creada"},
+    {"name": "Origen", "default": "Jira"},
+]
+
+class TestSchema:
+    @pytest.fixture
+    def schema_path(self, tmp_path):
+        """Fixture con un esquema propio en JSON."""
+        path = tmp_path / "schema.json"
+        path.write_text(json.dumps(SCHEMA), encoding="utf-8")
+        return str(path)
+
+    def test_default_schema_columns(self):
+        """El esquema por defecto genera las columnas estándar."""
+        parser = XMLParser()
+        assert parser.columns == [column.name for column in default_schema()]
+        assert parser.columns[:3] == ['Código', 'Tipo', 'Prioridad']
+
+    def test_custom_schema(self, schema_path):
+        """Un esquema propio define origen, tipo y valor por defecto."""
+        parser = XMLParser(schema=load_schema(schema_path))
+        items, _ = parser.parse_file(EXAMPLE)
+        df = parser.to_dataframe(items)
+        assert list(df.columns) == [column['name'] for column in SCHEMA]
+        first = df.iloc[0]
+        assert first['Proyecto'] == 'TD'
+        assert first['Asignado (id)'].startswith('70121:')
+        assert first['Horas'] == 3.0
+        assert first['Creada'] == pd.Timestamp(2025, 2, 11)
+        assert first['Hora'] == '17:02:43'
+        assert set(df['Origen']) == {'Jira'}
+        assert parser.custom_fields == {
+            'Horas utilizadas': 'number', 'customfield_10002': 'text'
+        }
+
+    def test_first_occurrence_wins(self):
+        """Con una etiqueta repetida se usa su primera aparición."""
+        item = ET.fromstring(
+            "<item><key>T-1</key><status>Abierta</status>"
+            "<status>Cerrada</status></item>"
+        )
+        parser = XMLParser(schema=[Column('Estado', tag='status'),
+                                   Column('Resumen', tag='summary')])
+        assert parser._process_single_item(item) == {
+            'Estado': 'Abierta', 'Resumen': ''
+        }
+
+    @pytest.mark.parametrize("definition, message", [
+        ({"name": "A", "tag": "key", "customfield": "X"}, "un solo origen"),
+        ({"name": "A", "attribute": "id"}, "attribute sin tag"),
+        ({"name": "A", "tag": "key", "type": "bool"}, "Tipo de columna"),
+        ({"name": "A", "tga": "key"}, "Claves desconocidas"),
+        ({"tag": "key"}, "sin name"),
+    ])
+    def test_invalid_column(self, definition, message):
+        """Las definiciones inválidas se rechazan con un mensaje claro."""
+        with pytest.raises(ValueError, match=message):
+            Column.from_dict(definition)
+
+    def test_time_of_requires_date_column(self, tmp_path):
+        """Una columna de hora debe derivar de una columna de fecha."""
+        path = tmp_path / "schema.json"
+        path.write_text(json.dumps([
+            {"name": "Código", "tag": "key"},
+            {"name": "Hora", "time_of": "Código"},
+        ]), encoding="utf-8")
+        with pytest.raises(ValueError, match="no es una columna de fecha"):
+            load_schema(str(path))
+
+    def test_cache_key_depends_on_schema(self, schema_path, tmp_path):
+        """La clave de caché cambia con el esquema."""
+        cache = ParseCache(str(tmp_path / "cache"))
+        assert cache.key(EXAMPLE, XMLParser()) != \
+            cache.key(EXAMPLE, XMLParser(schema=load_schema(schema_path)))
+
+    def test_cli_schema(self, schema_path, tmp_path):
+        """--schema define las columnas de la salida, también en paralelo."""
+        output_path = tmp_path / "out.csv"
+        assert main([EXAMPLE, "-o", str(output_path), "-f", "csv",
+                     "--schema", schema_path, "-w", "2", "-q"]) == 0
+        df = pd.read_csv(output_path)
+        assert list(df.columns)[:-1] == [column['name'] for column in SCHEMA]
+        assert set(df['Proyecto']) == {'TD'}
+
+    def test_key_not_first_keeps_hyperlink(self, tmp_path):
+        """El enlace de la tarea va en Código aunque el esquema lo mueva."""
+        schema_path = tmp_path / "schema.json"
+        schema_path.write_text(json.dumps(SCHEMA[1:3] + SCHEMA[:1]),
+                               encoding="utf-8")
+        output_path = tmp_path / "out.xlsx"
+        assert main([EXAMPLE, "-o", str(output_path),
+                     "--schema", str(schema_path), "-q"]) == 0
+        worksheet = load_workbook(output_path)['Tareas']
+        header = [cell.value for cell in worksheet[1]]
+        assert header[:3] == ['Proyecto', 'Asignado (id)', 'Código']
+        row = worksheet[2]
+        assert row[0].hyperlink is None
+        assert row[2].value == 'TD-41'
+        assert row[2].hyperlink.target.endswith('/browse/TD-41')
+
+    def test_cli_invalid_schema(self, tmp_path):
+        """Un esquema inválido termina con código 2."""
+        path = tmp_path / "schema.json"
+        path.write_text("{}", encoding="utf-8")
+        assert main([EXAMPLE, "--schema", str(path), "-q"]) == 2
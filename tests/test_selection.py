@@ -0,0 +1,90 @@
+import os
+from datetime import datetime
+import pytest
+from src.utils.selection import ItemSelection, combine_filters
+from src.utils.xml_parser import XMLParser
+
+class TestItemSelection:
+    @pytest.fixture
+    def example_xml_path(self):
+        return os.path.join('examples', 'sample_xml', 'export-activities.xml')
+
+    def _parse(self, path, **kwargs):
+        """Parsea el archivo con un parser configurado."""
+        return XMLParser(**kwargs).parse_file(path)
+
+    def test_filter_by_status(self, example_xml_path):
+        """Solo se procesan los items con el estado pedido."""
+        items, links = self._parse(
+            example_xml_path, item_filter=ItemSelection(statuses=['En proceso'])
+        )
+        assert len(items) == len(links) == 3
+        assert {item['Estado'] for item in items} == {'En proceso'}
+
+    def test_raw_filter_matches_element_filter(self, example_xml_path):
+        """El filtro sobre bytes acepta exactamente los mismos items."""
+        selection = ItemSelection(
+            statuses=['Finalizada', 'En proceso'], projects=['TD'],
+            updated_from=datetime(2025, 2, 1)
+        )
+        all_items, _ = self._parse(example_xml_path)
+        expected = [item['Código'] for item in all_items
+                    if item['Estado'] in ('Finalizada', 'En proceso')
+                    and XMLParser().data_handler.parse_jira_datetime(
+                        item['Fecha Actualización']) >= datetime(2025, 2, 1)]
+        parser = XMLParser(item_filter=selection)
+        parser._process_items = lambda root: (
+            [{'Código': item.findtext('key')} for item in root.iter('item')], []
+        )
+        raw = [item['Código'] for item in parser._parse_chunk(
+            open(example_xml_path, 'rb').read()
+        )[0]]
+        assert raw == expected
+
+    def test_excluded_items_are_not_processed(self, example_xml_path, monkeypatch):
+        """Los items descartados no llegan a _process_single_item."""
+        processed = []
+        original = XMLParser._process_single_item
+        monkeypatch.setattr(
+            XMLParser, '_process_single_item',
+            lambda self, item: processed.append(1) or original(self, item)
+        )
+        self._parse(example_xml_path, item_filter=ItemSelection(keys=['TD-41']))
+        assert len(processed) == 1
+
+    def test_combine_filters(self):
+        """La combinación exige todos los filtros."""
+        assert combine_filters(None, None) is None
+        selection = ItemSelection(statuses=['Finalizada'])
+        assert combine_filters(None, selection) is selection
+        combined = combine_filters(selection, lambda item: False)
+        assert combined.filters[0] is selection
+
+class TestColumnProjection:
+    @pytest.fixture
+    def example_xml_path(self):
+        return os.path.join('examples', 'sample_xml', 'export-activities.xml')
+
+    def test_only_requested_columns(self, example_xml_path, monkeypatch):
+        """Las columnas no pedidas no se calculan ni se leen sus campos."""
+        def fail(*args):
+            raise AssertionError("no debe leer campos personalizados")
+        monkeypatch.setattr(XMLParser, '_index_customfields', fail)
+        parser = XMLParser(columns=['Estado', 'Código', 'Hora Creación'])
+        items, _ = parser.parse_file(example_xml_path)
+        df = parser.to_dataframe(items)
+        assert list(df.columns) == ['Estado', 'Código', 'Hora Creación']
+        assert df['Hora Creación'].iloc[0] == '17:02:43'
+
+    def test_projection_matches_full_output(self, example_xml_path):
+        """Las columnas proyectadas coinciden con las del parsing completo."""
+        full = XMLParser()
+        full_df = full.to_dataframe(full.parse_file(example_xml_path)[0])
+        parser = XMLParser(columns=['Empresa', 'Horas Utilizadas', 'Fecha Inicio'])
+        df = parser.to_dataframe(parser.parse_file(example_xml_path)[0])
+        assert df.astype(object).equals(full_df[list(df.columns)].astype(object))
+
+    def test_unknown_column(self):
+        """Una columna inexistente produce ValueError."""
+        with pytest.raises(ValueError):
+            XMLParser(columns=['No existe'])
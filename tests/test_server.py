@@ -0,0 +1,190 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+import pandas as pd
+from src import server
+from src.server import ConversionService
+
+EXAMPLE_XML = os.path.join('examples', 'sample_xml', 'export-activities.xml')
+
+class BrokenPool(Executor):
+    """Pool cuyos trabajos fallan como si un proceso hubiera muerto."""
+
+    def __init__(self):
+        self.closed = False
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_exception(BrokenProcessPool())
+        return future
+
+    def shutdown(self, wait=True, **kwargs):
+        self.closed = True
+
+class TestConversionService:
+    @pytest.fixture
+    def start_service(self, tmp_path):
+        """Fixture que arranca servicios en un hilo con su propio loop."""
+        running = []
+
+        def start(**options):
+            service = ConversionService(str(tmp_path / "work"), **options)
+            loop = asyncio.new_event_loop()
+            address = loop.run_until_complete(service.start('127.0.0.1', 0))
+            thread = threading.Thread(target=loop.run_forever, daemon=True)
+            thread.start()
+            running.append((service, loop, thread))
+            return service, f'http://{address[0]}:{address[1]}'
+
+        yield start
+        for service, loop, thread in running:
+            asyncio.run_coroutine_threadsafe(service.stop(), loop).result(30)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    @staticmethod
+    def request(url, method='GET', data=None):
+        """Realiza una petición y devuelve (código, cabeceras, cuerpo)."""
+        req = urllib.request.Request(url, data=data, method=method)
+        try:
+            with urllib.request.urlopen(req, timeout=30) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, e.read()
+
+    def wait_for(self, base_url, job_id, timeout=60):
+        """Espera a que un trabajo termine y devuelve su estado."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            _, _, body = self.request(f'{base_url}/jobs/{job_id}')
+            job = json.loads(body)
+            if job['status'] in ('done', 'failed'):
+                return job
+            time.sleep(0.1)
+        raise TimeoutError(job_id)
+
+    def test_convert_and_download(self, start_service, tmp_path):
+        """Un XML subido se convierte y el resultado se puede descargar."""
+        _, base_url = start_service(concurrency=1)
+        with open(EXAMPLE_XML, 'rb') as file:
+            status, headers, body = self.request(
+                f'{base_url}/jobs?format=csv', 'POST', file.read()
+            )
+        assert status == 202
+        job = json.loads(body)
+        assert headers['Location'] == f"/jobs/{job['id']}"
+
+        job = self.wait_for(base_url, job['id'])
+        assert job['status'] == 'done' and job['progress'] == 100
+        assert job['report']['stages']['parse']['items'] == 39
+
+        status, _, body = self.request(f"{base_url}/jobs/{job['id']}/result")
+        assert status == 200
+        output = tmp_path / "result.csv"
+        output.write_bytes(body)
+        assert len(pd.read_csv(output)) == 39
+
+    def test_failed_job(self, start_service):
+        """Un XML inválido deja el trabajo en estado failed."""
+        _, base_url = start_service(concurrency=1)
+        _, _, body = self.request(
+            f'{base_url}/jobs', 'POST', b'<rss><channel><item></channel>'
+        )
+        job = self.wait_for(base_url, json.loads(body)['id'])
+        assert job['status'] == 'failed' and job['error']
+        status, _, _ = self.request(f"{base_url}/jobs/{job['id']}/result")
+        assert status == 409
+
+    def test_backpressure(self, start_service):
+        """Con la cola llena las subidas se rechazan con 503."""
+        service, base_url = start_service(concurrency=1, max_queue=0)
+        status, headers, _ = self.request(f'{base_url}/jobs', 'POST', b'<rss/>')
+        assert status == 503
+        assert headers['Retry-After']
+        assert not service.jobs
+
+    def test_upload_limit(self, start_service):
+        """Una subida mayor que el límite se rechaza con 413."""
+        _, base_url = start_service(max_upload_bytes=10)
+        status, _, _ = self.request(f'{base_url}/jobs', 'POST', b'x' * 11)
+        assert status == 413
+
+    def test_invalid_requests(self, start_service):
+        """Formatos o trabajos inexistentes producen errores HTTP."""
+        _, base_url = start_service()
+        assert self.request(f'{base_url}/jobs?format=doc', 'POST', b'x')[0] == 400
+        assert self.request(f'{base_url}/jobs/nope')[0] == 404
+        assert self.request(f'{base_url}/jobs')[0] == 405
+
+    def test_delete_job(self, start_service):
+        """Un trabajo eliminado ya no existe ni conserva sus archivos."""
+        service, base_url = start_service(concurrency=1)
+        with open(EXAMPLE_XML, 'rb') as file:
+            _, _, body = self.request(f'{base_url}/jobs', 'POST', file.read())
+        job = self.wait_for(base_url, json.loads(body)['id'])
+        directory = service.jobs[job['id']].directory
+        assert self.request(f"{base_url}/jobs/{job['id']}", 'DELETE')[0] == 200
+        assert self.request(f"{base_url}/jobs/{job['id']}")[0] == 404
+        assert not os.path.exists(directory)
+
+    def test_unexpected_error(self, start_service, caplog):
+        """Un error inesperado se registra y se responde con 500."""
+        service, base_url = start_service()
+
+        async def failing_route(*args):
+            raise OSError("disco lleno")
+
+        service._route = failing_route
+        status, _, body = self.request(f'{base_url}/jobs')
+        assert status == 500
+        assert json.loads(body)['error']
+        assert "disco lleno" in caplog.text
+
+    @pytest.mark.skipif(server.resource is None, reason="requiere resource")
+    def test_memory_limit(self, start_service):
+        """Un trabajo que supera el límite de memoria falla sin colgarse."""
+        _, base_url = start_service(concurrency=1, memory_limit_mb=1)
+        with open(EXAMPLE_XML, 'rb') as file:
+            _, _, body = self.request(f'{base_url}/jobs', 'POST', file.read())
+        job = self.wait_for(base_url, json.loads(body)['id'])
+        assert job['status'] == 'failed'
+        assert 'memoria' in job['error']
+
+    def test_broken_pool_replaced_once(self, tmp_path):
+        """Si fallan a la vez varios trabajos del pool, se reemplaza una vez."""
+        service = ConversionService(str(tmp_path / "work"), concurrency=2)
+        pools = []
+
+        def new_pool():
+            pools.append(BrokenPool())
+            return pools[-1]
+
+        service._new_pool = new_pool
+
+        async def run():
+            service._queue = asyncio.Queue()
+            service._pool = service._new_pool()
+            for number in range(2):
+                job = server.Job(str(number), str(tmp_path / str(number)), 'csv')
+                service.jobs[job.id] = job
+                service._queue.put_nowait(job)
+            tasks = [asyncio.ensure_future(service._dispatch())
+                     for _ in range(2)]
+            while any(job.status != server.FAILED
+                      for job in service.jobs.values()):
+                await asyncio.sleep(0.01)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        asyncio.run(run())
+        assert [pool.closed for pool in pools] == [True, False]
+        assert service._pool is pools[1]
@@ -0,0 +1,50 @@
+import os
+import pytest
+import pandas as pd
+from src.utils.xml_parser import XMLParser
+from src.utils.writers import WRITERS, LINK_COLUMN, get_writer
+
+class TestWriters:
+    @pytest.fixture
+    def parsed(self):
+        """Fixture que proporciona el DataFrame y los links del ejemplo."""
+        parser = XMLParser()
+        items, links = parser.parse_file(
+            os.path.join('examples', 'sample_xml', 'export-activities.xml')
+        )
+        return parser.to_dataframe(items), links
+
+    def test_registry(self):
+        """Todos los formatos están registrados por su extensión."""
+        assert set(WRITERS) == {'xlsx', 'csv', 'parquet', 'arrow'}
+        with pytest.raises(ValueError):
+            get_writer('pdf')
+
+    def test_csv(self, parsed, tmp_path):
+        """El CSV incluye los links y fechas ISO."""
+        df, links = parsed
+        output_path = tmp_path / "out.csv"
+        get_writer('csv')(df, str(output_path), links).write()
+        result = pd.read_csv(output_path)
+        assert len(result) == len(df)
+        assert result[LINK_COLUMN].tolist() == links
+        assert result['Fecha Creación'][0] == df['Fecha Creación'][0].strftime('%Y-%m-%d')
+
+    @pytest.mark.parametrize('output_format', ['parquet', 'arrow'])
+    def test_columnar_native_types(self, parsed, tmp_path, output_format):
+        """Parquet y Arrow conservan fechas, floats y diccionarios."""
+        pa = pytest.importorskip('pyarrow')
+        df, links = parsed
+        output_path = tmp_path / f"out.{output_format}"
+        get_writer(output_format)(df, str(output_path), links).write()
+        if output_format == 'parquet':
+            import pyarrow.parquet as pq
+            table = pq.read_table(output_path)
+        else:
+            table = pa.ipc.open_file(str(output_path)).read_all()
+        schema = table.schema
+        assert table.num_rows == len(df)
+        assert pa.types.is_timestamp(schema.field('Fecha Creación').type)
+        assert pa.types.is_float64(schema.field('Horas Utilizadas').type)
+        assert pa.types.is_dictionary(schema.field('Estado').type)
+        assert table.column(LINK_COLUMN).to_pylist() == links
@@ -1,6 +1,7 @@
 import pytest
 import os
-from src.utils.xml_parser import XMLParser, XMLParseError
+import pandas as pd
+from src.utils.xml_parser import XMLParser, XMLParseError, resolve_engine
 
 class TestXMLParser:
     @pytest.fixture
@@ -122,4 +123,235 @@ class TestXMLParser:
         assert parser.clean_field_value(" Test Value ") == "Test Value"
         assert parser.clean_field_value("Test\nValue") == "Test Value"
         assert parser.clean_field_value("Test\t\rValue") == "Test Value"
-        assert parser.clean_field_value(None) == ""
\ No newline at end of file
+        assert parser.clean_field_value(None) == ""
+
+class TestXMLParserStreaming:
+    @pytest.fixture
+    def parser(self):
+        """Fixture que proporciona una instancia del parser."""
+        return XMLParser()
+
+    @pytest.fixture
+    def example_xml_path(self):
+        """Fixture que proporciona la ruta al export de ejemplo."""
+        return os.path.join('examples', 'sample_xml', 'export-activities.xml')
+
+    def test_iter_file_matches_parse_file(self, parser, example_xml_path):
+        """El modo streaming produce los mismos items y links que parse_file."""
+        items, links = parser.parse_file(example_xml_path)
+        streamed = list(parser.iter_file(example_xml_path))
+        assert [item for item, _ in streamed] == items
+        assert [link for _, link in streamed] == links
+
+    def test_iter_file_small_chunks(self, parser, example_xml_path, monkeypatch):
+        """Bloques pequeños no alteran el resultado (multibyte partido)."""
+        monkeypatch.setattr('src.utils.xml_parser.CHUNK_SIZE', 7)
+        items, _ = parser.parse_file(example_xml_path)
+        assert [item for item, _ in parser.iter_file(example_xml_path)] == items
+
+    def test_iter_file_reads_in_chunks(self, parser, tmp_path, monkeypatch):
+        """Con lotes pequeños cada item se parsea por separado."""
+        xml_file = tmp_path / "export.xml"
+        xml_file.write_text(
+            "<rss><channel>"
+            + "".join(f"<item><key>T-{i}</key></item>" for i in range(5))
+            + "</channel></rss>",
+            encoding="utf-8"
+        )
+        monkeypatch.setattr('src.utils.xml_parser.CHUNK_SIZE', 1)
+        chunks = []
+        original = parser._parse_chunk
+        monkeypatch.setattr(
+            parser, '_parse_chunk',
+            lambda chunk: chunks.append(chunk) or original(chunk)
+        )
+        items = [item['Código'] for item, _ in parser.iter_file(str(xml_file))]
+        assert items == [f"T-{i}" for i in range(5)]
+        assert len(chunks) == 5
+        assert parser.bytes_read == sum(len(chunk) for chunk in chunks)
+
+    def test_iter_file_strips_control_chars(self, parser, tmp_path):
+        """Los caracteres de control se eliminan antes del parsing."""
+        xml_file = tmp_path / "export.xml"
+        xml_file.write_bytes(
+            b"<rss><channel><item><key>T-\x01\x0b1</key>"
+            b"<summary>\xc3\xa1\x7f\xff\x1fb</summary></item></channel></rss>"
+        )
+        (item, _), = parser.iter_file(str(xml_file))
+        assert item['Código'] == "T-1"
+        assert item['Resumen'] == "áb"
+
+    def test_iter_file_invalid_content(self, parser, tmp_path):
+        """Un XML mal formado produce XMLParseError."""
+        xml_file = tmp_path / "export.xml"
+        xml_file.write_text("<rss><channel><item></channel>", encoding="utf-8")
+        with pytest.raises(XMLParseError):
+            list(parser.iter_file(str(xml_file)))
+
+    @pytest.mark.parametrize("content", [
+        b"not xml at all",
+        b"<rss><channel><item><key>T-1</key></item>",
+        b"<rss><channel><item><key>T-1</key></item><broken <<"
+        b"<item><key>T-2</key></item></channel></rss>",
+        b"<html><body><item><key>T-1</key></item></body></html>",
+    ], ids=["not-xml", "truncated", "broken-between-items", "not-rss"])
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_iter_file_invalid_structure(self, parser, tmp_path, monkeypatch,
+                                         content, workers):
+        """Fuera de los items el documento también debe ser un export válido."""
+        xml_file = tmp_path / "export.xml"
+        xml_file.write_bytes(content)
+        monkeypatch.setattr('src.utils.xml_parser.CHUNK_SIZE', 1)
+        monkeypatch.setattr('src.utils.xml_parser.PARALLEL_CHUNK_SIZE', 1)
+        with pytest.raises(XMLParseError):
+            list(parser.iter_file(str(xml_file), workers))
+        with pytest.raises(XMLParseError):
+            list(parser.iter_bytes(content))
+
+    def test_iter_file_missing_file(self, parser):
+        """Un archivo inexistente produce XMLParseError."""
+        with pytest.raises(XMLParseError):
+            list(parser.iter_file("invalid_file.xml"))
+
+
+class TestXMLParserCustomFields:
+    ITEM = """
+    <item>
+        <key>TEST-1</key>
+        <customfields>
+            <customfield id="customfield_1">
+                <customfieldname>Empresa</customfieldname>
+                <customfieldvalues>
+                    <customfieldvalue>ACME &amp; Co</customfieldvalue>
+                </customfieldvalues>
+            </customfield>
+            <customfield id="customfield_2">
+                <customfieldname>Horas utilizadas</customfieldname>
+                <customfieldvalue>8.5</customfieldvalue>
+            </customfield>
+            <customfield id="customfield_3">
+                <customfieldname>Sprint</customfieldname>
+                <customfieldvalue>Sprint 4</customfieldvalue>
+            </customfield>
+            <customfield id="customfield_4">
+                <customfieldname>Start date</customfieldname>
+                <customfieldvalue>Wed, 5 Feb 2025 09:30:00 -0500</customfieldvalue>
+            </customfield>
+        </customfields>
+    </item>
+    """
+
+    @pytest.fixture
+    def item(self):
+        """Fixture que proporciona un item con campos personalizados."""
+        import xml.etree.ElementTree as ET
+        return ET.fromstring(self.ITEM)
+
+    def test_default_custom_fields(self, item):
+        """Los campos por defecto se extraen con su tipo."""
+        processed = XMLParser()._process_single_item(item)
+        assert processed['Empresa'] == "ACME & Co"
+        assert processed['Horas Utilizadas'] == 8.5
+        assert processed['Tipo Tarea'] == ""
+        assert processed['Fecha Inicio'] == "Wed, 5 Feb 2025 09:30:00 -0500"
+        assert 'Sprint' not in processed
+
+    def test_index_only_configured_fields(self, item):
+        """El índice solo guarda los campos configurados."""
+        by_name, by_id = XMLParser()._index_customfields(item)
+        assert set(by_name) == {'Empresa', 'Horas utilizadas', 'Start date'}
+        assert by_id == {}
+
+    def test_extra_custom_fields(self, item):
+        """Los campos adicionales se añaden como columnas por nombre o id."""
+        parser = XMLParser(custom_fields={
+            'Horas utilizadas': 'number',
+            'Sprint': 'text',
+            'customfield_2': 'number',
+        })
+        processed = parser._process_single_item(item)
+        assert processed['Sprint'] == "Sprint 4"
+        assert processed['customfield_2'] == 8.5
+        assert processed['Empresa'] == ""
+        assert processed['Horas Utilizadas'] == 8.5
+        assert list(processed)[-2:] == ['Sprint', 'customfield_2']
+
+
+class TestXMLParserParallel:
+    @pytest.fixture
+    def parser(self):
+        """Fixture que proporciona una instancia del parser."""
+        return XMLParser()
+
+    @pytest.fixture
+    def example_xml_path(self):
+        """Fixture que proporciona la ruta al export de ejemplo."""
+        return os.path.join('examples', 'sample_xml', 'export-activities.xml')
+
+    def test_parallel_matches_serial(self, parser, example_xml_path, monkeypatch):
+        """El modo paralelo conserva el orden y el contenido del serial."""
+        monkeypatch.setattr('src.utils.xml_parser.PARALLEL_CHUNK_SIZE', 4096)
+        assert parser.parse_file(example_xml_path, workers=2) == \
+            parser.parse_file(example_xml_path)
+
+    def test_item_chunks_are_complete(self, parser, example_xml_path):
+        """Cada lote contiene items completos."""
+        chunks = list(parser._iter_item_chunks(example_xml_path, chunk_size=1))
+        assert len(chunks) == 39
+        assert all(chunk.startswith(b'<item>') for chunk in chunks)
+        assert all(chunk.endswith(b'</item>') for chunk in chunks)
+
+    def test_parallel_empty_file(self, parser, tmp_path):
+        """Un archivo vacío produce XMLParseError."""
+        xml_file = tmp_path / "export.xml"
+        xml_file.write_bytes(b"")
+        with pytest.raises(XMLParseError):
+            parser.parse_file(str(xml_file), workers=2)
+
+
+class TestXMLParserDataFrame:
+    def test_to_dataframe_dates(self):
+        """Las fechas se convierten a datetime64 y se derivan las horas."""
+        parser = XMLParser()
+        items, _ = parser.parse_file(os.path.join('tests', 'data', 'sample.xml'))
+        df = parser.to_dataframe(items)
+        assert str(df['Fecha Creación'].dtype) == 'datetime64[ns]'
+        assert df['Fecha Creación'][0] == pd.Timestamp(2025, 2, 5)
+        assert df['Hora Creación'][0] == "09:30:00"
+        assert df['Hora Actualización'][0] == "14:45:00"
+        assert df['Fecha Inicio'].isna().all()
+
+
+class TestXMLParserEngines:
+    @pytest.fixture
+    def example_xml_path(self):
+        """Fixture que proporciona la ruta al export de ejemplo."""
+        return os.path.join('examples', 'sample_xml', 'export-activities.xml')
+
+    def test_lxml_matches_etree(self, example_xml_path):
+        """Los dos motores producen exactamente el mismo resultado."""
+        pytest.importorskip('lxml')
+        assert XMLParser(engine='lxml').parse_file(example_xml_path) == \
+            XMLParser(engine='etree').parse_file(example_xml_path)
+
+    def test_lxml_invalid_content(self, tmp_path):
+        """Con lxml un XML mal formado también produce XMLParseError."""
+        pytest.importorskip('lxml')
+        xml_file = tmp_path / "export.xml"
+        xml_file.write_text("<rss><channel><item></channel>", encoding="utf-8")
+        with pytest.raises(XMLParseError):
+            XMLParser(engine='lxml').parse_file(str(xml_file))
+
+    def test_auto_falls_back_to_etree(self, monkeypatch):
+        """Sin lxml el motor automático usa ElementTree."""
+        def import_module(name):
+            raise ImportError(name)
+        monkeypatch.setattr('importlib.import_module', import_module)
+        assert resolve_engine('auto') == 'etree'
+        with pytest.raises(ImportError):
+            resolve_engine('lxml')
+
+    def test_invalid_engine(self):
+        """Un motor desconocido produce ValueError."""
+        with pytest.raises(ValueError):
+            XMLParser(engine='sax')